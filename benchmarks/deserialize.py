@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+"""Compare the deserialization of ``getWebConnectors`` results.
+
+Run with ``python -m benchmarks.deserialize [records]``. The zeep objects
+are built from the bundled WSDL, so no connection to Five9 is required.
+"""
+
+import sys
+import timeit
+
+from five9 import Five9
+from five9.models import WebConnector
+
+
+def get_client():
+    """Return a configuration client loaded from the bundled WSDL."""
+    five9 = Five9('benchmark', 'benchmark')
+    five9.wsdl_bundled = True
+    five9.wsdl_cache_enabled = False
+    return five9._get_authenticated_client(Five9.WSDL_CONFIGURATION)
+
+
+def get_web_connectors(client, amount):
+    """Return ``amount`` web connectors, as returned by zeep."""
+    web_connector = client.get_type('ns0:webConnector')
+    key_value_pair = client.get_type('ns0:keyValuePair')
+    disposition = client.get_type('ns0:disposition')
+    return [
+        web_connector(
+            name='Connector %d' % index,
+            description='Benchmark connector',
+            agentApplication='EmbeddedBrowser',
+            ctiWebServices='CurrentBrowserWindow',
+            executeInBrowser=True,
+            postMethod=True,
+            trigger='OnCallDispositioned',
+            url='https://example.com/%d' % index,
+            constants=[
+                key_value_pair(key='key%d' % i, value='value%d' % i)
+                for i in range(10)
+            ],
+            variables=[
+                key_value_pair(key='var%d' % i, value='@Call.ANI@')
+                for i in range(5)
+            ],
+            triggerDispositions=[
+                disposition(name='Disposition %d' % i, type='FinalDisp',
+                            agentMustConfirm=False)
+                for i in range(5)
+            ],
+        )
+        for index in range(amount)
+    ]
+
+
+def main(amount=500, repeat=5):
+    rows = get_web_connectors(get_client(), amount)
+
+    def validated():
+        return [
+            WebConnector.deserialize(WebConnector._zeep_to_dict(row))
+            for row in rows
+        ]
+
+    def trusted():
+        return [WebConnector.from_zeep(row) for row in rows]
+
+    assert [r.serialize() for r in validated()] == \
+        [r.serialize() for r in trusted()]
+    timings = {}
+    for name, func in [('deserialize', validated), ('from_zeep', trusted)]:
+        timings[name] = min(timeit.repeat(func, number=1, repeat=repeat))
+        print('%-12s %8.2f ms for %d web connectors' % (
+            name, timings[name] * 1000, amount,
+        ))
+    print('speedup      %8.1fx' % (
+        timings['deserialize'] / timings['from_zeep'],
+    ))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
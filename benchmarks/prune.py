@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+"""Compare the pruning of empty values from nested web connector payloads.
+
+Run with ``python -m benchmarks.prune [records]``. The previous recursive
+implementation is included as the baseline.
+"""
+
+import copy
+import sys
+import timeit
+
+from five9.models import WebConnector
+
+
+def recursive_dict(mapping):
+    """The previous, recursive ``BaseModel._get_non_empty_dict``."""
+    res = {}
+    for key, value in mapping.items():
+        if hasattr(value, 'items'):
+            value = recursive_dict(value)
+        elif isinstance(value, list):
+            value = recursive_list(value)
+        if value not in [[], {}, None]:
+            res[key] = value
+    return res
+
+
+def recursive_list(iter):
+    """The previous, recursive ``BaseModel._get_non_empty_list``."""
+    res = []
+    for value in iter:
+        if hasattr(value, 'items'):
+            value = recursive_dict(value) or None
+        if value is not None:
+            res.append(value)
+    return res
+
+
+def get_payloads(amount):
+    """Return web connector payloads, as serialized from zeep objects."""
+    def key_value_pairs(prefix, count):
+        return [{'key': '%s%d' % (prefix, i), 'value': 'value'}
+                for i in range(count)] + [None, {'key': None, 'value': None}]
+
+    disposition = {
+        'name': 'Disposition',
+        'description': None,
+        'agentMustCompleteWorksheet': None,
+        'agentMustConfirm': False,
+        'resetAttemptsCounter': None,
+        'sendEmailNotification': None,
+        'sendIMNotification': None,
+        'trackAsFirstCallResolution': None,
+        'type': 'RedialNumber',
+        'typeParameters': {
+            'useTimer': True,
+            'timer': {'days': 0, 'hours': 1, 'minutes': None, 'seconds': None},
+            'allowChangeTimer': None,
+            'attempts': 3,
+        },
+    }
+    return [{
+        'name': 'Connector %d' % index,
+        'description': 'Benchmark connector',
+        'addWorksheet': None,
+        'agentApplication': 'EmbeddedBrowser',
+        'clearTriggerDispositions': None,
+        'constants': key_value_pairs('constant', 10),
+        'ctiWebServices': 'CurrentBrowserWindow',
+        'executeInBrowser': True,
+        'postConstants': [],
+        'postMethod': True,
+        'postVariables': key_value_pairs('post', 5),
+        'startPageText': None,
+        'trigger': 'OnCallDispositioned',
+        'triggerDispositions': [dict(disposition) for _ in range(5)],
+        'url': 'https://example.com/%d' % index,
+        'variables': key_value_pairs('variable', 5),
+    } for index in range(amount)]
+
+
+def main(amount=1000, repeat=5):
+    payloads = get_payloads(amount)
+    expect = [recursive_dict(p) for p in payloads]
+    assert [WebConnector._get_non_empty_dict(p) for p in payloads] == expect
+
+    def in_place():
+        # The copy is made outside of the measured section below.
+        return [WebConnector._get_non_empty_dict(p, in_place=True)
+                for p in copies.pop()]
+
+    copies = [copy.deepcopy(payloads) for _ in range(repeat)]
+    results = {
+        'recursive': min(timeit.repeat(
+            lambda: [recursive_dict(p) for p in payloads],
+            number=1, repeat=repeat,
+        )),
+        'iterative': min(timeit.repeat(
+            lambda: [WebConnector._get_non_empty_dict(p) for p in payloads],
+            number=1, repeat=repeat,
+        )),
+        'in place': min(timeit.repeat(in_place, number=1, repeat=repeat)),
+    }
+    for name, seconds in results.items():
+        print('%-10s %8.2f ms for %d web connectors (%.1fx)' % (
+            name, seconds * 1000, amount, results['recursive'] / seconds,
+        ))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+"""Micro-benchmarks of model dispatch and recordset operations.
+
+Run with ``python -m benchmarks.recordsets [records] [repeat]``. The previous
+environment, which resolved models in ``__getattribute__``, is included as
+the baseline.
+"""
+
+import sys
+import timeit
+
+from five9.environment import Environment
+from five9.models import WebConnector
+
+
+class LegacyEnvironment(Environment):
+    """The previous model dispatch, through ``__getattribute__``."""
+
+    def __getattribute__(self, item):
+        try:
+            return super(LegacyEnvironment, self).__getattribute__(item)
+        except AttributeError:
+            return self.__class__(self.__five9__, self.__models__[item])
+
+
+def get_operations(env_class, records):
+    """Return the benchmarked operations, keyed by name."""
+    env = env_class(object())
+    recordset = env.WebConnector._with_records(records)
+    return [
+        ('model dispatch', lambda: env.WebConnector),
+        ('attribute read', lambda: recordset.__five9__),
+        ('iterate', lambda: [r for r in recordset]),
+        ('getitem', lambda: [recordset[i] for i in range(100)]),
+        ('limit', lambda: list(recordset.limit(100))),
+        ('filtered', lambda: recordset.filtered('postMethod').count()),
+        ('mapped', lambda: recordset.mapped('name')),
+    ]
+
+
+def main(amount=1000, repeat=5, number=1000):
+    records = [
+        WebConnector(name='Connector %d' % i, postMethod=bool(i % 2))
+        for i in range(amount)
+    ]
+    legacy = get_operations(LegacyEnvironment, records)
+    current = get_operations(Environment, records)
+    for (name, before), (_, after) in zip(legacy, current):
+        # Record operations are much slower than single lookups.
+        count = number if 'dispatch' in name or 'read' in name else 10
+        results = [
+            min(timeit.repeat(func, number=count, repeat=repeat)) / count
+            for func in (before, after)
+        ]
+        print('%-15s %10.2f us legacy %10.2f us current (%.1fx)' % (
+            name, results[0] * 1e6, results[1] * 1e6, results[0] / results[1],
+        ))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+"""Compare the generated and the generic serializers of web connectors.
+
+Run with ``python -m benchmarks.serialize [records]``. Records are
+serialized with ``serialize`` of the ``properties`` library and with the
+generated ``to_zeep``, and read back with ``deserialize`` and the generated
+``from_zeep``. No connection to Five9 is required.
+"""
+
+import sys
+import timeit
+
+from five9.models import WebConnector
+
+from .deserialize import get_client, get_web_connectors
+
+
+def main(amount=5000, repeat=5):
+    rows = get_web_connectors(get_client(), amount)
+    records = [WebConnector.from_zeep(row) for row in rows]
+    # Validate the trusted values once, so that only serialization is timed.
+    for record in records:
+        record._validate_trusted()
+    data = [record.to_zeep() for record in records]
+    assert data == [r.serialize(include_class=False) for r in records]
+
+    cases = [
+        ('serialize', 'to_zeep',
+         lambda: [r.serialize(include_class=False) for r in records],
+         lambda: [r.to_zeep() for r in records]),
+        ('deserialize', 'from_zeep',
+         lambda: [WebConnector.deserialize(d) for d in data],
+         lambda: [WebConnector.from_zeep(d) for d in data]),
+    ]
+    for generic_name, generated_name, generic, generated in cases:
+        timings = {}
+        for name, func in [(generic_name, generic),
+                           (generated_name, generated)]:
+            timings[name] = min(timeit.repeat(func, number=1, repeat=repeat))
+            print('%-12s %8.2f ms for %d web connectors' % (
+                name, timings[name] * 1000, amount,
+            ))
+        print('speedup      %8.1fx\n' % (
+            timings[generic_name] / timings[generated_name],
+        ))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+"""Local stand-in for the Five9 SOAP services.
+
+Clients are loaded from the bundled WSDLs, and their HTTP sessions are
+served by :class:`StubAdapter`, which answers each SOAP operation with a
+recorded or synthetic response. No connection to Five9 is made, while the
+requests are still serialized and the responses parsed and deserialized by
+zeep exactly as they would be in production.
+"""
+
+import re
+
+import requests
+
+from xml.sax.saxutils import escape
+
+from five9 import Five9
+
+
+ADMIN_NAMESPACE = 'http://service.admin.ws.five9.com/'
+SUPERVISOR_NAMESPACE = 'http://service.supervisor.ws.five9.com/'
+
+ENVELOPE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">'
+    '<env:Body><ns2:%(operation)sResponse xmlns:ns2="%(namespace)s">'
+    '%(body)s'
+    '</ns2:%(operation)sResponse></env:Body></env:Envelope>'
+)
+
+# The name of the operation is the first element in the request body.
+OPERATION = re.compile(br'<(?:[\w-]+:)?Body[^>]*>\s*<(?:[\w-]+:)?(\w+)')
+
+
+class StubAdapter(requests.adapters.BaseAdapter):
+    """Transport adapter answering SOAP requests with canned responses.
+
+    Operations without a response are answered with an empty response,
+    which is what Five9 returns for operations such as
+    ``modifyWebConnector``.
+    """
+
+    def __init__(self, namespace, responses=None):
+        """Instantiate a new adapter.
+
+        Args:
+            namespace (str): Namespace of the service.
+            responses (dict, optional): Response bodies, keyed by operation
+                name. Use :func:`get_response` to create them.
+        """
+        super(StubAdapter, self).__init__()
+        self.namespace = namespace
+        self.responses = responses or {}
+        self.requests = 0
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        operation = OPERATION.search(request.body).group(1).decode()
+        content = self.responses.get(operation)
+        if content is None:
+            content = get_response(operation, self.namespace, '')
+        response = requests.Response()
+        response.status_code = 200
+        response.headers['Content-Type'] = 'text/xml; charset=UTF-8'
+        response.encoding = 'UTF-8'
+        response.request = request
+        response.url = request.url
+        response._content = content
+        return response
+
+    def close(self):
+        pass
+
+
+def get_response(operation, namespace, body):
+    """Return the encoded SOAP response of the operation.
+
+    Args:
+        operation (str): Name of the operation.
+        namespace (str): Namespace of the service.
+        body (str): XML content of the response element.
+
+    Returns:
+        bytes: The response envelope.
+    """
+    return (ENVELOPE % {
+        'operation': operation,
+        'namespace': namespace,
+        'body': body,
+    }).encode('utf-8')
+
+
+def get_client(configuration=None, supervisor=None):
+    """Return a Five9 client whose services are served by stub adapters.
+
+    Args:
+        configuration (dict, optional): Responses of the configuration
+            service, keyed by operation name.
+        supervisor (dict, optional): Responses of the supervisor service,
+            keyed by operation name.
+
+    Returns:
+        five9.Five9: The client. The adapters are available as the
+        ``stubs`` attribute, keyed by service.
+    """
+    five9 = Five9('benchmark', 'benchmark')
+    five9.wsdl_bundled = True
+    five9.wsdl_cache_enabled = False
+    five9.client_pool = None
+    five9.stubs = {
+        'configuration': StubAdapter(ADMIN_NAMESPACE, configuration),
+        'supervisor': StubAdapter(SUPERVISOR_NAMESPACE, supervisor),
+    }
+    for client_type, adapter in five9.stubs.items():
+        session = five9._get_client(client_type).transport.session
+        session.mount('https://', adapter)
+    return five9
+
+
+def _values(values):
+    return '<values>%s</values>' % ''.join(
+        '<data>%s</data>' % escape(value) for value in values
+    )
+
+
+def contact_records(amount, fields=None):
+    """Return a ``getContactRecords`` response with ``amount`` contacts."""
+    fields = fields or [
+        'number1', 'number2', 'number3', 'first_name', 'last_name',
+        'company', 'street', 'city', 'state', 'zip',
+    ]
+    rows = [
+        ['702555%04d' % (i % 10000), '', '', 'First %d' % i, 'Last %d' % i,
+         'Company %d' % (i % 100), '%d Main St' % i, 'Las Vegas', 'NV',
+         '89%03d' % (i % 1000)][:len(fields)]
+        for i in range(amount)
+    ]
+    body = '<return>%s%s</return>' % (
+        ''.join('<fields>%s</fields>' % escape(f) for f in fields),
+        ''.join('<records>%s</records>' % _values(row) for row in rows),
+    )
+    return get_response('getContactRecords', ADMIN_NAMESPACE, body)
+
+
+def web_connectors(amount):
+    """Return a ``getWebConnectors`` response with ``amount`` connectors.
+
+    ``triggerDispositions`` are omitted, because the WSDL declares them as
+    names, while ``WebConnector`` expects disposition records.
+    """
+    def key_value_pairs(tag, prefix, count):
+        return ''.join(
+            '<%s><key>%s%d</key><value>value</value></%s>' % (
+                tag, prefix, index, tag,
+            )
+            for index in range(count)
+        )
+
+    body = ''.join(
+        '<return>'
+        '<agentApplication>EmbeddedBrowser</agentApplication>'
+        '%s'
+        '<ctiWebServices>CurrentBrowserWindow</ctiWebServices>'
+        '<description>Benchmark connector</description>'
+        '<executeInBrowser>true</executeInBrowser>'
+        '<name>Connector %d</name>'
+        '<postMethod>true</postMethod>'
+        '%s'
+        '<trigger>OnCallDispositioned</trigger>'
+        '<url>https://example.com/%d</url>'
+        '%s</return>' % (
+            key_value_pairs('constants', 'constant', 10),
+            index,
+            key_value_pairs('postVariables', 'post', 5),
+            index,
+            key_value_pairs('variables', 'variable', 5),
+        )
+        for index in range(amount)
+    )
+    return get_response('getWebConnectors', ADMIN_NAMESPACE, body)
+
+
+def statistics(rows, columns=30, statistic_type='AgentState'):
+    """Return a ``getStatistics`` response of ``rows`` by ``columns``."""
+    names = ['Username'] + ['Column %d' % i for i in range(1, columns)]
+    body = '<return><columns>%s</columns>%s<timestamp>%d</timestamp>' \
+           '<type>%s</type></return>' % (
+               _values(names),
+               ''.join(
+                   '<rows>%s</rows>' % _values(
+                       ['agent%d' % row] +
+                       [str(row * column) for column in range(1, columns)]
+                   )
+                   for row in range(rows)
+               ),
+               1500000000000,
+               statistic_type,
+           )
+    return get_response('getStatistics', SUPERVISOR_NAMESPACE, body)
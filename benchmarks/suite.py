@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+"""Offline benchmarks of the SOAP round-trips and their post-processing.
+
+The services are served by the stand-in of :mod:`benchmarks.stub`, so the
+requests are serialized and the responses parsed and deserialized by zeep,
+without a connection to Five9. Run with::
+
+    python -m benchmarks.suite --output 1.2.0.json
+    python -m benchmarks.suite --compare 1.2.0.json
+
+The throughput and peak memory of each case are printed, and can be saved
+and compared in order to track them across releases. Use ``--scale`` to
+run smaller workloads, such as ``--scale 0.1`` during development.
+"""
+
+import argparse
+import json
+import os
+import platform
+import timeit
+import tracemalloc
+
+from five9.models import WebConnector
+from five9.statistics_models import parse_statistics
+
+from . import stub
+
+
+def get_label():
+    """Return the installed version of the library, for the results."""
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+        return version('five9')
+    except (ImportError, PackageNotFoundError):
+        return os.environ.get('RELEASE') or os.environ.get('VERSION') or 'dev'
+
+
+def get_cases(scale=1.0):
+    """Return the benchmark cases.
+
+    Args:
+        scale (float, optional): Multiplier of the amount of records.
+
+    Returns:
+        list[tuple]: The ``name``, amount of records and function of each
+        case. The responses are generated, and the functions set up, before
+        anything is measured.
+    """
+    contacts = max(1, int(100000 * scale))
+    connectors = max(1, int(5000 * scale))
+    statistics = max(1, int(10000 * scale))
+    writes = max(1, int(1000 * scale))
+
+    five9 = stub.get_client(
+        configuration={
+            'getContactRecords': stub.contact_records(contacts),
+            'getWebConnectors': stub.web_connectors(connectors),
+        },
+        supervisor={
+            'getStatistics': stub.statistics(statistics),
+        },
+    )
+    configuration = five9.configuration
+    supervisor = five9.supervisor
+    result = configuration.getContactRecords({})
+    fields, records = result['fields'], result['records']
+    rows = five9.parse_response(fields, records)
+    recordset = five9.env.WebConnector._with_records(
+        list(WebConnector._name_search(configuration.getWebConnectors, {}))
+        [:writes],
+    )
+
+    return [
+        ('soap getContactRecords', contacts,
+         lambda: configuration.getContactRecords({})),
+        ('parse_response dict', contacts,
+         lambda: five9.parse_response(fields, records)),
+        ('parse_response tuple', contacts,
+         lambda: five9.parse_response(fields, records, format='tuple')),
+        ('parse_response columnar', contacts,
+         lambda: five9.parse_response(fields, records, format='columnar')),
+        ('create_mapping', contacts,
+         lambda: [five9.create_mapping(row, ['number1']) for row in rows]),
+        ('_name_search web connectors', connectors,
+         lambda: list(WebConnector._name_search(
+             configuration.getWebConnectors, {'name': '.*'},
+         ))),
+        ('soap getStatistics', statistics,
+         lambda: supervisor.getStatistics('AgentState')),
+        ('parse_statistics', statistics,
+         lambda: parse_statistics(supervisor.getStatistics('AgentState'))),
+        ('recordset write', writes, lambda: recordset.write()),
+        ('recordset write bulk', writes,
+         lambda: recordset.write(max_workers=4)),
+    ]
+
+
+def measure(func, repeat=3, memory=True):
+    """Return the best time, and the peak of allocated memory, of a call.
+
+    Returns:
+        tuple: The seconds of the fastest call, and the peak amount of bytes
+        allocated during a separate call (``None`` if not measured).
+    """
+    seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return seconds, peak
+
+
+def run(scale=1.0, repeat=3, memory=True, names=None):
+    """Run the cases, printing and returning their results.
+
+    Args:
+        scale (float, optional): Multiplier of the amount of records.
+        repeat (int, optional): Amount of timed calls of each case.
+        memory (bool, optional): Measure the peak memory of each case.
+        names (list[str], optional): Only run the cases whose names contain
+            any of these.
+
+    Returns:
+        dict: The ``records``, ``seconds``, ``throughput`` (records per
+        second) and ``peak_bytes`` of each case, keyed by case name.
+    """
+    results = {}
+    for name, amount, func in get_cases(scale):
+        if names and not any(n in name for n in names):
+            continue
+        seconds, peak = measure(func, repeat, memory)
+        results[name] = {
+            'records': amount,
+            'seconds': seconds,
+            'throughput': amount / seconds,
+            'peak_bytes': peak,
+        }
+        print('%-30s %8d records %10.1f ms %12.0f rec/s %10s' % (
+            name, amount, seconds * 1000, amount / seconds,
+            '-' if peak is None else '%.1f MB' % (peak / 1e6),
+        ))
+    return results
+
+
+def compare(results, baseline):
+    """Print the change of throughput and memory against the baseline."""
+    print('\nCompared to %s:' % baseline['label'])
+    for name, result in results.items():
+        before = baseline['results'].get(name)
+        if before is None or before['records'] != result['records']:
+            continue
+        line = '%-30s %6.2fx throughput' % (
+            name, result['throughput'] / before['throughput'],
+        )
+        if result['peak_bytes'] and before['peak_bytes']:
+            line += ' %6.2fx memory' % (
+                result['peak_bytes'] / float(before['peak_bytes']),
+            )
+        print(line)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true')
+    parser.add_argument('--only', action='append', metavar='NAME')
+    parser.add_argument('--label', default=get_label())
+    parser.add_argument('--output', help='Save the results as JSON.')
+    parser.add_argument('--compare', help='Compare to saved results.')
+    args = parser.parse_args(args)
+
+    results = run(args.scale, args.repeat, not args.no_memory, args.only)
+    if args.compare:
+        with open(args.compare) as baseline:
+            compare(results, json.load(baseline))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({
+                'label': args.label,
+                'python': platform.python_version(),
+                'scale': args.scale,
+                'results': results,
+            }, output, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
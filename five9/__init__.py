@@ -2,6 +2,8 @@
 # Copyright 2017-TODAY LasLabs Inc.
 # License MIT (https://opensource.org/licenses/MIT).
 
+import sys
+
 from .five9 import Five9
 from . import models
 
@@ -9,3 +11,9 @@ __all__ = [
     'Five9',
     'models',
 ]
+
+# The asynchronous client uses ``async`` syntax, which older interpreters
+# cannot import.
+if sys.version_info >= (3, 5):
+    from .async_five9 import AsyncFive9  # noqa: F401
+    __all__.append('AsyncFive9')
@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import asyncio
+
+import zeep
+
+from zeep.transports import AsyncTransport
+
+try:
+    from urllib.parse import quote
+except ImportError:
+    from urllib import quote
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from .concurrency import RateLimiter
+from .config_sync import ConfigSync
+from .environment import Api, Environment
+from .five9 import Five9
+from .instrumentation import InstrumentationPlugin, InstrumentedService
+from .instrumentation import record_response
+from .resilience import ResilientService
+
+
+async def await_then(awaitable, callback):
+    """Await the result, then call ``callback`` with it.
+
+    If the callback returns another awaitable (such as a refreshing read),
+    it is awaited too.
+    """
+    result = callback(await awaitable)
+    if hasattr(result, '__await__'):
+        result = await result
+    return result
+
+
+async def gather_then(awaitables, callback):
+    """Await the results concurrently, then call ``callback`` with them."""
+    return callback(await asyncio.gather(*awaitables))
+
+
+async def resolved(value):
+    """Return the value, so that a local result can be awaited."""
+    return value
+
+
+class AsyncEnvironment(Environment):
+    """Environment whose remote operations are coroutines.
+
+    The CRUD methods mirror those of :class:`five9.environment.Environment`,
+    but must be awaited. Operations on recordsets are run concurrently.
+    """
+
+    @Api.model
+    async def create(self, data, refresh=False):
+        """Create the data on the remote, optionally refreshing."""
+        await self.__model__.create(self.__five9__, data)
+        if refresh:
+            return await self.read(data[self.__model__.__uid_field__])
+        else:
+            return self.new(data)
+
+    @Api.model
+    async def read(self, external_id, cache=True):
+        """Perform a lookup on the current model for the provided external ID.
+        """
+        if not cache:
+            return await self.__model__.read(
+                self.__five9__, external_id, cache=False,
+            )
+        return await self.__model__.read(self.__five9__, external_id)
+
+    @Api.model
+    async def read_many(self, external_ids, **kwargs):
+        """Perform a lookup on the current model for many external IDs.
+
+        See :meth:`five9.models.base_model.BaseModel.read_many`.
+        """
+        return await self.__model__.read_many(
+            self.__five9__, external_ids, **kwargs
+        )
+
+    @Api.recordset
+    async def write(self, max_concurrency=None):
+        """Write the records to the remote.
+
+        Args:
+            max_concurrency (int, optional): Maximum amount of records that
+                are written at the same time. Unlimited by default.
+        """
+        return await self._iter_call('write', max_concurrency)
+
+    @Api.recordset
+    async def delete(self, max_concurrency=None):
+        """Delete the records from the remote.
+
+        Args:
+            max_concurrency (int, optional): Maximum amount of records that
+                are deleted at the same time. Unlimited by default.
+        """
+        return await self._iter_call('delete', max_concurrency)
+
+    @Api.model
+    async def search(self, filters, cache=True):
+        """Search Five9 given a filter.
+
+        Args:
+            filters (dict): A dictionary of search strings, keyed by the name
+                of the field to search.
+            cache (bool, optional): Set to ``False`` to bypass the model
+                cache.
+
+        Returns:
+            AsyncEnvironment: A lazy recordset of the results.
+        """
+        if cache:
+            records = await self.__model__.search(
+                self.__five9__, filters, lazy=True,
+            )
+        else:
+            records = await self.__model__.search(
+                self.__five9__, filters, cache=False, lazy=True,
+            )
+        return self.__class__(
+            self.__five9__, self.__model__, records,
+        )
+
+    @Api.model
+    async def sync(self, desired, prune=False, dry_run=False,
+                   max_concurrency=None, rate_limit=None):
+        """Bring the remote records of the model to the desired state.
+
+        See :meth:`five9.environment.Environment.sync`.
+
+        Args:
+            max_concurrency (int, optional): Maximum amount of changes that
+                are applied at the same time. Unlimited by default.
+        """
+        return await AsyncConfigSync(
+            self.__five9__, self.__model__, prune=prune,
+            max_workers=max_concurrency, rate_limit=rate_limit,
+        ).sync(desired, dry_run=dry_run)
+
+    @Api.recordset
+    async def _iter_call(self, method_name, max_concurrency=None):
+        semaphore = None
+        if max_concurrency:
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _call(record):
+            if semaphore is None:
+                return await getattr(record, method_name)(self.__five9__)
+            async with semaphore:
+                return await getattr(record, method_name)(self.__five9__)
+
+        return list(await asyncio.gather(
+            *[_call(r) for r in self.__records__]
+        ))
+
+
+class AsyncConfigSync(ConfigSync):
+    """Config sync whose remote calls are awaited.
+
+    See :class:`five9.config_sync.ConfigSync`. ``max_workers`` is the
+    maximum amount of changes that are applied at the same time, which is
+    unlimited if ``None``.
+    """
+
+    async def sync(self, desired, dry_run=False):
+        changes = await self.diff(desired)
+        if dry_run:
+            return changes
+        return await self.apply(changes)
+
+    async def diff(self, desired):
+        return self._diff(desired, await self.get_remote())
+
+    async def apply(self, changes):
+        semaphore = None
+        if self.max_workers:
+            semaphore = asyncio.Semaphore(self.max_workers)
+        rate_limit = self.rate_limit
+        if rate_limit is not None and not isinstance(rate_limit, RateLimiter):
+            rate_limit = RateLimiter(rate_limit)
+
+        async def _call(change):
+            if rate_limit is not None:
+                delay = rate_limit.reserve()
+                if delay:
+                    await asyncio.sleep(delay)
+            try:
+                change.result = await self._apply(change)
+            except Exception as e:
+                change.error = e
+
+        async def _limited(change):
+            async with semaphore:
+                await _call(change)
+
+        await asyncio.gather(*[
+            _call(c) if semaphore is None else _limited(c) for c in changes
+        ])
+        return changes
+
+    async def get_remote(self):
+        return self._index_remote(await self._search_remote())
+
+
+class AsyncSupervisorService(object):
+    """Proxy for the async supervisor service.
+
+    The supervisor session is created before the first operation is
+    performed, mirroring the implicit session of ``Five9.supervisor``.
+    """
+
+    def __init__(self, five9, service):
+        self._five9 = five9
+        self._service = service
+
+    def __getattr__(self, name):
+        method = getattr(self._service, name)
+
+        async def _call(*args, **kwargs):
+            await self._five9._ensure_supervisor_session(self._service)
+            return await method(*args, **kwargs)
+
+        return _call
+
+
+class AsyncResilientService(ResilientService):
+    """Resilient proxy for an async service, whose operations are awaited.
+
+    See :class:`five9.resilience.ResilientService`.
+    """
+
+    def _wrap(self, name, operation):
+        async def _call(*args, **kwargs):
+            attempt = 0
+            while True:
+                delay = self._before_call()
+                if delay:
+                    await asyncio.sleep(delay)
+                try:
+                    result = await operation(*args, **kwargs)
+                except Exception as e:
+                    delay = self._after_error(name, e, attempt)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                except BaseException:
+                    self._after_interrupt()
+                    raise
+                else:
+                    self._after_success()
+                    return result
+
+        return _call
+
+
+class AsyncInstrumentedService(InstrumentedService):
+    """Instrumented proxy for an async service, whose operations are awaited.
+
+    See :class:`five9.instrumentation.InstrumentedService`.
+    """
+
+    def _wrap(self, name, operation):
+        async def _call(*args, **kwargs):
+            call, token = self._start(name)
+            try:
+                return await operation(*args, **kwargs)
+            except Exception as e:
+                call.error = e
+                raise
+            finally:
+                self._finish(call, token)
+
+        return _call
+
+
+async def record_async_response(response):
+    """Read the response, and record its size for the measured call.
+
+    This is the ``httpx`` response hook of the async clients.
+    """
+    await response.aread()
+    record_response(response)
+
+
+class AsyncFive9(Five9):
+    """Five9 client whose SOAP operations are coroutines.
+
+    This mirrors the :class:`five9.Five9` API, but every operation on the
+    ``configuration`` and ``supervisor`` services, as well as the CRUD
+    methods of ``env``, must be awaited. WSDLs are still loaded
+    synchronously when a service is first used.
+    """
+
+    # Limits of the connection pool of the async HTTP client.
+    max_connections = 100
+    max_keepalive_connections = 20
+
+    # Async HTTP clients are bound to an event loop, so they are not shared.
+    client_pool = None
+
+    _supervisor_session_lock = None
+    _instrumented_service_class = AsyncInstrumentedService
+    _resilient_service_class = AsyncResilientService
+
+    @property
+    def supervisor(self):
+        """Return an authenticated connection for use, open new if required.
+
+        The supervisor session is created on the first awaited operation.
+
+        Returns:
+            AsyncSupervisorService: New or existing session with the Five9
+            Statistics API.
+        """
+        return AsyncSupervisorService(
+            self, self._cached_client('supervisor'),
+        )
+
+    def __init__(self, username, password):
+        if httpx is None:
+            raise ImportError(
+                'The "httpx" package is required in order to use AsyncFive9.',
+            )
+        super(AsyncFive9, self).__init__(username, password)
+        self.env = AsyncEnvironment(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type=None, exc_value=None, traceback=None):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the HTTP connections of all open clients."""
+        for client_type in ('configuration', 'supervisor'):
+            client = getattr(self, '_api_%s' % client_type)
+            if client is not None:
+                await client.transport.aclose()
+                # The WSDL is loaded by a sync client, which zeep leaves open.
+                client.transport.wsdl_client.close()
+                setattr(self, '_api_%s' % client_type, None)
+        self._api_supervisor_session = None
+
+    def _get_authenticated_client(self, wsdl):
+        """Return an authenticated async SOAP client.
+
+        Returns:
+            zeep.AsyncClient: Authenticated API client.
+        """
+        auth = (self.auth.username, self.auth.password)
+        client = zeep.AsyncClient(
+            wsdl % quote(self.username),
+            transport=AsyncTransport(
+                client=httpx.AsyncClient(
+                    auth=auth,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=(
+                            self.max_keepalive_connections
+                        ),
+                    ),
+                    event_hooks={'response': [record_async_response]},
+                ),
+                wsdl_client=httpx.Client(auth=auth),
+                cache=self._get_wsdl_cache(wsdl),
+            ),
+        )
+        client.plugins.append(InstrumentationPlugin())
+        return client
+
+    async def _ensure_supervisor_session(self, supervisor):
+        """Create the supervisor session if it does not exist yet."""
+        if self._api_supervisor_session:
+            return
+        if self._supervisor_session_lock is None:
+            self._supervisor_session_lock = asyncio.Lock()
+        async with self._supervisor_session_lock:
+            if self._api_supervisor_session:
+                return
+            session_params = self._get_supervisor_session_params()
+            await supervisor.setSessionParameters(session_params)
+            self._api_supervisor_session = session_params
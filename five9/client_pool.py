@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import threading
+import time
+
+from collections import OrderedDict
+
+
+class PooledClient(object):
+    """A client held by the pool, along with what is needed to manage it."""
+
+    def __init__(self, client, auth):
+        self.client = client
+        self.auth = auth
+        self.last_used = time.time()
+
+
+class ClientPool(object):
+    """Thread-safe pool of authenticated SOAP clients.
+
+    Clients are keyed by username and WSDL, so that every ``five9.Five9``
+    object for the same user shares the parsed client and the keep-alive
+    connections of its HTTP session. Clients that hold state on the remote,
+    such as the parameters of a supervisor session, are also keyed by that
+    state, so that objects with other settings do not share them.
+    """
+
+    def __init__(self, size=32, pool_connections=10, pool_maxsize=10,
+                 idle_timeout=60 * 15):
+        """Instantiate a new pool.
+
+        Args:
+            size (int, optional): Maximum amount of clients to keep. The
+                least recently used client is evicted when this is exceeded.
+            pool_connections (int, optional): Amount of connection pools
+                to cache in the HTTP session of each client.
+            pool_maxsize (int, optional): Maximum amount of connections to
+                keep alive in each connection pool.
+            idle_timeout (int, optional): Seconds that a client can go unused
+                before it is evicted. ``None`` will never evict idle clients.
+        """
+        self.size = size
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clients = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._clients)
+
+    def get(self, username, wsdl, auth, factory, options=None):
+        """Return the pooled client for the user and WSDL, creating it if
+        required.
+
+        Args:
+            username (str): Username that the client authenticates as.
+            wsdl (str): WSDL URL that the client was created from.
+            auth (requests.auth.AuthBase): Authentication for the client. A
+                pooled client with other credentials is replaced.
+            factory (callable): Called without arguments to create the
+                client on a pool miss.
+            options (tuple, optional): Hashable settings of the client on the
+                remote. Clients with other options are pooled separately.
+
+        Returns:
+            zeep.Client: The pooled client.
+        """
+        key = (username, wsdl)
+        if options is not None:
+            key += (options,)
+        with self._lock:
+            self._evict_idle()
+            pooled = self._clients.pop(key, None)
+            if pooled is not None and pooled.auth == auth:
+                self.hits += 1
+                pooled.last_used = time.time()
+                self._clients[key] = pooled
+                return pooled.client
+            self.misses += 1
+        # The client is created outside of the lock because parsing the WSDL
+        # is slow, and would otherwise block every other user of the pool.
+        pooled = PooledClient(factory(), auth)
+        with self._lock:
+            self._clients.pop(key, None)
+            self._clients[key] = pooled
+            while len(self._clients) > self.size:
+                self._clients.popitem(last=False)
+                self.evictions += 1
+        return pooled.client
+
+    def clear(self):
+        """Remove all clients from the pool, and reset the counters."""
+        with self._lock:
+            self._clients.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return the usage counters of the pool.
+
+        Returns:
+            dict: Dictionary with the ``hits``, ``misses``, ``evictions``
+            and current ``size`` of the pool.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._clients),
+            }
+
+    def _evict_idle(self):
+        """Remove clients that have not been used within the idle timeout."""
+        if self.idle_timeout is None:
+            return
+        expired = time.time() - self.idle_timeout
+        # Clients are ordered by last use, so stop at the first fresh one.
+        for key, pooled in list(self._clients.items()):
+            if pooled.last_used >= expired:
+                break
+            del self._clients[key]
+            self.evictions += 1
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import csv
+
+from datetime import datetime
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .exceptions import ValidationError
+from .five9 import Five9
+
+
+# Five9 contact field types with a typed column, and their NumPy dtypes.
+NUMPY_DTYPES = {
+    'NUMBER': 'float64',
+    'CURRENCY': 'float64',
+    'PERCENT': 'float64',
+    'BOOLEAN': 'bool',
+    'DATE': 'datetime64[D]',
+    'DATE_TIME': 'datetime64[ms]',
+}
+
+DATE_FORMATS = ['%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d']
+
+
+def get_contact_field_types(five9):
+    """Return the types of the contact fields defined on Five9.
+
+    Args:
+        five9 (five9.Five9): The authenticated Five9 remote.
+
+    Returns:
+        dict: Five9 field types (such as ``NUMBER``), keyed by field name.
+    """
+    return {
+        field['name']: field['type']
+        for field in five9.configuration.getContactFields('.*') or []
+    }
+
+
+def iter_values(records):
+    """Yield the list of values of each record."""
+    for record in records:
+        yield record['values']['data']
+
+
+def to_columns(fields, records, types=None, use_numpy=None):
+    """Return the records as typed columns, without building row dicts.
+
+    This accepts the ``fields`` and ``records`` structure returned by
+    contact and report operations, such as ``getContactRecords``.
+
+    Args:
+        fields (list[str]): The fields of the records, in order.
+        records (iter): The records, as returned by Five9.
+        types (dict, optional): Five9 field types (such as ``NUMBER`` or
+            ``DATE_TIME``) keyed by field name. Fields without a typed
+            column are kept as strings. See :func:`get_contact_field_types`.
+        use_numpy (bool, optional): Return NumPy arrays instead of lists.
+            Defaults to ``True`` when NumPy is installed.
+
+    Returns:
+        collections.OrderedDict: Column of each field, keyed by field name.
+        Missing numbers are ``nan`` and missing dates are ``NaT`` in NumPy
+        columns, or ``None`` in lists.
+    """
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    elif use_numpy and numpy is None:
+        raise ImportError(
+            'The "numpy" package is required in order to export arrays.',
+        )
+    columns = Five9.parse_response(fields, records, format='columnar')
+    convert = _convert_numpy if use_numpy else _convert_python
+    for field, values in columns.items():
+        columns[field] = convert(values, (types or {}).get(field))
+    return columns
+
+
+def write_csv(fields, records, fh, header=True, **fmtparams):
+    """Write the records to a CSV file, one row at a time.
+
+    Args:
+        fields (list[str]): The fields of the records, in order.
+        records (iter): The records, as returned by Five9. This can be a
+            lazy iterable.
+        fh (file): File-like object opened for writing text.
+        header (bool, optional): Write the field names as the first row.
+        **fmtparams: Formatting parameters passed to ``csv.writer``.
+
+    Returns:
+        int: The amount of records that were written.
+    """
+    writer = csv.writer(fh, **fmtparams)
+    if header:
+        writer.writerow(fields)
+    count = [0]
+
+    def _counted():
+        for values in iter_values(records):
+            count[0] += 1
+            yield values
+
+    writer.writerows(_counted())
+    return count[0]
+
+
+def _convert_numpy(values, field_type):
+    """Convert a list of strings to a NumPy array in one pass."""
+    dtype = NUMPY_DTYPES.get(field_type)
+    if dtype is None:
+        return numpy.array(values, dtype=object)
+    if dtype == 'bool':
+        return numpy.array(values, dtype=object) == 'true'
+    missing = 'nan' if dtype == 'float64' else 'NaT'
+    values = [missing if v in (None, '') else v for v in values]
+    if dtype == 'float64':
+        return numpy.array(values).astype(dtype)
+    return numpy.array(values, dtype=dtype)
+
+
+def _convert_python(values, field_type):
+    """Convert a list of strings to native Python types."""
+    dtype = NUMPY_DTYPES.get(field_type)
+    if dtype is None:
+        return values
+    elif dtype == 'float64':
+        parse = float
+    elif dtype == 'bool':
+        return [None if v is None else v == 'true' for v in values]
+    elif field_type == 'DATE':
+        def parse(value):
+            return _parse_datetime(value).date()
+    else:
+        parse = _parse_datetime
+    return [None if v in (None, '') else parse(v) for v in values]
+
+
+def _parse_datetime(value):
+    """Parse a date or date time string returned by Five9."""
+    value = value.replace('T', ' ')
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            pass
+    raise ValidationError('"%s" is not a valid date.' % value)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import threading
+import time
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+# ``time.monotonic`` is not available on Python 2.
+monotonic = getattr(time, 'monotonic', time.time)
+
+
+class RateLimiter(object):
+    """Thread-safe token bucket limiting the rate of remote calls."""
+
+    def __init__(self, rate, burst=None):
+        """Instantiate a new rate limiter.
+
+        Args:
+            rate (float): Amount of calls allowed per second, on average.
+            burst (int, optional): Amount of calls that can be made at once
+                after being idle. Defaults to one second worth of calls.
+        """
+        self.rate = float(rate)
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Block until the call is allowed by the rate limit.
+
+        Args:
+            tokens (int, optional): Amount of calls to account for.
+
+        Returns:
+            float: Seconds that were spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = monotonic()
+                self._tokens = min(
+                    self.burst,
+                    self._tokens + (now - self._updated) * self.rate,
+                )
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def reserve(self, tokens=1):
+        """Take the tokens without blocking, and return the required wait.
+
+        Unlike :meth:`acquire`, the tokens are taken immediately, so the
+        bucket can go into debt. This allows callers that cannot block, such
+        as coroutines, to wait for the returned delay themselves.
+
+        Args:
+            tokens (int, optional): Amount of calls to account for.
+
+        Returns:
+            float: Seconds to wait before making the call.
+        """
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._updated) * self.rate,
+            ) - tokens
+            self._updated = now
+            return max(0.0, -self._tokens / self.rate)
+
+
+class BulkResult(list):
+    """Results of a bulk operation, in the order of the input items.
+
+    Items that failed have ``None`` as result, and their exception in
+    ``errors``, keyed by the index of the item.
+    """
+
+    def __init__(self, results=None, errors=None):
+        super(BulkResult, self).__init__(results or [])
+        self.errors = errors or {}
+
+    @property
+    def ok(self):
+        """Return whether every item succeeded."""
+        return not self.errors
+
+
+def run_concurrently(func, items, max_workers=1, rate_limit=None,
+                     progress=None):
+    """Call ``func`` for every item using a bounded pool of threads.
+
+    Errors do not abort the run; they are collected in the result instead.
+    At most ``max_workers * 2`` items are in flight at once, so ``items``
+    can be a lazy iterable of any size.
+
+    Args:
+        func (callable): Called with each item.
+        items (iter): Items to call ``func`` with.
+        max_workers (int, optional): Maximum amount of concurrent calls.
+        rate_limit (float or RateLimiter, optional): Maximum amount of calls
+            per second, or a limiter shared with other operations.
+        progress (callable, optional): Called with the amount of completed
+            items and the total amount of items (``None`` if ``items`` has
+            no length) each time an item completes.
+
+    Returns:
+        BulkResult: The return value of ``func`` for each item.
+    """
+    if rate_limit is not None and not isinstance(rate_limit, RateLimiter):
+        rate_limit = RateLimiter(rate_limit)
+
+    def _call(item):
+        if rate_limit is not None:
+            rate_limit.acquire()
+        return func(item)
+
+    try:
+        expected = len(items)
+    except TypeError:
+        expected = None
+    results = {}
+    errors = {}
+    pending = {}
+    submitted = 0
+    items = iter(items)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            for item in islice(items, max_workers * 2 - len(pending)):
+                pending[executor.submit(_call, item)] = submitted
+                submitted += 1
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    results[index] = None
+                    errors[index] = e
+                if progress is not None:
+                    progress(len(results), expected)
+
+    return BulkResult([results[i] for i in range(submitted)], errors)
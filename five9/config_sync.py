@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+from .concurrency import run_concurrently
+from .exceptions import ValidationError
+
+
+class Change(object):
+    """A remote call that brings a record to its desired state."""
+
+    CREATE = 'create'
+    MODIFY = 'modify'
+    DELETE = 'delete'
+
+    def __init__(self, action, name, data, diff=None):
+        """Instantiate a new change.
+
+        Args:
+            action (str): ``create``, ``modify`` or ``delete``.
+            name (str): The value of the model's ``__uid_field__``.
+            data (dict): The serialized record that is sent to the remote.
+                For deletions, this is the remote record.
+            diff (dict, optional): The remote and desired value of each
+                field that differs, keyed by field name.
+        """
+        self.action = action
+        self.name = name
+        self.data = data
+        self.diff = diff or {}
+        self.result = None
+        self.error = None
+
+    def __repr__(self):
+        return '<Change %s "%s" fields=%s>' % (
+            self.action, self.name, sorted(self.diff),
+        )
+
+    @property
+    def success(self):
+        """Return whether the change was applied without error."""
+        return self.error is None
+
+
+class ConfigSync(object):
+    """Sync the records of a model to a desired state, such as a file that
+    is kept in version control.
+
+    The remote records are fetched with a single search, and compared field
+    by field to the desired records. Only the records that differ are then
+    created, modified or deleted, concurrently, so the cost of a sync is
+    proportional to the amount of changes rather than to the size of the
+    catalog.
+
+    Fields that are missing from a desired record keep their remote value.
+    Remote records that are missing from the desired state are only deleted
+    if ``prune`` is set.
+
+    Example:
+
+        .. code-block:: python
+
+            sync = ConfigSync(client, 'Disposition', max_workers=4)
+            changes = sync.diff(desired)  # Nothing is written yet
+            changes = sync.apply(changes)
+            failed = [c for c in changes if not c.success]
+    """
+
+    def __init__(self, five9, model, prune=False, max_workers=4,
+                 rate_limit=None):
+        """Instantiate a new sync.
+
+        Args:
+            five9 (five9.Five9): The authenticated Five9 remote.
+            model (type or str): The model class, or its name.
+            prune (bool, optional): Delete the remote records that are not
+                in the desired state.
+            max_workers (int, optional): Maximum amount of concurrent calls.
+            rate_limit (float or RateLimiter, optional): Maximum amount of
+                calls per second.
+
+        Raises:
+            ValidationError: If there is no model with the name.
+        """
+        if not isinstance(model, type):
+            environment = five9.env
+            if model not in environment.__models__:
+                raise ValidationError('There is no model "%s".' % model)
+            model = environment.__models__[model]
+        self.five9 = five9
+        self.model = model
+        self.prune = prune
+        self.max_workers = max_workers
+        self.rate_limit = rate_limit
+
+    def sync(self, desired, dry_run=False):
+        """Compute the changes to the desired state, and apply them.
+
+        Args:
+            desired (iter[dict or BaseModel]): The desired records.
+            dry_run (bool, optional): Only compute the changes, without
+                applying them.
+
+        Returns:
+            list[Change]: The changes, with their outcome unless
+            ``dry_run`` is set.
+        """
+        changes = self.diff(desired)
+        if dry_run:
+            return changes
+        return self.apply(changes)
+
+    def diff(self, desired):
+        """Return the changes that bring the remote to the desired state.
+
+        Args:
+            desired (iter[dict or BaseModel]): The desired records.
+
+        Returns:
+            list[Change]: The creations and modifications, in the order of
+            the desired records, followed by any deletions.
+
+        Raises:
+            ValidationError: If a desired record is invalid, has no
+                ``__uid_field__`` or is duplicated.
+        """
+        return self._diff(desired, self.get_remote())
+
+    def apply(self, changes):
+        """Apply the changes to the remote, concurrently.
+
+        Errors do not abort the other changes; they are stored on the
+        change instead.
+
+        Args:
+            changes (list[Change]): The changes, as returned by :meth:`diff`.
+
+        Returns:
+            list[Change]: The changes, with their ``result`` or ``error``.
+        """
+        results = run_concurrently(
+            self._apply, changes,
+            max_workers=self.max_workers,
+            rate_limit=self.rate_limit,
+        )
+        for index, change in enumerate(changes):
+            change.result = results[index]
+            change.error = results.errors.get(index)
+        return changes
+
+    def get_remote(self):
+        """Return all remote records, serialized and keyed by name."""
+        return self._index_remote(self._search_remote())
+
+    @staticmethod
+    def get_diff(current, desired):
+        """Return the fields of the desired record that differ.
+
+        Args:
+            current (dict): The serialized remote record.
+            desired (dict): The serialized desired record. Only its fields
+                are compared.
+
+        Returns:
+            dict: Tuples of the remote and desired value, keyed by field
+            name.
+        """
+        return {
+            field: (current.get(field), value)
+            for field, value in desired.items()
+            if current.get(field) != value
+        }
+
+    def _diff(self, desired, remote):
+        """Return the changes from the remote records to the desired ones.
+        """
+        uid_field = self.model.__uid_field__
+        changes = []
+        seen = set()
+        for record in desired:
+            data = self._serialize_desired(record)
+            name = data.get(uid_field)
+            if name is None:
+                raise ValidationError(
+                    'A desired record has no "%s".' % uid_field,
+                )
+            if name in seen:
+                raise ValidationError(
+                    'The record "%s" is duplicated.' % name,
+                )
+            seen.add(name)
+            current = remote.get(name)
+            if current is None:
+                changes.append(Change(Change.CREATE, name, data))
+                continue
+            diff = self.get_diff(current, data)
+            if diff:
+                merged = dict(current)
+                merged.update(data)
+                changes.append(Change(Change.MODIFY, name, merged, diff))
+        if self.prune:
+            changes.extend(
+                Change(Change.DELETE, name, data)
+                for name, data in remote.items() if name not in seen
+            )
+        return changes
+
+    def _search_remote(self):
+        """Search all remote records of the model, bypassing the caches."""
+        return self.model.search(
+            self.five9, {self.model.__uid_field__: '.*'}, cache=False,
+            lazy=True,
+        )
+
+    def _index_remote(self, records):
+        """Return the records, serialized and keyed by name."""
+        uid_field = self.model.__uid_field__
+        remote = {}
+        for record in records:
+            data = self._serialize(record)
+            remote[data[uid_field]] = data
+        return remote
+
+    def _apply(self, change):
+        """Make the remote call of a change."""
+        if change.action == Change.CREATE:
+            return self.model.create(self.five9, change.data)
+        record = self.model.deserialize(change.data)
+        if change.action == Change.MODIFY:
+            return record.write(self.five9)
+        return record.delete(self.five9)
+
+    def _serialize(self, record):
+        """Return the record as a dictionary without empty values."""
+        return self.model._get_non_empty_dict(
+            record.serialize(include_class=False), in_place=True,
+        )
+
+    def _serialize_desired(self, record):
+        """Return the validated desired record, limited to its own fields.
+
+        Defaults of the model are only included for records given as model
+        instances, so that dictionaries only describe the fields they set.
+        """
+        if isinstance(record, self.model):
+            return self._serialize(record)
+        record = self.model._get_non_empty_dict(record)
+        data = self._serialize(self.model.deserialize(record))
+        return {
+            field: value for field, value in data.items() if field in record
+        }
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import re
+import sqlite3
+import threading
+
+from datetime import datetime, timedelta
+from itertools import islice
+
+from .contacts import ContactSearch
+from .exceptions import ValidationError
+from .model_cache import ModelCatalog
+
+
+def _regexp(pattern, value):
+    """Return whether the value fully matches the pattern, for SQLite."""
+    if value is None:
+        return False
+    return re.match(r'(?:%s)\Z' % pattern, value) is not None
+
+
+def _quote(name):
+    """Return the name quoted as an SQLite identifier."""
+    return '"%s"' % name.replace('"', '""')
+
+
+class ContactMirror(object):
+    """Local SQLite copy of the contact records, kept in sync incrementally.
+
+    The first :meth:`sync` copies all contacts. Later syncs only fetch the
+    contacts whose ``modified_field`` changed since the previous sync. This
+    is a contact field mapped to ``LastModifiedDateTime``, as created in the
+    README. Contacts deleted in Five9 are only removed by a full sync whose
+    search is complete.
+
+    Lookups with :meth:`search` use the criteria of
+    :meth:`five9.Five9.create_criteria`, and are answered from the indexed
+    local copy.
+
+    Example:
+
+        .. code-block:: python
+
+            mirror = ContactMirror(client, 'contacts.db', keys=['number1'])
+            mirror.sync()
+            mirror.lookup('number1', '7025551234')
+    """
+
+    # Value matching the ``modified_field`` of the contacts changed on a day.
+    MODIFIED_PATTERN = '%s.*'
+    # Format of the day in ``MODIFIED_PATTERN``.
+    DATE_FORMAT = '%Y-%m-%d'
+    # Changes of this long before the previous sync are fetched again, in
+    # order to account for clock and time zone differences.
+    OVERLAP = timedelta(days=1)
+    # Format of the time of the last sync in the database.
+    TIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+    # Amount of contacts that are written in a single transaction.
+    BATCH_SIZE = 1000
+
+    def __init__(self, five9, path=':memory:', keys=('number1',),
+                 indexes=(), modified_field='modified_at', **search_kwargs):
+        """Instantiate a new mirror.
+
+        Args:
+            five9 (five9.Five9): The authenticated Five9 remote.
+            path (str, optional): Path of the SQLite database. The mirror
+                only lives in memory by default.
+            keys (iter[str], optional): Fields that identify a contact.
+            indexes (iter[str], optional): Other fields that are indexed for
+                fast lookups.
+            modified_field (str, optional): The contact field that is mapped
+                to ``LastModifiedDateTime``.
+            **search_kwargs: Other arguments of the
+                :class:`five9.contacts.ContactSearch` that fetches the
+                contacts, such as ``max_workers``.
+        """
+        self.five9 = five9
+        self.keys = list(keys)
+        self.indexes = list(indexes)
+        self.modified_field = modified_field
+        self.search_kwargs = search_kwargs
+        self.truncated = []
+        self.complete = None
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.create_function('REGEXP', 2, _regexp)
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS sync_state '
+                '(name TEXT PRIMARY KEY, value TEXT)',
+            )
+        self.fields = [
+            row[1] for row in self._db.execute('PRAGMA table_info(contacts)')
+            if row[1] != '_generation'
+        ]
+
+    def __len__(self):
+        if not self.fields:
+            return 0
+        with self._lock:
+            return self._db.execute(
+                'SELECT COUNT(*) FROM contacts',
+            ).fetchone()[0]
+
+    @property
+    def last_sync(self):
+        """Return the UTC ``datetime`` of the last sync, if any."""
+        value = self._get_state('last_sync')
+        if value is None:
+            return None
+        return datetime.strptime(value, self.TIME_FORMAT)
+
+    def sync(self, full=None):
+        """Copy the new and modified contacts into the mirror.
+
+        Args:
+            full (bool, optional): Copy all contacts, and remove the ones
+                that no longer exist. By default, only the first sync is
+                full.
+
+        The sync is partial if sub-queries of the search could not be split
+        below the page size of Five9, as their other contacts are missing.
+        These sub-queries are then stored in ``truncated``, ``complete`` is
+        ``False``, no contacts are removed, and ``last_sync`` is kept, so
+        that the next sync fetches the missing contacts again. The next sync
+        is therefore full again after a partial first sync.
+
+        Returns:
+            int: The amount of contacts that were copied.
+        """
+        started = datetime.utcnow()
+        last_sync = self.last_sync
+        if full is None:
+            full = last_sync is None
+        query = {} if full else self._get_modified_query(last_sync, started)
+        generation = int(self._get_state('generation') or 0) + 1
+        search = ContactSearch(
+            self.five9, keys=self.keys, **self.search_kwargs
+        )
+        if 'partition_required' not in self.search_kwargs:
+            # Contacts are identified by their keys, which must be set.
+            search.partition_required = search.partition_field in self.keys
+        contacts = search.search(query)
+        count = 0
+        while True:
+            batch = list(islice(contacts, self.BATCH_SIZE))
+            if not batch:
+                break
+            self._store(batch, generation)
+            count += len(batch)
+        self.truncated = search.truncated
+        self.complete = not self.truncated
+        with self._lock, self._db:
+            if full and self.fields and self.complete:
+                self._db.execute(
+                    'DELETE FROM contacts WHERE _generation < ?',
+                    (generation,),
+                )
+            self._set_state('generation', str(generation))
+            if self.complete:
+                self._set_state(
+                    'last_sync', started.strftime(self.TIME_FORMAT),
+                )
+        return count
+
+    def search(self, query, limit=None):
+        """Return the contacts matching the query.
+
+        Args:
+            query (dict): Values keyed by field name, as accepted by
+                :meth:`five9.Five9.create_criteria`. A list of values
+                matches any of the values. Values containing regular
+                expression characters must match the whole field value.
+            limit (int, optional): Maximum amount of contacts to return.
+
+        Returns:
+            list[dict]: The contacts, keyed by field name.
+
+        Raises:
+            ValidationError: If a field of the query is not mirrored.
+        """
+        if not self.fields:
+            return []
+        clauses = []
+        params = []
+        for field, values in query.items():
+            if field not in self.fields:
+                raise ValidationError(
+                    'The field "%s" is not in the mirror.' % field,
+                )
+            if not isinstance(values, list):
+                values = [values]
+            alternatives = []
+            for value in values:
+                clause, clause_params = self._get_clause(field, value)
+                alternatives.append(clause)
+                params.extend(clause_params)
+            clauses.append('(%s)' % ' OR '.join(alternatives))
+        sql = 'SELECT %s FROM contacts' % ', '.join(map(_quote, self.fields))
+        if clauses:
+            sql += ' WHERE %s' % ' AND '.join(clauses)
+        if limit is not None:
+            sql += ' LIMIT %d' % limit
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [dict(zip(self.fields, row)) for row in rows]
+
+    def lookup(self, field, value):
+        """Return the first contact whose field has the value.
+
+        Returns:
+            dict: The contact, or ``None`` if there is no match.
+        """
+        for contact in self.search({field: value}, limit=1):
+            return contact
+        return None
+
+    def close(self):
+        """Close the database."""
+        self._db.close()
+
+    def _get_modified_query(self, last_sync, now):
+        """Return the query of the contacts modified since the last sync."""
+        day = (last_sync - self.OVERLAP).date()
+        patterns = []
+        while day <= now.date():
+            patterns.append(
+                self.MODIFIED_PATTERN % day.strftime(self.DATE_FORMAT),
+            )
+            day += timedelta(days=1)
+        return {self.modified_field: patterns}
+
+    @staticmethod
+    def _get_clause(field, value):
+        """Return the SQL condition and parameters of a criteria value.
+
+        Exact values and prefixes (``value.*``) use the indexes. Other
+        regular expressions are evaluated for every contact.
+        """
+        value = '%s' % value
+        column = _quote(field)
+        if ModelCatalog.REGEX_CHARACTERS.isdisjoint(value):
+            return '%s = ?' % column, [value]
+        prefix = value[:-2]
+        if value.endswith('.*') and \
+                ModelCatalog.REGEX_CHARACTERS.isdisjoint(prefix):
+            return '%s >= ? AND %s < ?' % (column, column), [
+                prefix, prefix + u'\U0010ffff',
+            ]
+        return '%s REGEXP ?' % column, [value]
+
+    def _store(self, contacts, generation):
+        """Insert or replace the contacts."""
+        with self._lock, self._db:
+            self._ensure_fields(contacts[0])
+            columns = ', '.join(map(_quote, self.fields + ['_generation']))
+            sql = 'INSERT OR REPLACE INTO contacts (%s) VALUES (%s)' % (
+                columns, ', '.join('?' * (len(self.fields) + 1)),
+            )
+            self._db.executemany(sql, [
+                [contact.get(f) for f in self.fields] + [generation]
+                for contact in contacts
+            ])
+
+    def _ensure_fields(self, contact):
+        """Create the table, columns and indexes for the contact's fields."""
+        new = [f for f in contact if f not in self.fields]
+        if not new:
+            return
+        if not self.fields:
+            missing = [k for k in self.keys if k not in contact]
+            if missing:
+                raise ValidationError(
+                    'The key fields %s are not in the contacts.' % missing,
+                )
+            self._db.execute('CREATE TABLE contacts (%s)' % ', '.join(
+                ['%s TEXT' % _quote(f) for f in new] + ['_generation INTEGER'],
+            ))
+            self._db.execute(
+                'CREATE UNIQUE INDEX contacts_keys ON contacts (%s)' % (
+                    ', '.join(map(_quote, self.keys)),
+                ),
+            )
+        else:
+            for field in new:
+                self._db.execute('ALTER TABLE contacts ADD COLUMN %s TEXT' % (
+                    _quote(field),
+                ))
+        self.fields.extend(new)
+        for field in self.indexes:
+            if field in self.fields:
+                self._db.execute(
+                    'CREATE INDEX IF NOT EXISTS %s ON contacts (%s)' % (
+                        _quote('contacts_%s' % field), _quote(field),
+                    ),
+                )
+
+    def _get_state(self, name):
+        with self._lock:
+            row = self._db.execute(
+                'SELECT value FROM sync_state WHERE name = ?', (name,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, name, value):
+        self._db.execute(
+            'INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)',
+            (name, value),
+        )
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import re
+
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import product
+
+from .concurrency import RateLimiter
+from .exceptions import ValidationError
+
+
+class ContactSearch(object):
+    """Search engine for contact queries of any size.
+
+    ``getContactRecords`` returns at most ``PAGE_SIZE`` records per call.
+    Queries are therefore split into non-overlapping sub-queries: one for
+    each combination of the list values of the query (which
+    :meth:`five9.Five9.create_criteria` would otherwise expand into criteria
+    of a single lookup), and then, for any sub-query that reaches the page
+    size, one for each prefix of the ``partition_field``. Each split also
+    covers the contacts whose value is the prefix itself (the empty value,
+    for the first split), and the ones whose value continues with a
+    character that is not in the ``alphabet``. Contacts whose value is unset
+    cannot be selected by a pattern, so only the ones returned by the query
+    that is split are kept (see ``partition_required``). The sub-queries are
+    run in parallel, and their records are streamed through
+    :meth:`five9.Five9.parse_response` as they arrive, skipping duplicates.
+
+    Example:
+
+        .. code-block:: python
+
+            search = ContactSearch(client, keys=['number1'], max_workers=4)
+            for contact in search.search({'state': ['NV', 'CA']}):
+                print(contact['first_name'])
+            search.truncated  # Sub-queries that could not be split further
+    """
+
+    # Maximum amount of records that are returned by ``getContactRecords``.
+    PAGE_SIZE = 1000
+    # Value matching the contacts whose field starts with the prefix.
+    PREFIX_PATTERN = '%s.*'
+    # Value matching the contacts whose field is the prefix.
+    EXACT_PATTERN = '^%s$'
+    # Value matching the contacts whose field continues with a character
+    # that is not in the alphabet.
+    OTHER_PATTERN = '%s[^%s].*'
+
+    def __init__(self, five9, keys=None, partition_field='number1',
+                 alphabet='0123456789', max_depth=6, max_workers=4,
+                 rate_limit=None, format='dict', partition_required=False):
+        """Instantiate a new search engine.
+
+        Args:
+            five9 (five9.Five9): The authenticated Five9 remote.
+            keys (list[str], optional): Fields that identify a contact, which
+                are used to skip duplicates. By default, records are only
+                skipped if all of their values are duplicated.
+            partition_field (str, optional): Field whose prefixes are used to
+                split sub-queries that reach the page size. It should not be
+                part of the queries.
+            alphabet (str, optional): Characters that the values of the
+                ``partition_field`` consist of.
+            max_depth (int, optional): Maximum length of the prefixes.
+            max_workers (int, optional): Maximum amount of concurrent calls.
+            rate_limit (float or RateLimiter, optional): Maximum amount of
+                calls per second.
+            format (str, optional): ``dict`` or ``tuple``, as accepted by
+                :meth:`five9.Five9.parse_response`.
+            partition_required (bool, optional): Whether the
+                ``partition_field`` is set for every contact. Otherwise,
+                contacts with an unset value may be missing once a query is
+                split, so the query is added to ``truncated``.
+
+        Raises:
+            ValidationError: If the format cannot be streamed.
+        """
+        if format not in ('dict', 'tuple'):
+            raise ValidationError(
+                'Contacts cannot be streamed in the "%s" format.' % format,
+            )
+        if rate_limit is not None and not isinstance(rate_limit, RateLimiter):
+            rate_limit = RateLimiter(rate_limit)
+        self.five9 = five9
+        self.keys = keys
+        self.partition_field = partition_field
+        self.alphabet = alphabet
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.rate_limit = rate_limit
+        self.format = format
+        self.partition_required = partition_required
+        self.calls = 0
+        self.truncated = []
+
+    def search(self, query):
+        """Yield the contacts matching the query.
+
+        Contacts are yielded in the order that the sub-queries complete.
+        Sub-queries that still reach the page size and cannot be split
+        further, such as the ones with prefixes of ``max_depth`` characters,
+        are added to ``truncated``.
+
+        Args:
+            query (dict): Values keyed by field name, as accepted by
+                :meth:`five9.Five9.create_criteria`. A list of values matches
+                contacts with any of the values.
+
+        Yields:
+            dict or tuple: The parsed contacts.
+        """
+        self.calls = 0
+        self.truncated = []
+        seen = set()
+        queue = deque((q, None, None) for q in self.split_query(query))
+        pending = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while queue or pending:
+                while queue and len(pending) < self.max_workers * 2:
+                    sub_query = queue.popleft()
+                    future = executor.submit(
+                        self._fetch, self.get_query(*sub_query[:2]),
+                    )
+                    pending[future] = sub_query
+                    self.calls += 1
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    sub_query = pending.pop(future)
+                    fields, records = future.result()
+                    if len(records) >= self.PAGE_SIZE:
+                        partitions = self.partition(*sub_query)
+                        if partitions:
+                            queue.extend(partitions)
+                            if sub_query[1] is not None:
+                                continue
+                            # The first split cannot select unset values.
+                            records = self._get_unset(
+                                sub_query[0], fields, records,
+                            )
+                        else:
+                            self.truncated.append(
+                                self.get_query(*sub_query[:2]),
+                            )
+                    for row in self._parse_new(fields, records, seen):
+                        yield row
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def split_query(self, query):
+        """Return the sub-queries of each combination of the list values.
+
+        Args:
+            query (dict): Values keyed by field name. List values are split.
+
+        Returns:
+            list[dict]: Queries with a single value for each field.
+        """
+        names = list(query)
+        values = [
+            list(OrderedDict.fromkeys(query[name]))
+            if isinstance(query[name], list) else [query[name]]
+            for name in names
+        ]
+        return [dict(zip(names, combination))
+                for combination in product(*values)]
+
+    def partition(self, query, value=None, prefix=None):
+        """Return the sub-queries that split a query on the partition field.
+
+        Args:
+            query (dict): A sub-query that reached the page size.
+            value (str, optional): The value of the ``partition_field`` that
+                the sub-query is limited to, if any.
+            prefix (str, optional): The prefix that the value matches, if
+                the sub-query can be split on longer prefixes.
+
+        Returns:
+            list[tuple]: The query, the value of the ``partition_field`` and
+            its prefix, for each character of the ``alphabet``, for the
+            prefix itself and for the other characters. The list is empty if
+            the query cannot be split further.
+        """
+        if value is None:
+            if self.partition_field in query:
+                return []
+            prefix = ''
+        elif prefix is None or len(prefix) >= self.max_depth:
+            return []
+        escaped = re.escape(prefix)
+        partitions = [
+            (query, self.PREFIX_PATTERN % (escaped + re.escape(character)),
+             prefix + character)
+            for character in self.alphabet
+        ]
+        partitions.append((query, self.EXACT_PATTERN % escaped, None))
+        if self.alphabet:
+            partitions.append((query, self.OTHER_PATTERN % (
+                escaped, ''.join(re.escape(c) for c in self.alphabet),
+            ), None))
+        else:
+            partitions.append(
+                (query, self.PREFIX_PATTERN % (escaped + '.'), None),
+            )
+        return partitions
+
+    def get_query(self, query, value=None):
+        """Return the query, limited to the value of the partition field."""
+        if value is None:
+            return query
+        query = dict(query)
+        query[self.partition_field] = value
+        return query
+
+    def get_lookup_criteria(self, query):
+        """Return the ``crmLookupCriteria`` of a query.
+
+        Args:
+            query (dict): Values keyed by field name.
+
+        Returns:
+            dict: The criteria, as built by
+            :meth:`five9.Five9.create_criteria`.
+        """
+        return {
+            'criteria': [
+                criteria['criteria']
+                for criteria in self.five9.create_criteria(query) or []
+            ],
+        }
+
+    def _fetch(self, query):
+        """Return the fields and records of the sub-query."""
+        if self.rate_limit is not None:
+            self.rate_limit.acquire()
+        result = self.five9.configuration.getContactRecords(
+            self.get_lookup_criteria(query),
+        )
+        if not result:
+            return [], []
+        return result['fields'] or [], result['records'] or []
+
+    def _get_unset(self, query, fields, records):
+        """Return the records of a split query that its partitions miss.
+
+        These are the contacts whose ``partition_field`` is unset. Others
+        with an unset value may not be in the records, so the query is
+        added to ``truncated`` unless ``partition_required`` is set.
+        """
+        if self.partition_required:
+            return []
+        self.truncated.append(query)
+        if self.partition_field not in fields:
+            return []
+        index = fields.index(self.partition_field)
+        return [r for r in records if r['values']['data'][index] is None]
+
+    def _parse_new(self, fields, records, seen):
+        """Parse the records that were not seen yet, adding them to seen."""
+        if not records:
+            return []
+        if self.keys is None:
+            indexes = range(len(fields))
+        else:
+            missing = [key for key in self.keys if key not in fields]
+            if missing:
+                raise ValidationError(
+                    'The key fields %s are not in the contacts.' % missing,
+                )
+            indexes = [fields.index(key) for key in self.keys]
+        new = []
+        for record in records:
+            data = record['values']['data']
+            key = tuple(data[i] for i in indexes)
+            if key not in seen:
+                seen.add(key)
+                new.append(record)
+        return self.five9.parse_response(
+            fields, new, format=self.format, lazy=True,
+        )
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+from itertools import islice
+from operator import attrgetter
+
+from six import string_types
+from six.moves import range
+
+
+class RecordCursor(object):
+    """Lazy, re-iterable sequence of records.
+
+    Rows (such as the zeep objects returned by Five9) are only converted into
+    records as they are iterated or indexed. Each record is then kept, so
+    that iterating or indexing the cursor again returns the same objects,
+    including any changes made to them. Slicing, :meth:`limit` and
+    :meth:`filtered` return new cursors of these records without converting
+    any rows.
+
+    Keeping the records means that a cursor that was iterated fully holds
+    as many records as a list. :meth:`stream` iterates the records without
+    keeping them, so that only the rows stay in memory, but changes made to
+    the records that it builds are not seen by later iterations.
+
+    Example:
+
+        .. code-block:: python
+
+            cursor = RecordCursor(rows, WebConnector.from_zeep)
+            for record in cursor.filtered('postMethod').limit(10):
+                print(record.name)
+    """
+
+    def __init__(self, rows, factory=None):
+        """Instantiate a new cursor.
+
+        Args:
+            rows (iter): The rows of the cursor. This must be iterable more
+                than once, such as a ``list``.
+            factory (callable, optional): Converts a row into a record. Rows
+                are used as they are by default.
+        """
+        self._rows = rows
+        self._factory = factory
+        # Records that were built, keyed by the index of their row.
+        self._records = {}
+        # Returns the record of a row without keeping it, for ``stream``.
+        self._peek = self._peek_record
+
+    def __iter__(self):
+        if self._factory is None:
+            return iter(self._rows)
+        return (
+            self._get_record(index, row)
+            for index, row in enumerate(self._rows)
+        )
+
+    def __len__(self):
+        """Return the amount of records.
+
+        Raises:
+            TypeError: When the cursor was filtered, so that its length is
+                not known without iterating it. Use :meth:`count` instead.
+        """
+        return len(self._rows)
+
+    def __bool__(self):
+        for _ in self._rows:
+            return True
+        return False
+
+    __nonzero__ = __bool__
+
+    def __getitem__(self, item):
+        """Return the record at the index, or a cursor for a slice."""
+        if isinstance(item, slice):
+            if hasattr(self._rows, '__getitem__'):
+                if self._factory is None:
+                    return self.__class__(self._rows[item])
+                # The slice selects the indexes of this cursor, so that its
+                # records are shared.
+                cursor = self.__class__(
+                    range(len(self._rows))[item], self._get_record,
+                )
+                cursor._peek = lambda index, row: self._peek_record(row)
+                return cursor
+            if any(i is not None and i < 0
+                   for i in (item.start, item.stop, item.step)):
+                raise ValueError(
+                    'Filtered cursors cannot be sliced with negative values.',
+                )
+            return self.__class__(
+                _Pipeline(self, lambda records: islice(
+                    records, item.start, item.stop, item.step,
+                )),
+            )
+        if hasattr(self._rows, '__getitem__'):
+            if self._factory is None:
+                return self._rows[item]
+            if item < 0:
+                item += len(self._rows)
+            if not 0 <= item < len(self._rows):
+                raise IndexError('The cursor index is out of range.')
+            return self._get_record(item)
+        if item < 0:
+            raise IndexError(
+                'Filtered cursors cannot be indexed from the end.',
+            )
+        for record in islice(self, item, None):
+            return record
+        raise IndexError('The cursor index is out of range.')
+
+    def count(self):
+        """Return the amount of records, iterating them if required."""
+        try:
+            return len(self)
+        except TypeError:
+            return sum(1 for _ in self.stream())
+
+    def stream(self):
+        """Iterate the records without keeping the ones that are built.
+
+        Records that were already kept are returned as they are. Other
+        records are built again by each iteration, so changes made to them
+        are lost. This is meant for reading large results once.
+
+        Returns:
+            iter: The records.
+        """
+        if isinstance(self._rows, _Pipeline):
+            return self._rows.stream()
+        if self._factory is None:
+            return iter(self._rows)
+        return (
+            self._peek(index, row) for index, row in enumerate(self._rows)
+        )
+
+    def limit(self, count):
+        """Return a cursor of the first ``count`` records."""
+        return self[:count]
+
+    def filtered(self, predicate):
+        """Return a cursor of the records matching the predicate.
+
+        Args:
+            predicate (callable or str): Called with each record, or the name
+                of a field that must be truthy.
+
+        Returns:
+            RecordCursor: The filtered cursor.
+        """
+        if isinstance(predicate, string_types):
+            predicate = attrgetter(predicate)
+        return self.__class__(
+            _Pipeline(self, lambda records: (
+                record for record in records if predicate(record)
+            )),
+        )
+
+    def mapped(self, func):
+        """Return the result of the function for each record.
+
+        Args:
+            func (callable or str): Called with each record, or the name of
+                the field to return.
+
+        Returns:
+            list: The values, in order.
+        """
+        if isinstance(func, string_types):
+            func = attrgetter(func)
+        return [func(record) for record in self]
+
+    def _get_record(self, index, row=None):
+        """Return the record of the row at the index, building it once."""
+        record = self._records.get(index)
+        if record is None:
+            if row is None:
+                row = self._rows[index]
+            record = self._records[index] = self._factory(row)
+        return record
+
+    def _peek_record(self, index, row=None):
+        """Return the kept record of the row at the index, or a new one."""
+        record = self._records.get(index)
+        if record is None:
+            if row is None:
+                row = self._rows[index]
+            record = self._factory(row)
+        return record
+
+
+class _Pipeline(object):
+    """Re-iterable application of an iterator function to a source."""
+
+    def __init__(self, source, func):
+        self.source = source
+        self.func = func
+
+    def __iter__(self):
+        return iter(self.func(iter(self.source)))
+
+    def stream(self):
+        """Iterate without keeping the records of the source."""
+        return iter(self.func(self.source.stream()))
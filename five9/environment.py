@@ -2,6 +2,9 @@
 # Copyright 2017-TODAY LasLabs Inc.
 # License MIT (https://opensource.org/licenses/MIT).
 
+from .concurrency import run_concurrently
+from .config_sync import ConfigSync
+from .cursor import RecordCursor
 from .exceptions import ValidationError
 
 
@@ -47,7 +50,6 @@ class Environment(object):
     # The current record represented by this environment.
     __record__ = None
 
-    @classmethod
     def __new__(cls, *args, **kwargs):
         """Find and cache all model objects, if not already done."""
         if cls.__models__ is None:
@@ -65,26 +67,92 @@ class Environment(object):
         self.__model__ = model
         self.__records__ = records
 
-    def __getattribute__(self, item):
-        try:
-            return super(Environment, self).__getattribute__(item)
-        except AttributeError:
-            return self.__class__(self.__five9__, self.__models__[item])
+    def __getattr__(self, item):
+        """Return the environment of the model named ``item``.
+
+        This is only called for attributes that are not found otherwise. The
+        model environment is stored on this environment, so that later
+        lookups of the model are plain attribute reads.
+
+        Raises:
+            AttributeError: If there is no model named ``item``.
+        """
+        model = self.__models__.get(item)
+        if model is None:
+            raise AttributeError(
+                '"%s" object has no attribute or model "%s"' % (
+                    self.__class__.__name__, item,
+                ),
+            )
+        environment = self.__class__(self.__five9__, model)
+        setattr(self, item, environment)
+        return environment
 
     @Api.recordset
     def __iter__(self):
         """Pass iteration through to the records.
 
+        Records of a lazy recordset are built as they are iterated.
+
         Yields:
             BaseModel: The next record in the iterator.
-
-        Raises:
-            StopIterationError: When all records have been iterated.
         """
         for record in self.__records__:
             self.__record__ = record
             yield record
-        raise StopIteration()
+
+    @Api.recordset
+    def __getitem__(self, item):
+        """Return the record at the index, or a recordset for a slice."""
+        if isinstance(item, slice):
+            return self._with_records(self._get_cursor()[item])
+        return self._get_cursor()[item]
+
+    @Api.recordset
+    def stream(self):
+        """Iterate the records without keeping them in the recordset.
+
+        See :meth:`five9.cursor.RecordCursor.stream`: only the rows of a
+        lazy recordset stay in memory, and changes made to the records are
+        not kept.
+
+        Returns:
+            iter[BaseModel]: The records.
+        """
+        return self._get_cursor().stream()
+
+    @Api.recordset
+    def count(self):
+        """Return the amount of records, iterating them if required."""
+        return self._get_cursor().count()
+
+    @Api.recordset
+    def limit(self, count):
+        """Return a recordset of the first ``count`` records."""
+        return self._with_records(self._get_cursor().limit(count))
+
+    @Api.recordset
+    def filtered(self, predicate):
+        """Return a lazy recordset of the records matching the predicate.
+
+        Args:
+            predicate (callable or str): Called with each record, or the name
+                of a field that must be truthy.
+        """
+        return self._with_records(self._get_cursor().filtered(predicate))
+
+    @Api.recordset
+    def mapped(self, func):
+        """Return the result of the function for each record.
+
+        Args:
+            func (callable or str): Called with each record, or the name of
+                the field to return.
+
+        Returns:
+            list: The values, in order.
+        """
+        return self._get_cursor().mapped(func)
 
     @Api.model
     def create(self, data, refresh=False):
@@ -106,39 +174,152 @@ class Environment(object):
         )
 
     @Api.model
-    def read(self, external_id):
+    def read(self, external_id, cache=True):
         """Perform a lookup on the current model for the provided external ID.
+
+        Args:
+            external_id (mixed): The value of the model's ``__uid_field__``.
+            cache (bool, optional): Set to ``False`` to bypass the model
+                cache.
         """
+        if not cache:
+            return self.__model__.read(
+                self.__five9__, external_id, cache=False,
+            )
         return self.__model__.read(self.__five9__, external_id)
 
+    @Api.model
+    def read_many(self, external_ids, **kwargs):
+        """Perform a lookup on the current model for many external IDs.
+
+        Args:
+            external_ids (iter): The values of the model's ``__uid_field__``.
+            **kwargs: Options of the search, as accepted by
+                :meth:`five9.models.base_model.BaseModel.read_many`.
+
+        Returns:
+            list[BaseModel]: The record of each ID, in the order of the IDs.
+            Missing records are ``None``.
+        """
+        return self.__model__.read_many(
+            self.__five9__, external_ids, **kwargs
+        )
+
     @Api.recordset
-    def write(self):
-        """Write the records to the remote."""
-        return self._iter_call('write')
+    def write(self, max_workers=None, rate_limit=None, progress=None):
+        """Write the records to the remote.
+
+        The records are written one at a time, aborting on the first error,
+        unless any of the bulk arguments are given. See :meth:`_iter_call`.
+
+        Returns:
+            list: The result of the write for each record.
+        """
+        return self._iter_call('write', max_workers, rate_limit, progress)
 
     @Api.recordset
-    def delete(self):
-        """Delete the records from the remote."""
-        return self._iter_call('delete')
+    def delete(self, max_workers=None, rate_limit=None, progress=None):
+        """Delete the records from the remote.
+
+        The records are deleted one at a time, aborting on the first error,
+        unless any of the bulk arguments are given. See :meth:`_iter_call`.
+
+        Returns:
+            list: The result of the deletion for each record.
+        """
+        return self._iter_call('delete', max_workers, rate_limit, progress)
 
     @Api.model
-    def search(self, filters):
+    def search(self, filters, cache=True):
         """Search Five9 given a filter.
 
         Args:
             filters (dict): A dictionary of search strings, keyed by the name
                 of the field to search.
+            cache (bool, optional): Set to ``False`` to bypass the model
+                cache.
 
         Returns:
-            Environment: An environment representing the recordset.
+            Environment: A lazy recordset of the results. Records are only
+            built as they are iterated.
         """
-        records = self.__model__.search(self.__five9__, filters)
-        return self.__class__(
-            self.__five9__, self.__model__, records,
-        )
+        if cache:
+            records = self.__model__.search(
+                self.__five9__, filters, lazy=True,
+            )
+        else:
+            records = self.__model__.search(
+                self.__five9__, filters, cache=False, lazy=True,
+            )
+        return self._with_records(records)
+
+    @Api.model
+    def sync(self, desired, prune=False, dry_run=False, max_workers=4,
+             rate_limit=None):
+        """Bring the remote records of the model to the desired state.
+
+        Only the records that differ from the remote are created, modified
+        or deleted. See :class:`five9.config_sync.ConfigSync`.
+
+        Args:
+            desired (iter[dict or BaseModel]): The desired records.
+            prune (bool, optional): Delete the remote records that are not
+                in the desired state.
+            dry_run (bool, optional): Only compute the changes, without
+                applying them.
+            max_workers (int, optional): Maximum amount of concurrent calls.
+            rate_limit (float or RateLimiter, optional): Maximum amount of
+                calls per second.
+
+        Returns:
+            list[five9.config_sync.Change]: The changes.
+        """
+        return ConfigSync(
+            self.__five9__, self.__model__, prune=prune,
+            max_workers=max_workers, rate_limit=rate_limit,
+        ).sync(desired, dry_run=dry_run)
+
+    def _get_cursor(self):
+        """Return the records as a :class:`five9.cursor.RecordCursor`."""
+        if isinstance(self.__records__, RecordCursor):
+            return self.__records__
+        return RecordCursor(self.__records__)
+
+    def _with_records(self, records):
+        """Return a new recordset of the model with the records."""
+        return self.__class__(self.__five9__, self.__model__, records)
 
     @Api.recordset
-    def _iter_call(self, method_name):
-        return [
-            getattr(r, method_name)(self.__five9__) for r in self.__records__
-        ]
+    def _iter_call(self, method_name, max_workers=None, rate_limit=None,
+                   progress=None):
+        """Call the method on every record with the Five9 remote.
+
+        If any of the optional arguments are given, the records are processed
+        concurrently in bulk mode, and errors are collected in the result
+        instead of aborting the operation.
+
+        Args:
+            method_name (str): Name of the record method to call.
+            max_workers (int, optional): Maximum amount of concurrent calls.
+                This should not exceed the connection pool size of the
+                client (``ClientPool.pool_maxsize``).
+            rate_limit (float or RateLimiter, optional): Maximum amount of
+                calls per second.
+            progress (callable, optional): Called with the amount of
+                completed records and the total amount of records.
+
+        Returns:
+            list or BulkResult: The result of the call for each record.
+        """
+        if max_workers is None and rate_limit is None and progress is None:
+            return [
+                getattr(r, method_name)(self.__five9__)
+                for r in self.__records__
+            ]
+        return run_concurrently(
+            lambda r: getattr(r, method_name)(self.__five9__),
+            self.__records__,
+            max_workers=max_workers or 1,
+            rate_limit=rate_limit,
+            progress=progress,
+        )
@@ -9,3 +9,7 @@ class Five9Exception(Exception):
 
 class ValidationError(Five9Exception):
     """Indicated an error validating user supplied data."""
+
+
+class CircuitOpenError(Five9Exception):
+    """Indicates that calls are rejected after repeated remote failures."""
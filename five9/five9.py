@@ -5,14 +5,26 @@
 import requests
 import zeep
 
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 
 try:
     from urllib.parse import quote
 except ImportError:
     from urllib import quote
 
+from .client_pool import ClientPool
+from .concurrency import RateLimiter
+from .contact_mirror import ContactMirror
+from .contacts import ContactSearch
 from .environment import Environment
+from .exceptions import ValidationError
+from .imports import CrmImporter, ListImporter
+from .instrumentation import InstrumentationPlugin, InstrumentedService
+from .instrumentation import record_response
+from .reports import ReportRunner
+from .resilience import CircuitBreaker, ResilientService
+from .statistics import StatisticsFeed
+from .wsdl_cache import WsdlCache
 
 
 class Five9(object):
@@ -29,6 +41,35 @@ class Five9(object):
     shift_start_hour = 8
     time_zone_offset = -7
 
+    # These attributes are used to configure the WSDL & XSD cache.
+    wsdl_cache_enabled = True
+    wsdl_cache_path = None  # Defaults to the zeep cache location.
+    wsdl_cache_ttl = 60 * 60 * 24
+    wsdl_bundled = False  # Load the WSDL snapshot shipped with this library.
+
+    # These attributes configure the resilience of the SOAP services. They
+    # are disabled by default. See ``five9.resilience``.
+    retry_policy = None  # ``RetryPolicy`` of the failed calls to retry.
+    rate_limit = None  # Calls per second, or a shared ``RateLimiter``.
+    circuit_breaker = None  # Failure threshold, or a ``CircuitBreaker``.
+
+    # Process-wide pool of clients, shared by all instances. Set to ``None``
+    # on an instance or subclass to disable sharing.
+    client_pool = ClientPool()
+
+    # Maximum amount of cached record types (see ``get_record_type``).
+    RECORD_TYPES_MAX = 128
+    _record_types = {}
+
+    # Set to an ``Instrumentation`` to measure the calls of the SOAP services.
+    # See ``five9.instrumentation``.
+    instrumentation = None
+
+    # The proxy classes of the services, if instrumentation or resilience
+    # are enabled.
+    _instrumented_service_class = InstrumentedService
+    _resilient_service_class = ResilientService
+
     # API Objects
     _api_configuration = None
     _api_supervisor = None
@@ -63,6 +104,7 @@ class Five9(object):
         self.username = username
         self.auth = requests.auth.HTTPBasicAuth(username, password)
         self.env = Environment(self)
+        self.reports = ReportRunner(self)
 
     @staticmethod
     def create_mapping(record, keys):
@@ -96,8 +138,90 @@ class Five9(object):
             'fields': list(ordered.values()),
         }
 
-    @staticmethod
-    def parse_response(fields, records):
+    def statistics_feed(self, statistic_type, **kwargs):
+        """Return an incrementally updated feed of supervisor statistics.
+
+        Args:
+            statistic_type (str): The statistic type, such as ``AgentState``.
+            **kwargs: Other arguments, as accepted by
+                :class:`five9.statistics.StatisticsFeed`.
+
+        Returns:
+            five9.statistics.StatisticsFeed: The feed. It is not polled until
+            ``poll`` or ``start`` is called.
+        """
+        return StatisticsFeed(self, statistic_type, **kwargs)
+
+    def upsert_contacts(self, contacts, keys, **kwargs):
+        """Create or update contacts in batches using the bulk CRM imports.
+
+        Args:
+            contacts (iter[dict]): Contacts keyed by field name. This can be a
+                lazy iterable of any size.
+            keys (list[str]): Fields that are used to match existing
+                contacts.
+            **kwargs: Other arguments, as accepted by
+                :class:`five9.imports.CrmImporter`, such as ``batch_size`` or
+                the ``crmAddMode`` and ``crmUpdateMode`` settings.
+
+        Returns:
+            list[five9.imports.ImportBatch]: The outcome of each batch.
+        """
+        return CrmImporter(self, keys, **kwargs).run(contacts)
+
+    def load_list(self, list_name, records, keys, **kwargs):
+        """Add records to a dialing list in batches using bulk list imports.
+
+        Args:
+            list_name (str): Name of the dialing list.
+            records (iter[dict]): Records keyed by field name. This can be a
+                lazy iterable of any size, such as a ``csv.DictReader``.
+            keys (list[str]): Fields that are used to match existing
+                contacts.
+            **kwargs: Other arguments, as accepted by
+                :class:`five9.imports.ListImporter`, such as ``batch_bytes``,
+                ``max_pending`` or the ``listAddMode`` setting.
+
+        Returns:
+            list[five9.imports.ImportBatch]: The outcome of each batch.
+        """
+        return ListImporter(self, list_name, keys, **kwargs).run(records)
+
+    def contact_mirror(self, path=':memory:', **kwargs):
+        """Return a local copy of the contacts for fast lookups.
+
+        Args:
+            path (str, optional): Path of the SQLite database.
+            **kwargs: Other arguments, as accepted by
+                :class:`five9.contact_mirror.ContactMirror`, such as ``keys``
+                or ``modified_field``.
+
+        Returns:
+            five9.contact_mirror.ContactMirror: The mirror. It is empty until
+            ``sync`` is called.
+        """
+        return ContactMirror(self, path, **kwargs)
+
+    def search_contacts(self, query, **kwargs):
+        """Yield the contacts matching the query, however many there are.
+
+        The query is split into sub-queries below the page size of
+        ``getContactRecords``, which are run in parallel.
+
+        Args:
+            query (dict): Values keyed by field name, as accepted by
+                :meth:`create_criteria`.
+            **kwargs: Other arguments, as accepted by
+                :class:`five9.contacts.ContactSearch`, such as ``keys`` or
+                ``max_workers``.
+
+        Returns:
+            iter[dict]: The parsed contacts, as they arrive.
+        """
+        return ContactSearch(self, **kwargs).search(query)
+
+    @classmethod
+    def parse_response(cls, fields, records, format='dict', lazy=False):
         """Parse an API response into usable objects.
 
         Args:
@@ -140,14 +264,72 @@ class Five9(object):
                         }
                     ]
 
+            format (str, optional): The representation of the result:
+
+                * ``dict``: Each record is a ``dict`` keyed by field name.
+                * ``tuple``: Each record is a ``namedtuple``. The type is
+                  only created once per field list, and the field names are
+                  not repeated in every record. Fields that are not valid
+                  identifiers are renamed positionally (``_1``).
+                * ``columnar``: A single ``OrderedDict`` of value lists,
+                  keyed by field name. ``lazy`` does not apply. Use
+                  :func:`five9.columnar.to_columns` for typed columns.
+
+            lazy (bool, optional): Set to ``True`` to return a generator that
+                parses the records as they are iterated, instead of a list.
+
         Returns:
-            list[dict]: List of parsed records.
+            list[dict]: List of parsed records, or a generator or mapping of
+            columns as described above.
+
+        Raises:
+            ValidationError: If the format is not supported.
         """
-        data = [i['values']['data'] for i in records]
-        return [
-            {fields[idx]: row for idx, row in enumerate(d)}
-            for d in data
-        ]
+        if format == 'columnar':
+            return cls._parse_columns(fields, records)
+        make = cls._get_row_factory(fields, format)
+        rows = (make(record['values']['data']) for record in records)
+        return rows if lazy else list(rows)
+
+    @classmethod
+    def get_record_type(cls, fields):
+        """Return the ``namedtuple`` type used for records with the fields.
+
+        Args:
+            fields (list[str]): The fields of the records.
+
+        Returns:
+            type: The cached ``namedtuple`` type for the fields.
+        """
+        fields = tuple(fields)
+        try:
+            return cls._record_types[fields]
+        except KeyError:
+            record_type = namedtuple('Record', fields, rename=True)
+            if len(cls._record_types) >= cls.RECORD_TYPES_MAX:
+                cls._record_types.clear()
+            cls._record_types[fields] = record_type
+            return record_type
+
+    @classmethod
+    def _get_row_factory(cls, fields, format):
+        """Return a callable that parses record values into the format."""
+        if format == 'dict':
+            return lambda data: dict(zip(fields, data))
+        elif format == 'tuple':
+            return cls.get_record_type(fields)._make
+        raise ValidationError(
+            'The response format "%s" is not supported.' % format,
+        )
+
+    @staticmethod
+    def _parse_columns(fields, records):
+        """Return the records transposed into lists of values per field."""
+        columns = zip(*(r['values']['data'] for r in records))
+        result = OrderedDict((field, []) for field in fields)
+        for field, column in zip(fields, columns):
+            result[field] = list(column)
+        return result
 
     @classmethod
     def create_criteria(cls, query):
@@ -176,12 +358,15 @@ class Five9(object):
         Returns:
             zeep.Client: Authenticated API client.
         """
-        return zeep.Client(
+        client = zeep.Client(
             wsdl % quote(self.username),
             transport=zeep.Transport(
+                cache=self._get_wsdl_cache(wsdl),
                 session=self._get_authenticated_session(),
             ),
         )
+        client.plugins.append(InstrumentationPlugin())
+        return client
 
     def _get_authenticated_session(self):
         """Return an authenticated requests session.
@@ -191,15 +376,89 @@ class Five9(object):
         """
         session = requests.Session()
         session.auth = self.auth
+        session.hooks['response'].append(record_response)
+        if self.client_pool is not None:
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=self.client_pool.pool_connections,
+                pool_maxsize=self.client_pool.pool_maxsize,
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
         return session
 
+    def _get_wsdl_cache(self, wsdl):
+        """Return the document cache to use when loading the WSDL.
+
+        Returns:
+            WsdlCache: Cache keyed to the API version of the WSDL, or
+            ``None`` if caching is disabled.
+        """
+        if not (self.wsdl_cache_enabled or self.wsdl_bundled):
+            return None
+        return WsdlCache(
+            path=self.wsdl_cache_path,
+            timeout=self.wsdl_cache_ttl,
+            version=WsdlCache.get_version(wsdl),
+            bundled=self.wsdl_bundled,
+            persistent=self.wsdl_cache_enabled,
+        )
+
     def _cached_client(self, client_type):
+        service = self._get_client(client_type).service
+        if self.instrumentation is not None:
+            service = self._instrumented_service_class(
+                service, self.instrumentation,
+            )
+        if self.retry_policy is None and self.rate_limit is None and \
+                self.circuit_breaker is None:
+            return service
+        return self._get_resilient_service(service)
+
+    def _get_resilient_service(self, service):
+        """Return the service wrapped in the configured resilience layer.
+
+        Numeric ``rate_limit`` and ``circuit_breaker`` settings are converted
+        into a limiter and breaker that are shared by the services of this
+        instance.
+
+        Returns:
+            five9.resilience.ResilientService: The wrapped service.
+        """
+        if self.rate_limit is not None and \
+                not isinstance(self.rate_limit, RateLimiter):
+            self.rate_limit = RateLimiter(self.rate_limit)
+        if self.circuit_breaker is not None and \
+                not isinstance(self.circuit_breaker, CircuitBreaker):
+            self.circuit_breaker = CircuitBreaker(self.circuit_breaker)
+        return self._resilient_service_class(
+            service,
+            retry_policy=self.retry_policy,
+            rate_limit=self.rate_limit,
+            circuit_breaker=self.circuit_breaker,
+        )
+
+    def _get_client(self, client_type):
+        """Return the SOAP client of the type, creating it if required.
+
+        Args:
+            client_type (str): Either ``configuration`` or ``supervisor``.
+
+        Returns:
+            zeep.Client: The cached or pooled client.
+        """
         attribute = '_api_%s' % client_type
         if not getattr(self, attribute, None):
             wsdl = getattr(self, 'WSDL_%s' % client_type.upper())
-            client = self._get_authenticated_client(wsdl)
+            if self.client_pool is None:
+                client = self._get_authenticated_client(wsdl)
+            else:
+                client = self.client_pool.get(
+                    self.username, wsdl, self.auth,
+                    lambda: self._get_authenticated_client(wsdl),
+                    self._get_pool_options(client_type),
+                )
             setattr(self, attribute, client)
-        return getattr(self, attribute).service
+        return getattr(self, attribute)
 
     def __create_supervisor_session(self, supervisor):
         """Create a new session on the supervisor service.
@@ -207,7 +466,31 @@ class Five9(object):
         This is required in order to use most methods for the supervisor,
         so it is called implicitly when generating a supervisor session.
         """
-        session_params = {
+        session_params = self._get_supervisor_session_params()
+        supervisor.setSessionParameters(session_params)
+        return session_params
+
+    def _get_pool_options(self, client_type):
+        """Return the settings that pooled clients of the type must share.
+
+        The parameters of the supervisor session (such as the time zone)
+        are set on the remote session of the client, so only instances with
+        the same parameters can share it.
+
+        Returns:
+            tuple: The hashable settings, or ``None``.
+        """
+        if client_type != 'supervisor':
+            return None
+        return tuple(sorted(self._get_supervisor_session_params().items()))
+
+    def _get_supervisor_session_params(self):
+        """Return the parameters used to create a supervisor session.
+
+        Returns:
+            dict: Session parameters built from the instance variables.
+        """
+        return {
             'forceLogoutSession': self.force_logout_session,
             'rollingPeriod': self.rolling_period,
             'statisticsRange': self.statistics_range,
@@ -218,8 +501,6 @@ class Five9(object):
                 self.time_zone_offset,
             ),
         }
-        supervisor.setSessionParameters(session_params)
-        return session_params
 
     @staticmethod
     def __to_milliseconds(hour):
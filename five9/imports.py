@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import csv
+import time
+
+from collections import OrderedDict, deque
+from itertools import islice
+
+from six import text_type
+from zeep.helpers import serialize_object
+
+from .exceptions import ValidationError
+
+
+class ImportBatch(object):
+    """The outcome of one batch of a bulk import."""
+
+    def __init__(self, index, size):
+        self.index = index
+        self.size = size
+        self.identifier = None
+        self.result = None
+        self.error = None
+
+    def __repr__(self):
+        return '<ImportBatch index=%d size=%d success=%s>' % (
+            self.index, self.size, self.success,
+        )
+
+    @property
+    def success(self):
+        """Return whether the batch was imported without failure."""
+        if self.error is not None or self.result is None:
+            return False
+        return bool(self.result.get('success'))
+
+    @property
+    def rejected(self):
+        """Return the amount of records that Five9 did not import.
+
+        All records of a batch are rejected if it failed as a whole.
+        """
+        if not self.success:
+            return self.size
+        return self.result.get('uploadErrorsCount') or 0
+
+
+class BulkImporter(object):
+    """Base for pipelines that stream records to Five9 bulk imports.
+
+    Records are packed into batches, which are submitted as asynchronous
+    imports. The import identifiers are then polled until Five9 has
+    finished, and the import result of each batch is collected. Only the
+    batches that are in flight are held in memory.
+
+    After a run, ``rows``, ``rejected`` and ``rows_per_second`` report the
+    outcome of the whole import.
+    """
+
+    # Name of the operation returning the result of an import identifier.
+    RESULT_OPERATION = None
+    # Estimated bytes that the XML of a record and of each of its values
+    # add to the request, used to size batches by ``batch_bytes``.
+    RECORD_OVERHEAD = len('<values></values>')
+    VALUE_OVERHEAD = len('<item></item>')
+
+    def __init__(self, five9, keys, fields=None, batch_size=10000,
+                 batch_bytes=None, max_pending=1, wait_time=30, **settings):
+        """Instantiate a new importer.
+
+        Args:
+            five9 (five9.Five9): The authenticated Five9 remote.
+            keys (list[str]): Fields that are used to match existing records.
+            fields (list[str], optional): Fields to import, in order. By
+                default, the keys of the first record are used.
+            batch_size (int, optional): Maximum amount of records per import.
+            batch_bytes (int, optional): Maximum estimated size of the import
+                data of each request, in bytes. Batches are then closed when
+                either limit is reached.
+            max_pending (int, optional): Maximum amount of imports that are
+                running at the same time.
+            wait_time (int, optional): Seconds that each ``isImportRunning``
+                call waits on the server for the import to finish.
+            **settings: Additional import settings, such as ``crmAddMode``.
+        """
+        self.five9 = five9
+        self.keys = keys
+        self.fields = fields
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.max_pending = max_pending
+        self.wait_time = wait_time
+        self.settings = settings
+        self.field_mappings = None
+        self.batches = []
+        self.seconds = None
+
+    @property
+    def rows(self):
+        """Return the amount of records of the last run."""
+        return sum(batch.size for batch in self.batches)
+
+    @property
+    def rejected(self):
+        """Return the amount of records that were not imported."""
+        return sum(batch.rejected for batch in self.batches)
+
+    @property
+    def rows_per_second(self):
+        """Return the throughput of the last run, including the waits."""
+        if not self.seconds:
+            return None
+        return self.rows / float(self.seconds)
+
+    def run(self, records):
+        """Import the records.
+
+        Args:
+            records (iter[dict]): Records to import, keyed by field name. This
+                can be a lazy iterable of any size.
+
+        Returns:
+            list[ImportBatch]: The outcome of each batch, in order.
+        """
+        started = time.time()
+        self.batches = batches = []
+        pending = deque()
+        records = iter(records)
+        for values in self._iter_batches(records):
+            batch = ImportBatch(len(batches), len(values))
+            batches.append(batch)
+            try:
+                batch.identifier = self._submit(self._get_settings(), {
+                    'values': [{'item': v} for v in values],
+                })
+            except Exception as e:
+                batch.error = e
+                continue
+            pending.append(batch)
+            if len(pending) >= self.max_pending:
+                self._wait(pending.popleft())
+        while pending:
+            self._wait(pending.popleft())
+        self.seconds = time.time() - started
+        return batches
+
+    def run_csv(self, csv_file, **fmtparams):
+        """Import the records of a CSV file with a header line.
+
+        The file is streamed, and the header is used as field names unless
+        ``fields`` was given.
+
+        Args:
+            csv_file (file): The opened CSV file.
+            **fmtparams: Formatting parameters passed to ``csv.DictReader``.
+
+        Returns:
+            list[ImportBatch]: The outcome of each batch, in order.
+        """
+        return self.run(csv.DictReader(csv_file, **fmtparams))
+
+    def _get_settings(self):
+        """Return the import settings, including the field mapping."""
+        settings = {
+            'fieldsMapping': self.field_mappings,
+            'skipHeaderLine': False,
+        }
+        settings.update(self.settings)
+        return settings
+
+    def _iter_batches(self, records):
+        """Yield lists of record values, in the order of ``fields``."""
+        records = self._init_fields(records)
+        if self.batch_bytes is not None:
+            for batch in self._iter_sized_batches(records):
+                yield batch
+            return
+        while True:
+            batch = [self._get_values(r) for r in islice(
+                records, self.batch_size,
+            )]
+            if not batch:
+                return
+            yield batch
+
+    def _iter_sized_batches(self, records):
+        """Yield lists of record values, within ``batch_bytes`` and
+        ``batch_size``."""
+        batch = []
+        size = 0
+        for record in records:
+            values = self._get_values(record)
+            record_size = self._get_size(values)
+            if batch and (len(batch) >= self.batch_size or
+                          size + record_size > self.batch_bytes):
+                yield batch
+                batch = []
+                size = 0
+            batch.append(values)
+            size += record_size
+        if batch:
+            yield batch
+
+    def _get_size(self, values):
+        """Return the estimated bytes of the record values in a request."""
+        size = self.RECORD_OVERHEAD + self.VALUE_OVERHEAD * len(values)
+        for value in values:
+            size += len(value.encode('utf-8'))
+        return size
+
+    def _init_fields(self, records):
+        """Compute the field mapping once, from ``fields`` or the first
+        record.
+
+        Returns:
+            iter: The records, including the first one.
+        """
+        first = None
+        if self.fields is None:
+            try:
+                first = record = next(records)
+            except StopIteration:
+                return records
+        else:
+            record = OrderedDict((field, None) for field in self.fields)
+        mapping = self.five9.create_mapping(record, self.keys)
+        self.field_mappings = mapping['field_mappings']
+        self.fields = list(mapping['data'])
+        missing = set(self.keys) - set(self.fields)
+        if missing:
+            raise ValidationError(
+                'The key fields %s are not in the records.' % sorted(missing),
+            )
+        if first is None:
+            return records
+        return _chain_first(first, records)
+
+    def _get_values(self, record):
+        """Return the string values of the record, ordered by field."""
+        values = []
+        for field in self.fields:
+            value = record.get(field)
+            values.append(u'' if value is None else text_type(value))
+        return values
+
+    def _submit(self, settings, import_data):
+        """Start the import of a batch, and return its identifier."""
+        raise NotImplementedError()
+
+    def _wait(self, batch):
+        """Poll the import of the batch until finished, then get the result.
+        """
+        try:
+            while self.five9.configuration.isImportRunning(
+                batch.identifier, self.wait_time,
+            ):
+                pass
+            method = getattr(self.five9.configuration, self.RESULT_OPERATION)
+            batch.result = serialize_object(method(batch.identifier))
+        except Exception as e:
+            batch.error = e
+
+
+class CrmImporter(BulkImporter):
+    """Upsert contacts into the Five9 contact database in batches.
+
+    Example:
+
+        .. code-block:: python
+
+            importer = CrmImporter(
+                five9, keys=['number1'], crmAddMode='ADD_NEW',
+                crmUpdateMode='UPDATE_ALL',
+            )
+            batches = importer.run(contacts)
+    """
+
+    RESULT_OPERATION = 'getCrmImportResult'
+
+    def __init__(self, five9, keys, operation='updateContacts', **kwargs):
+        """Instantiate a new contact importer.
+
+        Args:
+            five9 (five9.Five9): The authenticated Five9 remote.
+            keys (list[str]): Fields that are used to match existing
+                contacts.
+            operation (str, optional): The bulk operation to use, either
+                ``updateContacts`` or ``asyncUpdateCrmRecords``.
+            **kwargs: Other arguments, as accepted by :class:`BulkImporter`.
+        """
+        if operation not in ('updateContacts', 'asyncUpdateCrmRecords'):
+            raise ValidationError(
+                'The CRM import operation "%s" is not supported.' % operation,
+            )
+        super(CrmImporter, self).__init__(five9, keys, **kwargs)
+        self.operation = operation
+
+    def _submit(self, settings, import_data):
+        method = getattr(self.five9.configuration, self.operation)
+        return method(settings, import_data)
+
+
+class ListImporter(BulkImporter):
+    """Add records to a dialing list in large batches.
+
+    Batches are sized by ``batch_bytes`` as well as ``batch_size``, so that
+    records with many or long values do not produce oversized requests.
+    Several batches can be imported at the same time with ``max_pending``.
+
+    Example:
+
+        .. code-block:: python
+
+            importer = ListImporter(
+                five9, 'Nightly Leads', keys=['number1'],
+                batch_bytes=8000000, max_pending=3,
+                crmAddMode='ADD_NEW', listAddMode='ADD_IF_SOLE_CRM_MATCH',
+            )
+            with open('leads.csv') as fh:
+                batches = importer.run_csv(fh)
+            print(importer.rows_per_second, importer.rejected)
+    """
+
+    RESULT_OPERATION = 'getListImportResult'
+
+    def __init__(self, five9, list_name, keys,
+                 operation='asyncAddRecordsToList', batch_size=100000,
+                 batch_bytes=10000000, **kwargs):
+        """Instantiate a new list importer.
+
+        Args:
+            five9 (five9.Five9): The authenticated Five9 remote.
+            list_name (str): Name of the dialing list.
+            keys (list[str]): Fields that are used to match existing
+                contacts.
+            operation (str, optional): The bulk operation to use, either
+                ``asyncAddRecordsToList`` or ``addToList``.
+            batch_size (int, optional): Maximum amount of records per import.
+            batch_bytes (int, optional): Maximum estimated size of the import
+                data of each request, in bytes.
+            **kwargs: Other arguments, as accepted by :class:`BulkImporter`,
+                and ``listUpdateSettings`` such as ``listAddMode``.
+        """
+        if operation not in ('asyncAddRecordsToList', 'addToList'):
+            raise ValidationError(
+                'The list import operation "%s" is not supported.' %
+                operation,
+            )
+        kwargs.setdefault('cleanListBeforeUpdate', False)
+        super(ListImporter, self).__init__(
+            five9, keys, batch_size=batch_size, batch_bytes=batch_bytes,
+            **kwargs
+        )
+        self.list_name = list_name
+        self.operation = operation
+
+    def _submit(self, settings, import_data):
+        method = getattr(self.five9.configuration, self.operation)
+        return method(self.list_name, settings, import_data)
+
+
+def _chain_first(first, records):
+    """Yield the first record followed by the rest of them."""
+    yield first
+    for record in records:
+        yield record
@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import threading
+import time
+
+from bisect import bisect_left
+
+from zeep import Plugin
+
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
+
+
+# ``time.perf_counter`` is not available on Python 2.
+perf_counter = getattr(time, 'perf_counter', time.time)
+
+
+class _ThreadLocalVar(threading.local):
+    """Per-thread replacement of ``contextvars.ContextVar`` for Python < 3.7.
+
+    Only the methods used by this module are provided. Coroutines of the same
+    thread share the value, which is only an issue for ``AsyncFive9``.
+    """
+
+    def __init__(self, name, default=None):
+        self.name = name
+        self.value = default
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        """Set the value, and return the previous one as the token."""
+        token = self.value
+        self.value = value
+        return token
+
+    def reset(self, token):
+        self.value = token
+
+
+# The operation call that is currently being measured, if any.
+if ContextVar is not None:
+    _current_call = ContextVar('five9_current_call', default=None)
+else:
+    _current_call = _ThreadLocalVar('five9_current_call')
+
+
+class OperationCall(object):
+    """Measurements of a single call of a SOAP operation.
+
+    The timestamps are taken from ``time.perf_counter``, and are ``None``
+    for the phases that the call did not reach, such as when the HTTP
+    request failed.
+    """
+
+    __slots__ = ('operation', 'started', 'sent', 'received', 'parsed',
+                 'finished', 'request_bytes', 'response_bytes', 'error')
+
+    def __init__(self, operation):
+        self.operation = operation
+        self.started = perf_counter()
+        self.sent = self.received = self.parsed = self.finished = None
+        self.request_bytes = self.response_bytes = 0
+        self.error = None
+
+    @property
+    def latency(self):
+        """Return the seconds from the call until its result or error."""
+        return self.finished - self.started
+
+    @property
+    def serialize_time(self):
+        """Return the seconds spent building the request envelope."""
+        return self._get_duration(self.started, self.sent)
+
+    @property
+    def http_time(self):
+        """Return the seconds spent sending the request and receiving the
+        response."""
+        return self._get_duration(self.sent, self.received)
+
+    @property
+    def parse_time(self):
+        """Return the seconds spent parsing the response XML."""
+        return self._get_duration(self.received, self.parsed)
+
+    @property
+    def deserialize_time(self):
+        """Return the seconds spent converting the XML into objects."""
+        return self._get_duration(self.parsed, self.finished)
+
+    @staticmethod
+    def _get_duration(start, end):
+        if start is None or end is None:
+            return 0.0
+        return end - start
+
+
+class OperationStats(object):
+    """Aggregated measurements of the calls of a SOAP operation."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.errors = 0
+        self.latency = 0.0
+        self.latency_max = 0.0
+        self.serialize_time = 0.0
+        self.http_time = 0.0
+        self.parse_time = 0.0
+        self.deserialize_time = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def add(self, call):
+        """Add the measurements of the call."""
+        latency = call.latency
+        self.count += 1
+        self.errors += call.error is not None
+        self.latency += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.bucket_counts[bisect_left(self.buckets, latency)] += 1
+        self.serialize_time += call.serialize_time
+        self.http_time += call.http_time
+        self.parse_time += call.parse_time
+        self.deserialize_time += call.deserialize_time
+        self.request_bytes += call.request_bytes
+        self.response_bytes += call.response_bytes
+
+    def as_dict(self):
+        """Return the measurements, with a cumulative latency histogram.
+
+        Returns:
+            dict: The counters and totals. ``histogram`` is a list of
+            ``(upper_bound, count)`` tuples of the calls that took at most
+            ``upper_bound`` seconds, ending with ``float('inf')``, like the
+            buckets of a Prometheus histogram.
+        """
+        histogram = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),),
+                                self.bucket_counts):
+            total += count
+            histogram.append((bound, total))
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'latency': self.latency,
+            'latency_max': self.latency_max,
+            'histogram': histogram,
+            'serialize_time': self.serialize_time,
+            'http_time': self.http_time,
+            'parse_time': self.parse_time,
+            'deserialize_time': self.deserialize_time,
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+        }
+
+
+class Instrumentation(object):
+    """Thread-safe collector of measurements of the SOAP operations.
+
+    Calls are measured once this is assigned to ``Five9.instrumentation``.
+    Every call is added to the statistics of its operation, and passed to
+    the exporters, which can forward it to statsd, Prometheus or similar.
+
+    Example:
+
+        .. code-block:: python
+
+            client.instrumentation = Instrumentation()
+            client.instrumentation.add_exporter(StatsdExporter(statsd))
+            client.configuration.getWebConnectors('.*')
+            print(client.instrumentation.summary())
+    """
+
+    # Upper bounds of the latency histogram buckets, in seconds.
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, buckets=None):
+        """Instantiate a new collector.
+
+        Args:
+            buckets (iter[float], optional): Upper bounds of the latency
+                histogram buckets, in seconds. Defaults to ``BUCKETS``.
+        """
+        self.buckets = tuple(sorted(buckets or self.BUCKETS))
+        self.exporters = []
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def add_exporter(self, exporter):
+        """Call the exporter with every measured call.
+
+        Args:
+            exporter (callable): Called with the :class:`OperationCall`
+                once it finished. Errors of the exporter are not raised.
+        """
+        self.exporters.append(exporter)
+
+    def record(self, call):
+        """Add the finished call to the statistics, and export it."""
+        with self._lock:
+            stats = self._stats.get(call.operation)
+            if stats is None:
+                stats = self._stats[call.operation] = OperationStats(
+                    self.buckets,
+                )
+            stats.add(call)
+        for exporter in self.exporters:
+            try:
+                exporter(call)
+            except Exception:
+                pass
+
+    def stats(self):
+        """Return the measurements of each operation.
+
+        Returns:
+            dict: The result of :meth:`OperationStats.as_dict`, keyed by
+            operation name.
+        """
+        with self._lock:
+            return {name: stats.as_dict()
+                    for name, stats in self._stats.items()}
+
+    def summary(self):
+        """Return a text report of the operations, slowest first.
+
+        Returns:
+            str: A table with the call and error counts, the average and
+            maximum latency, the share of the time spent in each phase, and
+            the transferred bytes of each operation.
+        """
+        lines = [
+            '%-32s %7s %6s %9s %9s %6s %6s %6s %6s %10s %10s' % (
+                'operation', 'calls', 'errors', 'avg ms', 'max ms',
+                'ser%', 'http%', 'parse%', 'deser%', 'sent', 'received',
+            ),
+        ]
+        stats = sorted(self.stats().items(),
+                       key=lambda item: item[1]['latency'], reverse=True)
+        for name, values in stats:
+            total = values['latency'] or 1
+            lines.append(
+                '%-32s %7d %6d %9.1f %9.1f %6.1f %6.1f %6.1f %6.1f '
+                '%10d %10d' % (
+                    name, values['count'], values['errors'],
+                    values['latency'] / values['count'] * 1000,
+                    values['latency_max'] * 1000,
+                    values['serialize_time'] / total * 100,
+                    values['http_time'] / total * 100,
+                    values['parse_time'] / total * 100,
+                    values['deserialize_time'] / total * 100,
+                    values['request_bytes'], values['response_bytes'],
+                ),
+            )
+        return '\n'.join(lines)
+
+    def reset(self):
+        """Remove all of the measurements."""
+        with self._lock:
+            self._stats.clear()
+
+
+class StatsdExporter(object):
+    """Exporter of the calls to a statsd client.
+
+    Any client with the ``timing(stat, milliseconds)`` and
+    ``incr(stat, count)`` methods of the ``statsd`` package is supported.
+    """
+
+    def __init__(self, client, prefix='five9'):
+        self.client = client
+        self.prefix = prefix
+
+    def __call__(self, call):
+        stat = '%s.%s' % (self.prefix, call.operation)
+        self.client.timing('%s.latency' % stat, call.latency * 1000)
+        self.client.timing('%s.http' % stat, call.http_time * 1000)
+        self.client.timing('%s.parse' % stat, call.parse_time * 1000)
+        self.client.timing(
+            '%s.deserialize' % stat, call.deserialize_time * 1000,
+        )
+        self.client.incr('%s.calls' % stat, 1)
+        self.client.incr('%s.request_bytes' % stat, call.request_bytes)
+        self.client.incr('%s.response_bytes' % stat, call.response_bytes)
+        if call.error is not None:
+            self.client.incr('%s.errors' % stat, 1)
+
+
+class InstrumentationPlugin(Plugin):
+    """Zeep plugin marking the phases of the measured call.
+
+    It is added to every client, and does nothing unless a call is being
+    measured by an :class:`InstrumentedService`.
+    """
+
+    def egress(self, envelope, http_headers, operation, binding_options):
+        call = _current_call.get()
+        if call is not None:
+            call.sent = perf_counter()
+        return envelope, http_headers
+
+    def ingress(self, envelope, http_headers, operation):
+        call = _current_call.get()
+        if call is not None:
+            call.parsed = perf_counter()
+        return envelope, http_headers
+
+
+def record_response(response, **kwargs):
+    """Record the transferred bytes of the HTTP response of the call.
+
+    This is a response hook of the HTTP sessions of the clients. The
+    content of ``httpx`` responses must be read before it is called. The
+    content of streamed ``requests`` responses is not read yet, and is not
+    read by the hook either, so their size is taken from the
+    ``Content-Length`` header.
+    """
+    call = _current_call.get()
+    if call is not None:
+        request = response.request
+        # Requests has the ``body`` of the request, and httpx its ``content``.
+        body = getattr(request, 'body', None) or getattr(
+            request, 'content', None,
+        )
+        call.request_bytes = len(body or b'')
+        if getattr(response, '_content', None) is False:
+            call.response_bytes = int(
+                response.headers.get('Content-Length') or 0,
+            )
+        else:
+            call.response_bytes = len(response.content)
+        call.received = perf_counter()
+    return response
+
+
+class InstrumentedService(object):
+    """Proxy for a zeep service that measures the calls of its operations.
+
+    It is returned by ``Five9.configuration`` and ``Five9.supervisor`` when
+    ``Five9.instrumentation`` is set.
+    """
+
+    def __init__(self, service, instrumentation):
+        """Instantiate a new proxy.
+
+        Args:
+            service (zeep.proxy.ServiceProxy): The wrapped service.
+            instrumentation (Instrumentation): Collects the measurements.
+        """
+        self._service = service
+        self.instrumentation = instrumentation
+
+    def __getattr__(self, name):
+        operation = getattr(self._service, name)
+        if name.startswith('_') or not callable(operation):
+            return operation
+        return self._wrap(name, operation)
+
+    def _wrap(self, name, operation):
+        """Return a function that measures the call of the operation."""
+        def _call(*args, **kwargs):
+            call, token = self._start(name)
+            try:
+                return operation(*args, **kwargs)
+            except Exception as e:
+                call.error = e
+                raise
+            finally:
+                self._finish(call, token)
+        return _call
+
+    def _start(self, name):
+        """Start measuring a call of the operation.
+
+        Returns:
+            tuple: The :class:`OperationCall`, and the token that restores
+            the previously measured call in :meth:`_finish`.
+        """
+        call = OperationCall(name)
+        return call, _current_call.set(call)
+
+    def _finish(self, call, token):
+        call.finished = perf_counter()
+        _current_call.reset(token)
+        self.instrumentation.record(call)
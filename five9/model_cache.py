@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import re
+import threading
+import time
+
+from collections import OrderedDict
+
+from six import string_types
+
+
+class ModelCache(object):
+    """Thread-safe cache of search results, with TTL and LRU eviction.
+
+    A cache is assigned to a model with
+    :meth:`five9.models.base_model.BaseModel.enable_cache`, after which the
+    model's ``search`` and ``read`` results are served from it until they
+    expire or the model is changed through ``create``, ``write`` or
+    ``delete``.
+    """
+
+    def __init__(self, ttl=300, size=1024):
+        """Instantiate a new cache.
+
+        Args:
+            ttl (int, optional): Seconds that a result is served from the
+                cache. ``None`` keeps results until they are evicted.
+            size (int, optional): Maximum amount of results to keep. The
+                least recently used result is evicted when this is exceeded.
+        """
+        self.ttl = ttl
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # Incremented by every invalidation, so that results of searches that
+        # were started before it are not cached.
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._is_expired(entry)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """Return the cached value for the key.
+
+        Args:
+            key (hashable): The key of the value.
+            default (mixed, optional): Returned on a miss.
+
+        Returns:
+            mixed: The cached value, or ``default`` if it is missing or
+            expired.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or self._is_expired(entry):
+                if entry is not None:
+                    self.evictions += 1
+                self.misses += 1
+                return default
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, generation=None):
+        """Cache the value for the key, evicting the oldest if full.
+
+        Args:
+            key (hashable): The key of the value.
+            value (mixed): The value to cache.
+            generation (int, optional): The ``generation`` of the cache when
+                the value was fetched. The value is discarded if the cache
+                was invalidated since.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time(), value)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Remove all cached values, keeping the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+            self.generation += 1
+
+    def clear(self):
+        """Remove all cached values, and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+            self.invalidations = 0
+
+    def stats(self):
+        """Return the usage counters of the cache.
+
+        Returns:
+            dict: Dictionary with the ``hits``, ``misses``, ``evictions``,
+            ``invalidations`` and current ``size`` of the cache.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'size': len(self._entries),
+            }
+
+    def _is_expired(self, entry):
+        return self.ttl is not None and time.time() - entry[0] > self.ttl
+
+
+class ModelCatalog(object):
+    """Thread-safe local copy of all records of a model, indexed by UID.
+
+    A catalog is assigned to a model with
+    :meth:`five9.models.base_model.BaseModel.enable_prefetch`. The whole
+    catalog is fetched once, after which name searches, including lists of
+    names and regular expressions, are evaluated locally until the catalog
+    is refreshed.
+    """
+
+    # Characters that make a name filter a regular expression.
+    REGEX_CHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+    def __init__(self, refresh_interval=300):
+        """Instantiate a new catalog.
+
+        Args:
+            refresh_interval (int, optional): Seconds after which the
+                catalog is fetched again. ``None`` keeps it until it is
+                invalidated.
+        """
+        self.refresh_interval = refresh_interval
+        self.hits = 0
+        self.fetches = 0
+        self.generation = 0
+        self._indexes = {}
+        self._lock = threading.RLock()
+
+    def get(self, key):
+        """Return the index of the records for the key, if fresh.
+
+        Args:
+            key (hashable): The key of the catalog, such as the username.
+
+        Returns:
+            collections.OrderedDict: Records keyed by UID, or ``None`` if the
+            catalog needs to be fetched.
+        """
+        with self._lock:
+            entry = self._indexes.get(key)
+            if entry is None or self._is_stale(entry):
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def load(self, key, records, uid_field, generation=None):
+        """Index the fetched records for the key.
+
+        Args:
+            key (hashable): The key of the catalog, such as the username.
+            records (list[BaseModel]): All records of the model.
+            uid_field (str): Name of the field that identifies the records.
+            generation (int, optional): The ``generation`` of the catalog
+                when the fetch started. The records are not stored if the
+                catalog was invalidated since.
+
+        Returns:
+            collections.OrderedDict: Records keyed by UID.
+        """
+        index = OrderedDict(
+            (record[uid_field], record) for record in records
+        )
+        with self._lock:
+            self.fetches += 1
+            if generation is None or generation == self.generation:
+                self._indexes[key] = (time.time(), index)
+        return index
+
+    def invalidate(self):
+        """Mark all of the catalogs for fetching."""
+        with self._lock:
+            self._indexes.clear()
+            self.generation += 1
+
+    @classmethod
+    def search(cls, index, names):
+        """Return the records of the index that match the name filter.
+
+        Args:
+            index (dict): Records keyed by UID, as returned by :meth:`get`.
+            names (str or list[str]): A name or a regular expression that
+                must match the whole name, or a list of them. The items of a
+                list are alternatives, like in the filter that is sent to the
+                remote search. Empty filters match all records.
+
+        Returns:
+            list[BaseModel]: The matching records.
+        """
+        if not names:
+            return list(index.values())
+        if isinstance(names, string_types):
+            names = [names]
+        if all(cls.REGEX_CHARACTERS.isdisjoint(name) for name in names):
+            return [index[name] for name in OrderedDict.fromkeys(names)
+                    if name in index]
+        match = re.compile(r'(?:%s)\Z' % '|'.join(names)).match
+        return [r for name, r in index.items() if match(name)]
+
+    def stats(self):
+        """Return the usage counters of the catalog.
+
+        Returns:
+            dict: Dictionary with the ``hits`` and ``fetches`` of the
+            catalog, and the amount of records it holds (``size``).
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'fetches': self.fetches,
+                'size': sum(len(e[1]) for e in self._indexes.values()),
+            }
+
+    def _is_stale(self, entry):
+        return (self.refresh_interval is not None and
+                time.time() - entry[0] > self.refresh_interval)
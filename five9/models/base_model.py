@@ -3,9 +3,23 @@
 # License MIT (https://opensource.org/licenses/MIT).
 
 import properties
+import re
+import sys
 
+from collections import OrderedDict
+
+from properties import handlers, utils
 from zeep.helpers import serialize_object
-from six import string_types
+from six import integer_types, string_types, text_type
+
+from ..concurrency import run_concurrently
+from ..cursor import RecordCursor
+from ..model_cache import ModelCache, ModelCatalog
+from .compiler import compile_deserializer, compile_serializer
+
+
+# Values that are never empty, and are kept without further checks.
+SCALAR_TYPES = frozenset(string_types + integer_types + (float, bool))
 
 
 class BaseModel(properties.HasProperties):
@@ -19,6 +33,11 @@ class BaseModel(properties.HasProperties):
     # Typically this is ``name``.
     __uid_field__ = 'name'
 
+    # Cache of the search results, if enabled. See :meth:`enable_cache`.
+    __cache__ = None
+    # Local copy of all records, if enabled. See :meth:`enable_prefetch`.
+    __catalog__ = None
+
     @classmethod
     def create(cls, five9, data, refresh=False):
         """Create a record on Five9.
@@ -37,36 +56,193 @@ class BaseModel(properties.HasProperties):
         raise NotImplementedError()
 
     @classmethod
-    def search(cls, five9, filters):
+    def search(cls, five9, filters, cache=True, lazy=False):
         """Search for a record on the remote and return the results.
 
+        Results are served from the prefetched catalog or the model cache
+        when they are enabled. See :meth:`enable_prefetch` and
+        :meth:`enable_cache`.
+
         Args:
             five9 (five9.Five9): The authenticated Five9 remote.
             filters (dict): A dictionary of search parameters, keyed by the
                 name of the field to search. This should conform to the
                 schema defined in :func:`five9.Five9.create_criteria`.
+            cache (bool, optional): Set to ``False`` to bypass the cache.
+            lazy (bool, optional): Return a cursor that only builds the
+                records as they are iterated, instead of a list.
 
         Returns:
-            list[BaseModel]: A list of records representing the result.
+            list[BaseModel] or five9.cursor.RecordCursor: The records
+            representing the result.
         """
-        raise NotImplementedError()
+        cursor = cls._search_cursor(five9, filters, cache)
+        if lazy:
+            return cursor
+        return cls._then(cursor, list)
 
     @classmethod
-    def read(cls, five9, external_id):
+    def read(cls, five9, external_id, cache=True):
         """Return a record singleton for the ID.
 
         Args:
             five9 (five9.Five9): The authenticated Five9 remote.
             external_id (mixed): The identified on Five9. This should be the
                 value that is in the ``__uid_field__`` field on the record.
+            cache (bool, optional): Set to ``False`` to bypass the cache.
 
         Returns:
             BaseModel: The record, if found. Otherwise ``None``
         """
-        results = cls.search(five9, {cls.__uid_field__: external_id})
-        if not results:
-            return None
-        return results[0]
+        filters = {cls.__uid_field__: external_id}
+        if cache:
+            results = cls.search(five9, filters)
+        else:
+            results = cls.search(five9, filters, cache=False)
+        return cls._then(
+            results, lambda results: results[0] if results else None,
+        )
+
+    @classmethod
+    def read_many(cls, five9, external_ids, chunk_size=500, max_length=8000,
+                  max_workers=4, cache=True):
+        """Return the records for many IDs, with as few searches as possible.
+
+        The IDs are combined into name patterns, such as ``(A|B|C)``, which
+        are searched concurrently.
+
+        Args:
+            five9 (five9.Five9): The authenticated Five9 remote.
+            external_ids (iter): The values of the ``__uid_field__`` of the
+                records.
+            chunk_size (int, optional): Maximum amount of IDs per search.
+            max_length (int, optional): Maximum length of the pattern of a
+                search, in characters.
+            max_workers (int, optional): Maximum amount of concurrent
+                searches.
+            cache (bool, optional): Set to ``False`` to bypass the cache.
+
+        Returns:
+            list[BaseModel]: The record of each ID, in the order of the IDs.
+            Missing records are ``None``.
+
+        Raises:
+            Exception: The error of the first search that failed.
+        """
+        external_ids = list(external_ids)
+        kwargs = {} if cache else {'cache': False}
+        filters = [
+            {cls.__uid_field__: pattern}
+            for pattern in cls._get_id_patterns(
+                external_ids, chunk_size, max_length,
+            )
+        ]
+
+        def _collect(results):
+            index = {}
+            for records in results:
+                for record in records or []:
+                    index[record[cls.__uid_field__]] = record
+            return [index.get(external_id) for external_id in external_ids]
+
+        if cls._is_async(five9):
+            from ..async_five9 import gather_then
+            return gather_then(
+                [cls.search(five9, f, **kwargs) for f in filters], _collect,
+            )
+        results = run_concurrently(
+            lambda f: cls.search(five9, f, **kwargs), filters,
+            max_workers=max_workers,
+        )
+        if results.errors:
+            raise results.errors[min(results.errors)]
+        return _collect(results)
+
+    @classmethod
+    def enable_cache(cls, ttl=300, size=1024):
+        """Cache the search results of the model.
+
+        Args:
+            ttl (int, optional): Seconds that results are served from the
+                cache.
+            size (int, optional): Maximum amount of searches to cache.
+
+        Returns:
+            five9.model_cache.ModelCache: The cache, which also holds its
+            usage counters.
+        """
+        cls.__cache__ = ModelCache(ttl, size)
+        return cls.__cache__
+
+    @classmethod
+    def disable_cache(cls):
+        """Stop caching the search results of the model."""
+        cls.__cache__ = None
+
+    @classmethod
+    def enable_prefetch(cls, refresh_interval=300):
+        """Fetch all records of the model once, and search them locally.
+
+        Name searches (including lists of names and regular expressions) are
+        evaluated against the local catalog, rather than calling the remote
+        for every search.
+
+        Args:
+            refresh_interval (int, optional): Seconds after which the catalog
+                is fetched again.
+
+        Returns:
+            five9.model_cache.ModelCatalog: The catalog, which also holds its
+            usage counters.
+        """
+        cls.__catalog__ = ModelCatalog(refresh_interval)
+        return cls.__catalog__
+
+    @classmethod
+    def disable_prefetch(cls):
+        """Stop searching the records of the model locally."""
+        cls.__catalog__ = None
+
+    @classmethod
+    def invalidate_cache(cls):
+        """Remove all cached search results and prefetched records of the
+        model.
+        """
+        if cls.__cache__ is not None:
+            cls.__cache__.invalidate()
+        if cls.__catalog__ is not None:
+            cls.__catalog__.invalidate()
+
+    @classmethod
+    def from_zeep(cls, obj):
+        """Return a record built directly from trusted Five9 data.
+
+        This is a fast alternative to ``deserialize`` for data returned by
+        Five9. The zeep object is read in a single pass, and its values are
+        stored without being validated. The record is validated once it is
+        serialized (such as when it is written) or validated.
+
+        Args:
+            obj (zeep.objects.CompoundValue or dict): The object returned by
+                Five9.
+
+        Returns:
+            BaseModel: The record.
+        """
+        return cls._new_trusted(cls._get_deserializer()(obj))
+
+    def to_zeep(self):
+        """Return the record as the data that is sent to Five9.
+
+        This is a fast alternative to ``serialize`` that returns the same
+        dictionary, without the ``__class__`` keys. It uses a serializer
+        that is generated once for the model (see :meth:`_get_serializer`).
+
+        Returns:
+            dict: The values of the record, keyed by field name. Nested
+            records are converted to dictionaries as well.
+        """
+        return self._get_serializer()(self)
 
     def delete(self, five9):
         """Delete the record from the remote.
@@ -83,6 +259,16 @@ class BaseModel(properties.HasProperties):
         except KeyError:
             return default
 
+    def serialize(self, *args, **kwargs):
+        """Serialize the record, validating it first if it is trusted."""
+        self._validate_trusted()
+        return super(BaseModel, self).serialize(*args, **kwargs)
+
+    def validate(self):
+        """Validate the record, including the values of trusted records."""
+        self._validate_trusted()
+        return super(BaseModel, self).validate()
+
     def update(self, data):
         """Update the current memory record with the given data dict.
 
@@ -117,11 +303,116 @@ class BaseModel(properties.HasProperties):
                 this will be fetched from Five9. Otherwise, it's the data
                 record that was sent to the server.
         """
-        method(data)
-        if refresh:
-            return cls.read(method.__self__, data[cls.__uid_field__])
-        else:
-            return cls.deserialize(cls._get_non_empty_dict(data))
+        def _serialize(_result):
+            cls.invalidate_cache()
+            if refresh:
+                return cls.read(method.__self__, data[cls.__uid_field__])
+            else:
+                return cls.deserialize(cls._get_non_empty_dict(data))
+        return cls._then(method(data), _serialize)
+
+    @classmethod
+    def _search_cursor(cls, five9, filters, cache=True):
+        """Return a cursor of the search results, using the caches.
+
+        Returns:
+            five9.cursor.RecordCursor: The cursor, or an awaitable of it.
+        """
+        if cache and cls.__catalog__ is not None:
+            return cls._catalog_search(five9, filters)
+        model_cache = cls.__cache__ if cache else None
+        key = None
+        if model_cache is not None:
+            key = cls._get_cache_key(five9, filters)
+        if key is None:
+            return cls._then(cls._search(five9, filters), cls._get_cursor)
+        records = model_cache.get(key)
+        if records is not None:
+            return cls._resolved(five9, cls._copy_records(records))
+        generation = model_cache.generation
+
+        def _store(records):
+            records = list(records)
+            model_cache.set(key, records, generation)
+            return cls._copy_records(records)
+
+        return cls._then(cls._search(five9, filters), _store)
+
+    @classmethod
+    def _catalog_search(cls, five9, filters):
+        """Search the prefetched catalog, fetching it if required."""
+        catalog = cls.__catalog__
+        names = filters.get(cls.__uid_field__)
+        index = catalog.get(five9.username)
+        if index is not None:
+            return cls._resolved(
+                five9, cls._copy_records(catalog.search(index, names)),
+            )
+        generation = catalog.generation
+
+        def _load(records):
+            index = catalog.load(
+                five9.username, records, cls.__uid_field__, generation,
+            )
+            return cls._copy_records(catalog.search(index, names))
+
+        return cls._then(cls._search(five9, {}), _load)
+
+    @classmethod
+    def _copy_records(cls, records):
+        """Return a cursor of copies of the records, so that cached ones are
+        not changed.
+        """
+        return RecordCursor(records, properties.copy)
+
+    @staticmethod
+    def _get_cursor(records):
+        """Return the records as a cursor, if they are not one already."""
+        if isinstance(records, RecordCursor):
+            return records
+        return RecordCursor(records)
+
+    @classmethod
+    def _get_cache_key(cls, five9, filters):
+        """Return the cache key of a search, or ``None`` if uncacheable."""
+        items = []
+        for field, value in filters.items():
+            if isinstance(value, (list, tuple, set)):
+                value = tuple(value)
+            items.append((field, value))
+        key = (cls.__name__, five9.username, tuple(sorted(items)))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @classmethod
+    def _get_id_patterns(cls, external_ids, chunk_size, max_length):
+        """Yield patterns matching exactly the IDs, in bounded chunks.
+
+        Args:
+            external_ids (list): The IDs to match. Duplicates are ignored.
+            chunk_size (int): Maximum amount of IDs per pattern.
+            max_length (int): Maximum length of a pattern. An ID that is
+                longer than this is searched alone.
+
+        Yields:
+            str: The next pattern, such as ``(A|B)``.
+        """
+        chunk = []
+        length = 2
+        for external_id in OrderedDict.fromkeys(external_ids):
+            escaped = re.escape(text_type(external_id))
+            if chunk and (len(chunk) >= chunk_size or
+                          length + len(escaped) + 1 > max_length):
+                yield '(%s)' % '|'.join(chunk)
+                chunk = []
+                length = 2
+            chunk.append(escaped)
+            length += len(escaped) + 1
+        if chunk:
+            yield '(%s)' % '|'.join(chunk)
 
     @classmethod
     def _get_name_filters(cls, filters):
@@ -134,28 +425,144 @@ class BaseModel(properties.HasProperties):
         return filters
 
     @classmethod
-    def _get_non_empty_dict(cls, mapping):
-        """Return the mapping without any ``None`` values (recursive)."""
-        res = {}
-        for key, value in mapping.items():
-            if hasattr(value, 'items'):
-                value = cls._get_non_empty_dict(value)
-            elif isinstance(value, list):
-                value = cls._get_non_empty_list(value)
-            if value not in [[], {}, None]:
-                res[key] = value
-        return res
+    def _get_field_plan(cls):
+        """Return how the value of each property is converted.
+
+        The plan is computed once per model.
+
+        Returns:
+            list[tuple]: Tuples of the property name, the property, whether
+            it is a list, and the model of its records (or ``None`` for
+            plain values).
+        """
+        plan = cls.__dict__.get('_field_plan')
+        if plan is not None:
+            return plan
+        plan = []
+        for name, prop in cls._props.items():
+            is_list = isinstance(prop, properties.Tuple)
+            item_prop = prop.prop if is_list else prop
+            model = None
+            if isinstance(item_prop, properties.Instance) and \
+                    issubclass(item_prop.instance_class, BaseModel):
+                model = item_prop.instance_class
+            plan.append((name, prop, is_list, model))
+        cls._field_plan = plan
+        return plan
 
     @classmethod
-    def _get_non_empty_list(cls, iter):
-        """Return a list of the input, excluding all ``None`` values."""
-        res = []
-        for value in iter:
-            if hasattr(value, 'items'):
-                value = cls._get_non_empty_dict(value) or None
-            if value is not None:
-                res.append(value)
-        return res
+    def _get_serializer(cls):
+        """Return the serializer of :meth:`to_zeep`, generating it once.
+
+        See :func:`five9.models.compiler.compile_serializer`.
+        """
+        serializer = cls.__dict__.get('_serializer')
+        if serializer is None:
+            serializer = staticmethod(compile_serializer(cls))
+            cls._serializer = serializer
+        return serializer.__func__
+
+    @classmethod
+    def _get_deserializer(cls):
+        """Return the deserializer of :meth:`from_zeep`, generating it once.
+
+        See :func:`five9.models.compiler.compile_deserializer`.
+        """
+        deserializer = cls.__dict__.get('_deserializer')
+        if deserializer is None:
+            deserializer = staticmethod(compile_deserializer(cls))
+            cls._deserializer = deserializer
+        return deserializer.__func__
+
+    @classmethod
+    def _get_trusted_values(cls, obj):
+        """Return the non-empty values of Five9 data, keyed by property.
+
+        Nested records are built with :meth:`_new_trusted`, and empty values
+        are omitted, like :meth:`_get_non_empty_dict` does.
+        """
+        return cls._get_deserializer()(obj)
+
+    @classmethod
+    def _get_trusted_defaults(cls):
+        """Return the properties with a default value, computed once.
+
+        Returns:
+            list[tuple]: Tuples of the property name, the property and its
+            default (which may be a callable returning the default).
+        """
+        defaults = cls.__dict__.get('_trusted_defaults')
+        if defaults is not None:
+            return defaults
+        defaults = []
+        for name, prop in cls._props.items():
+            default = cls._defaults.get(name, prop.default)
+            if default is not utils.undefined:
+                defaults.append((name, prop, default))
+        cls._trusted_defaults = defaults
+        return defaults
+
+    @classmethod
+    def _new_trusted(cls, values):
+        """Return a new record holding the values, without validating them.
+        """
+        record = cls.__new__(cls)
+        object.__setattr__(record, '_backend', values)
+        object.__setattr__(record, '_listeners', {})
+        object.__setattr__(record, '_trusted', True)
+        for observer in record._prop_observers.values():
+            handlers._set_listener(record, observer)
+        for name, prop, default in cls._get_trusted_defaults():
+            if name in values:
+                continue
+            if callable(default):
+                default = default()
+            values[name] = prop.validate(record, default)
+        return record
+
+    def _validate_trusted(self):
+        """Validate the values of a record built by :meth:`from_zeep`."""
+        if not self.__dict__.get('_trusted'):
+            return
+        for name, value in list(self._backend.items()):
+            for nested in value if isinstance(value, list) else [value]:
+                if isinstance(nested, BaseModel):
+                    nested._validate_trusted()
+            self._backend[name] = self._props[name].validate(self, value)
+        self._trusted = False
+
+    @classmethod
+    def _get_non_empty_dict(cls, mapping, in_place=False):
+        """Return the mapping without any ``None`` values (recursive).
+
+        Nested mappings and lists are pruned as well, and dropped if they
+        end up empty. See :func:`_prune`.
+
+        Args:
+            mapping (dict): The mapping to prune.
+            in_place (bool, optional): Prune the mapping and its nested
+                containers in place, rather than building new ones.
+
+        Returns:
+            dict: The pruned mapping.
+        """
+        return _prune(mapping, True, in_place)
+
+    @classmethod
+    def _get_non_empty_list(cls, iter, in_place=False):
+        """Return a list of the input, excluding all ``None`` values.
+
+        Mappings in the list are pruned, and dropped if they end up empty.
+
+        Args:
+            iter (iter): The values to prune.
+            in_place (bool, optional): Prune the list and the mappings in it
+                in place. This requires ``iter`` to be a list.
+
+        Returns:
+            list: The pruned values.
+        """
+        return _prune(iter, False, in_place)
 
     @classmethod
     def _name_search(cls, method, filters):
@@ -169,18 +576,94 @@ class BaseModel(properties.HasProperties):
                 schema defined in :func:`five9.Five9.create_criteria`.
 
         Returns:
-            list[BaseModel]: A list of records representing the result.
+            five9.cursor.RecordCursor: A cursor of the records representing
+            the result.
         """
         filters = cls._get_name_filters(filters)
-        return [
-            cls.deserialize(cls._zeep_to_dict(row)) for row in method(filters)
-        ]
+        return cls._then(method(filters), lambda rows: RecordCursor(
+            rows or [], cls.from_zeep,
+        ))
+
+    @classmethod
+    def _invalidate_after(cls, result):
+        """Invalidate the cache once the remote call has finished.
+
+        Returns:
+            mixed: The result of the remote call.
+        """
+        def _invalidate(result):
+            cls.invalidate_cache()
+            return result
+        return cls._then(result, _invalidate)
+
+    @staticmethod
+    def _is_async(five9):
+        """Return whether the remote calls of ``five9`` return awaitables."""
+        if sys.version_info < (3, 5):
+            return False
+        from ..async_five9 import AsyncFive9
+        return isinstance(five9, AsyncFive9)
+
+    @classmethod
+    def _resolved(cls, five9, value):
+        """Return a value in the form that remote calls of ``five9`` return.
+
+        Args:
+            five9 (five9.Five9): The authenticated Five9 remote.
+            value (mixed): The value to return.
+
+        Returns:
+            mixed: The value, or an awaitable of it for ``five9.AsyncFive9``.
+        """
+        if cls._is_async(five9):
+            from ..async_five9 import resolved
+            return resolved(value)
+        return value
+
+    @classmethod
+    def _search(cls, five9, filters):
+        """Search for records on the remote, bypassing the cache.
+
+        Models implement this in order to support :meth:`search`.
+
+        Args:
+            five9 (five9.Five9): The authenticated Five9 remote.
+            filters (dict): A dictionary of search parameters, keyed by the
+                name of the field to search.
+
+        Returns:
+            list[BaseModel] or five9.cursor.RecordCursor: The records
+            representing the result.
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def _then(result, callback):
+        """Call ``callback`` with the result of a remote call.
+
+        Remote calls made through ``five9.AsyncFive9`` return awaitables. In
+        that case, an awaitable resolving to the callback's return value is
+        returned instead, so that model methods serve both clients.
+
+        Args:
+            result (mixed): The return value of the remote call.
+            callback (callable): Called with the result of the remote call.
+
+        Returns:
+            mixed: The return value of ``callback``, or an awaitable of it.
+        """
+        if hasattr(result, '__await__'):
+            from ..async_five9 import await_then
+            return await_then(result, callback)
+        return callback(result)
 
     @classmethod
     def _zeep_to_dict(cls, obj):
         """Convert a zeep object to a dictionary."""
         res = serialize_object(obj)
-        res = cls._get_non_empty_dict(res)
+        # ``serialize_object`` returns new containers, so they can be pruned
+        # without copying them again.
+        res = cls._get_non_empty_dict(res, in_place=True)
         return res
 
     def __getitem__(self, item):
@@ -211,3 +694,136 @@ class BaseModel(properties.HasProperties):
                     key, self.__class__.__name__,
                 ),
             )
+
+
+def _prune(container, is_mapping, in_place):
+    """Remove ``None`` and empty values from nested containers.
+
+    The containers are walked iteratively with an explicit stack, so that
+    deep payloads do not recurse, and containers that are pruned in place
+    are not rebuilt. Scalar values are kept by their type alone, and
+    mappings holding only scalars and ``None`` (such as key value pairs) are
+    pruned without being put on the stack.
+
+    Mappings lose their ``None`` values, and nested mappings and lists that
+    end up empty. Lists lose their ``None`` values, and nested mappings that
+    end up empty. Other values in lists are kept as they are.
+
+    Args:
+        container (dict or iter): The mapping or list to prune.
+        is_mapping (bool): Whether ``container`` is a mapping.
+        in_place (bool): Prune the containers in place.
+
+    Returns:
+        dict or list: The pruned container.
+    """
+    root = _new_frame(container, is_mapping, in_place, None, None)
+    stack = [root]
+    while stack:
+        frame = stack[-1]
+        items, _, result, is_mapping, _, _, empty = frame
+        child = None
+        if is_mapping:
+            for name, value in items:
+                if type(value) in SCALAR_TYPES:
+                    if not in_place:
+                        result[name] = value
+                elif hasattr(value, 'items'):
+                    leaf = _prune_leaf(value, in_place)
+                    if leaf is None:
+                        child = _new_frame(value, True, in_place, frame, name)
+                        break
+                    if not leaf:
+                        if in_place:
+                            empty.append(name)
+                    elif not in_place:
+                        result[name] = leaf
+                elif isinstance(value, list):
+                    child = _new_frame(value, False, in_place, frame, name)
+                    break
+                elif value is None or value == {} or value == []:
+                    if in_place:
+                        empty.append(name)
+                elif not in_place:
+                    result[name] = value
+        else:
+            for value in items:
+                if value is None:
+                    continue
+                if hasattr(value, 'items'):
+                    leaf = _prune_leaf(value, in_place)
+                    if leaf is None:
+                        child = _new_frame(value, True, in_place, frame, None)
+                        break
+                    if leaf:
+                        result.append(leaf)
+                    continue
+                result.append(value)
+        if child is not None:
+            stack.append(child)
+            continue
+        stack.pop()
+        _finish_frame(frame, in_place)
+    return root[2]
+
+
+def _new_frame(container, is_mapping, in_place, parent, key):
+    """Return the state of a container that is being pruned by ``_prune``.
+
+    Returns:
+        list: The items iterator, the container, the pruned result, whether
+        it is a mapping, the parent frame, the key in the parent, and the
+        keys to remove from a mapping that is pruned in place.
+    """
+    if is_mapping:
+        result = container if in_place else {}
+        items = container.items()
+    else:
+        result = []
+        items = container
+    return [iter(items), container, result, is_mapping, parent, key, []]
+
+
+def _finish_frame(frame, in_place):
+    """Complete a pruned container, and add it to its parent if not empty.
+    """
+    _, source, result, is_mapping, parent, key, empty = frame
+    # A mapping cannot change size while it is iterated, so its empty keys
+    # are only removed once it has been walked.
+    for name in empty:
+        del result[name]
+    if in_place and not is_mapping:
+        if len(result) != len(source):
+            source[:] = result
+        result = frame[2] = source
+    if parent is None:
+        return
+    if not parent[3]:
+        if result:
+            parent[2].append(result)
+    elif not result:
+        if in_place:
+            parent[6].append(key)
+    elif not in_place:
+        parent[2][key] = result
+
+
+def _prune_leaf(mapping, in_place):
+    """Prune a mapping that holds only scalars and ``None``.
+
+    Returns:
+        dict: The pruned mapping, or ``None`` if it holds other values.
+    """
+    empty = None
+    for value in mapping.values():
+        if value is None:
+            empty = True
+        elif type(value) not in SCALAR_TYPES:
+            return None
+    if not empty:
+        return mapping if in_place else dict(mapping)
+    if in_place:
+        for name in [n for n, v in mapping.items() if v is None]:
+            del mapping[name]
+        return mapping
+    return {n: v for n, v in mapping.items() if v is not None}
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+"""Generate the serializer and deserializer functions of a model.
+
+The ``properties`` library serializes records by walking their properties
+generically, dispatching each value through its property. The functions
+generated here unroll that walk for one model: each field is read from the
+record backend and converted according to its kind, which is resolved once
+when the function is built.
+"""
+
+from properties.basic import GettableProperty
+
+
+def compile_serializer(model):
+    """Return a function converting records of the model to Five9 data.
+
+    The function returns the same dictionary as
+    ``record.serialize(include_class=False)``, which zeep accepts for the
+    model's type. Trusted records are validated first, like
+    :meth:`five9.models.base_model.BaseModel.serialize` does.
+
+    Args:
+        model (type): The :class:`five9.models.base_model.BaseModel` class.
+
+    Returns:
+        callable: The serializer, called with a record of the model.
+    """
+    namespace = {}
+    lines = [
+        'def serialize(record):',
+        "    if record.__dict__.get('_trusted'):",
+        '        record._validate_trusted()',
+        '    backend = record._backend',
+        '    data = {}',
+    ]
+    for index, (name, prop, is_list, nested) in \
+            enumerate(model._get_field_plan()):
+        lines += [
+            '    value = backend.get(%r)' % name,
+            '    if value is not None:',
+        ]
+        item_prop = prop.prop if is_list else prop
+        generic = prop.serializer is not None or \
+            item_prop.serializer is not None or \
+            (nested is None and not _is_plain(item_prop))
+        if generic:
+            namespace['p_%d' % index] = prop
+            lines += [
+                '        value = p_%d.serialize(value, include_class=False)' %
+                index,
+                '        if value is not None:',
+                '            data[%r] = value' % name,
+            ]
+        elif nested is not None:
+            namespace['s_%d' % index] = nested._get_serializer()
+            if is_list:
+                lines.append(
+                    '        data[%r] = [None if v is None else s_%d(v) '
+                    'for v in value]' % (name, index),
+                )
+            else:
+                lines.append('        data[%r] = s_%d(value)' % (name, index))
+        elif is_list:
+            lines.append('        data[%r] = list(value)' % name)
+        else:
+            lines.append('        data[%r] = value' % name)
+    lines.append('    return data')
+    return _compile(model, 'serialize', lines, namespace)
+
+
+def compile_deserializer(model):
+    """Return a function reading the values of Five9 data for the model.
+
+    The function returns the non-empty values of a zeep object (or
+    dictionary), keyed by property, with nested records built by
+    ``_new_trusted``. Values are not validated, as described in
+    :meth:`five9.models.base_model.BaseModel.from_zeep`.
+
+    Args:
+        model (type): The :class:`five9.models.base_model.BaseModel` class.
+
+    Returns:
+        callable: The deserializer, called with the data of a record.
+    """
+    namespace = {}
+    lines = [
+        'def deserialize(obj):',
+        "    values = getattr(obj, '__values__', obj)",
+        '    result = {}',
+    ]
+    for index, (name, _prop, is_list, nested) in \
+            enumerate(model._get_field_plan()):
+        lines += [
+            '    value = values.get(%r)' % name,
+            '    if value is not None:',
+        ]
+        if nested is not None:
+            namespace['d_%d' % index] = nested._get_deserializer()
+            namespace['n_%d' % index] = nested._new_trusted
+        if nested is not None and is_list:
+            lines += [
+                '        value = [n_%d(v) for v in [d_%d(v) for v in value '
+                'if v is not None] if v]' % (index, index),
+                '        if value:',
+                '            result[%r] = value' % name,
+            ]
+        elif nested is not None:
+            lines += [
+                '        value = d_%d(value)' % index,
+                '        if value:',
+                '            result[%r] = n_%d(value)' % (name, index),
+            ]
+        elif is_list:
+            lines += [
+                '        value = [v for v in value if v is not None]',
+                '        if value:',
+                '            result[%r] = value' % name,
+            ]
+        else:
+            lines.append('        result[%r] = value' % name)
+    lines.append('    return result')
+    return _compile(model, 'deserialize', lines, namespace)
+
+
+def _is_plain(prop):
+    """Return whether the property serializes values as they are."""
+    return type(prop).to_json is GettableProperty.to_json
+
+
+def _compile(model, name, lines, namespace):
+    """Compile the source lines, and return the function that they define.
+    """
+    filename = '<%s.%s>' % (model.__name__, name)
+    code = compile('\n'.join(lines) + '\n', filename, 'exec')
+    exec(code, namespace)
+    return namespace[name]
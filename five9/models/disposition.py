@@ -100,18 +100,7 @@ class Disposition(BaseModel):
         )
 
     @classmethod
-    def search(cls, five9, filters):
-        """Search for a record on the remote and return the results.
-
-        Args:
-            five9 (five9.Five9): The authenticated Five9 remote.
-            filters (dict): A dictionary of search parameters, keyed by the
-                name of the field to search. This should conform to the
-                schema defined in :func:`five9.Five9.create_criteria`.
-
-        Returns:
-            list[BaseModel]: A list of records representing the result.
-        """
+    def _search(cls, five9, filters):
         return cls._name_search(five9.configuration.getDispositions, filters)
 
     def delete(self, five9):
@@ -120,7 +109,9 @@ class Disposition(BaseModel):
         Args:
             five9 (five9.Five9): The authenticated Five9 remote.
         """
-        five9.configuration.removeDisposition(self.name)
+        return self._invalidate_after(
+            five9.configuration.removeDisposition(self.name),
+        )
 
     def write(self, five9):
         """Update the record on the remote.
@@ -128,4 +119,6 @@ class Disposition(BaseModel):
         Args:
             five9 (five9.Five9): The authenticated Five9 remote.
         """
-        five9.configuration.modifyDisposition(self.serialize())
+        return self._invalidate_after(
+            five9.configuration.modifyDisposition(self.to_zeep()),
+        )
@@ -143,18 +143,7 @@ class WebConnector(BaseModel):
         )
 
     @classmethod
-    def search(cls, five9, filters):
-        """Search for a record on the remote and return the results.
-
-        Args:
-            five9 (five9.Five9): The authenticated Five9 remote.
-            filters (dict): A dictionary of search parameters, keyed by the
-                name of the field to search. This should conform to the
-                schema defined in :func:`five9.Five9.create_criteria`.
-
-        Returns:
-            list[BaseModel]: A list of records representing the result.
-        """
+    def _search(cls, five9, filters):
         return cls._name_search(five9.configuration.getWebConnectors, filters)
 
     def delete(self, five9):
@@ -163,7 +152,9 @@ class WebConnector(BaseModel):
         Args:
             five9 (five9.Five9): The authenticated Five9 remote.
         """
-        five9.configuration.deleteWebConnector(self.name)
+        return self._invalidate_after(
+            five9.configuration.deleteWebConnector(self.name),
+        )
 
     def write(self, five9):
         """Update the record on the remote.
@@ -171,4 +162,6 @@ class WebConnector(BaseModel):
         Args:
             five9 (five9.Five9): The authenticated Five9 remote.
         """
-        five9.configuration.modifyWebConnector(self.serialize())
+        return self._invalidate_after(
+            five9.configuration.modifyWebConnector(self.to_zeep()),
+        )
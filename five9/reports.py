@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import csv
+import heapq
+import time
+
+from itertools import count
+
+from lxml import etree
+
+from .concurrency import run_concurrently
+from .exceptions import Five9Exception
+from .instrumentation import InstrumentedService
+from .models.base_model import BaseModel
+from .resilience import ResilientService
+
+
+class Report(object):
+    """A report that was started on Five9, and the state of its polling."""
+
+    def __init__(self, folder_name, report_name, criteria):
+        self.folder_name = folder_name
+        self.report_name = report_name
+        self.criteria = criteria
+        self.identifier = None
+        self.running = False
+        self.error = None
+        self.polls = 0
+        self.started_at = None
+        self.finished_at = None
+
+    def __repr__(self):
+        return '<Report %s/%s identifier=%s running=%s>' % (
+            self.folder_name, self.report_name, self.identifier, self.running,
+        )
+
+
+class ReportRunner(object):
+    """Run reports through the configuration service.
+
+    Reports are started with ``runReport``, and then polled with
+    ``isReportRunning`` by a single scheduler, which backs off the polling of
+    each report the longer that it runs. CSV results can be streamed from
+    ``getReportResultCsv`` without holding the whole payload in memory.
+    """
+
+    def __init__(self, five9, max_workers=4, initial_delay=1.0,
+                 max_delay=30.0, backoff=1.5, timeout=None):
+        """Instantiate a new report runner.
+
+        Args:
+            five9 (five9.Five9): The authenticated Five9 remote.
+            max_workers (int, optional): Maximum amount of reports that are
+                started at the same time.
+            initial_delay (float, optional): Seconds before a report is first
+                polled.
+            max_delay (float, optional): Maximum seconds between the polls
+                of a report.
+            backoff (float, optional): Factor that the delay between polls
+                grows by after each poll.
+            timeout (float, optional): Seconds after which a running report
+                is given up on. Unlimited by default.
+        """
+        self.five9 = five9
+        self.max_workers = max_workers
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.timeout = timeout
+
+    def run(self, folder_name, report_name, criteria):
+        """Run a report and return its parsed result once finished.
+
+        Args:
+            folder_name (str): Folder containing the report.
+            report_name (str): Name of the report.
+            criteria (dict): Report criteria, such as ``{'time': {'start':
+                datetime, 'end': datetime}}``.
+
+        Returns:
+            list[dict]: The records of the report.
+
+        Raises:
+            Exception: The error of the report, if it failed or timed out.
+        """
+        report, = self.wait([self.start(folder_name, report_name, criteria)])
+        if report.error is not None:
+            raise report.error
+        return self.get_result(report)
+
+    def start(self, folder_name, report_name, criteria):
+        """Start a report on Five9.
+
+        Returns:
+            Report: The started report.
+        """
+        report = Report(folder_name, report_name, criteria)
+        self._start(report)
+        return report
+
+    def start_many(self, reports):
+        """Start many reports concurrently.
+
+        Args:
+            reports (iter[tuple]): Tuples of ``(folder_name, report_name,
+                criteria)``.
+
+        Returns:
+            list[Report]: The reports, in order. Reports that could not be
+            started have their ``error`` set.
+        """
+        reports = [Report(*r) for r in reports]
+        results = run_concurrently(
+            self._start, reports, max_workers=self.max_workers,
+        )
+        for index, error in results.errors.items():
+            reports[index].error = error
+        return reports
+
+    def as_completed(self, reports):
+        """Poll the reports, and yield them as they finish.
+
+        All reports are polled by this one loop, each on its own backoff
+        schedule. Reports that fail to poll or time out are yielded with
+        their ``error`` set.
+
+        Args:
+            reports (iter[Report]): Reports that were started.
+
+        Yields:
+            Report: The next report that finished.
+        """
+        sequence = count()
+        schedule = []
+        now = time.time()
+        for report in reports:
+            if not report.running:
+                yield report
+                continue
+            heapq.heappush(schedule, (
+                now + self.initial_delay, next(sequence), self.initial_delay,
+                report,
+            ))
+        while schedule:
+            due, _, delay, report = heapq.heappop(schedule)
+            time.sleep(max(0, due - time.time()))
+            if self._poll(report):
+                delay = min(delay * self.backoff, self.max_delay)
+                heapq.heappush(schedule, (
+                    time.time() + delay, next(sequence), delay, report,
+                ))
+            else:
+                yield report
+
+    def wait(self, reports):
+        """Wait for all of the reports to finish.
+
+        Returns:
+            list[Report]: The reports, in their original order.
+        """
+        reports = list(reports)
+        for _ in self.as_completed(reports):
+            pass
+        return reports
+
+    def get_result(self, report):
+        """Return the parsed result of a finished report.
+
+        Returns:
+            list[dict]: The records of the report.
+        """
+        result = self.five9.configuration.getReportResult(report.identifier)
+        if not result:
+            return []
+        return self.five9.parse_response(
+            result['header']['values']['data'], result['records'] or [],
+        )
+
+    def iter_csv(self, report, chunk_size=65536):
+        """Stream the CSV result of a finished report as text chunks.
+
+        The SOAP response is read and parsed incrementally, so the whole CSV
+        payload is never held in memory. The request goes through the
+        instrumentation and resilience settings of the client, like the
+        other operations.
+
+        Streaming is only supported by synchronous clients. With
+        :class:`five9.AsyncFive9`, await ``getReportResultCsv`` instead.
+
+        Args:
+            report (Report): The finished report.
+            chunk_size (int, optional): Bytes read from the response at once.
+
+        Returns:
+            iter[str]: The chunks of CSV text.
+
+        Raises:
+            Five9Exception: If the client is asynchronous.
+        """
+        if BaseModel._is_async(self.five9):
+            raise Five9Exception(
+                'CSV results cannot be streamed by async clients. Await '
+                '"configuration.getReportResultCsv" instead.',
+            )
+        return self._iter_csv(report, chunk_size)
+
+    def _iter_csv(self, report, chunk_size):
+        """Request the CSV result, and yield the text of the response."""
+        response = self._wrap_operation(
+            'getReportResultCsv', self._post_csv,
+        )(report)
+        try:
+            target = _ReturnTextTarget()
+            parser = etree.XMLParser(target=target, huge_tree=True)
+            for chunk in response.iter_content(chunk_size):
+                parser.feed(chunk)
+                for text in target.pop():
+                    yield text
+            parser.close()
+            for text in target.pop():
+                yield text
+        finally:
+            response.close()
+
+    def iter_csv_rows(self, report, **fmtparams):
+        """Stream the CSV result of a finished report as parsed rows.
+
+        Args:
+            report (Report): The finished report.
+            **fmtparams: Formatting parameters passed to ``csv.reader``.
+
+        Yields:
+            list[str]: The next CSV row. The first row is the header.
+        """
+        return csv.reader(_iter_lines(self.iter_csv(report)), **fmtparams)
+
+    def write_csv(self, report, fh):
+        """Stream the CSV result of a finished report into a file.
+
+        Args:
+            report (Report): The finished report.
+            fh (file): File-like object opened for writing text.
+        """
+        for text in self.iter_csv(report):
+            fh.write(text)
+
+    def _post_csv(self, report):
+        """Post the request for the CSV result, and return the response.
+
+        Only the headers of the response have been read, unless it is an
+        error.
+        """
+        client = self.five9._get_client('configuration')
+        binding = client.service._binding
+        operation = binding.get('getReportResultCsv')
+        envelope = client.create_message(
+            client.service, 'getReportResultCsv', report.identifier,
+        )
+        response = client.transport.session.post(
+            client.service._binding_options['address'],
+            data=etree.tostring(envelope),
+            headers={
+                'Content-Type': 'text/xml; charset=utf-8',
+                'SOAPAction': '"%s"' % (operation.soapaction or ''),
+            },
+            timeout=client.transport.operation_timeout,
+            stream=True,
+        )
+        if response.status_code != 200:
+            try:
+                # Let zeep raise the proper ``Fault`` or ``TransportError``.
+                binding.process_reply(client, operation, response)
+            except Exception:
+                response.close()
+                raise
+        return response
+
+    def _wrap_operation(self, name, function):
+        """Return the function wrapped in the proxies of the configuration
+        service, so that it is called like the operation of the name.
+        """
+        proxies = []
+        service = self.five9.configuration
+        while isinstance(service, (InstrumentedService, ResilientService)):
+            proxies.append(service)
+            service = service._service
+        for proxy in reversed(proxies):
+            function = proxy._wrap(name, function)
+        return function
+
+    def _start(self, report):
+        """Start the report on Five9, and mark it as running."""
+        report.identifier = self.five9.configuration.runReport(
+            report.folder_name, report.report_name, report.criteria,
+        )
+        report.running = True
+        report.started_at = time.time()
+
+    def _poll(self, report):
+        """Poll a report once, updating its state.
+
+        Returns:
+            bool: Whether the report is still running.
+        """
+        report.polls += 1
+        try:
+            report.running = self.five9.configuration.isReportRunning(
+                report.identifier, 0,
+            )
+        except Exception as e:
+            report.running = False
+            report.error = e
+        if report.running and self.timeout is not None:
+            if time.time() - report.started_at > self.timeout:
+                report.running = False
+                report.error = Five9Exception(
+                    'The report "%s" timed out.' % report.report_name,
+                )
+        if not report.running:
+            report.finished_at = time.time()
+        return report.running
+
+
+class _ReturnTextTarget(object):
+    """lxml parser target collecting the text of the ``return`` element."""
+
+    def __init__(self):
+        self._capture = False
+        self._chunks = []
+
+    def start(self, tag, attrib):
+        if etree.QName(tag).localname == 'return':
+            self._capture = True
+
+    def end(self, tag):
+        self._capture = False
+
+    def data(self, data):
+        if self._capture:
+            self._chunks.append(data)
+
+    def close(self):
+        pass
+
+    def pop(self):
+        """Return and forget the text collected so far."""
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+
+def _iter_lines(chunks):
+    """Split text chunks into lines, keeping the line endings."""
+    remainder = ''
+    for chunk in chunks:
+        lines = (remainder + chunk).splitlines(True)
+        remainder = ''
+        if lines and not lines[-1].endswith('\n'):
+            remainder = lines.pop()
+        for line in lines:
+            yield line
+    if remainder:
+        yield remainder
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import random
+import threading
+import time
+
+import requests
+
+from zeep.exceptions import TransportError
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from .concurrency import monotonic
+from .exceptions import CircuitOpenError
+
+
+class RetryPolicy(object):
+    """Decides which failed SOAP calls are retried, and when.
+
+    Transient failures (timeouts, connection errors and HTTP 5xx responses)
+    are only retried for idempotent operations, because the remote may have
+    processed the request before failing. Requests rejected by the rate
+    limits of Five9 (HTTP 429) were not processed, so they are retried for
+    every operation.
+    """
+
+    # Prefixes of the operations that are safe to call again.
+    IDEMPOTENT_PREFIXES = ('get', 'is')
+    # HTTP statuses of temporary failures of the remote.
+    TRANSIENT_STATUSES = frozenset([500, 502, 503, 504])
+    # HTTP statuses of requests that were rejected by rate limits.
+    THROTTLED_STATUSES = frozenset([429])
+    # Exceptions raised by the HTTP clients for timeouts and network errors.
+    TRANSIENT_ERRORS = (requests.Timeout, requests.ConnectionError) + (
+        (httpx.TransportError,) if httpx is not None else ()
+    )
+
+    def __init__(self, retries=3, backoff=0.5, max_backoff=30.0, jitter=True):
+        """Instantiate a new retry policy.
+
+        Args:
+            retries (int, optional): Maximum amount of retries of a call.
+            backoff (float, optional): Seconds to wait before the first
+                retry. This doubles with every retry.
+            max_backoff (float, optional): Maximum seconds between retries.
+            jitter (bool, optional): Wait a random time of up to the backoff,
+                so that concurrent callers do not retry at the same time.
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+    def get_delay(self, attempt):
+        """Return the seconds to wait before a retry.
+
+        Args:
+            attempt (int): The amount of retries that were already made.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def is_idempotent(self, operation):
+        """Return whether the operation can be called again safely."""
+        return operation.startswith(self.IDEMPOTENT_PREFIXES)
+
+    def is_throttled(self, error):
+        """Return whether the error is a rejection by the rate limits."""
+        return self._get_status(error) in self.THROTTLED_STATUSES
+
+    def is_transient(self, error):
+        """Return whether the error is a temporary failure of the remote."""
+        if isinstance(error, self.TRANSIENT_ERRORS):
+            return True
+        return self._get_status(error) in self.TRANSIENT_STATUSES
+
+    def should_retry(self, operation, error, attempt):
+        """Return whether the failed call should be retried.
+
+        Args:
+            operation (str): Name of the SOAP operation.
+            error (Exception): The error raised by the call.
+            attempt (int): The amount of retries that were already made.
+
+        Returns:
+            bool: Whether to retry.
+        """
+        if attempt >= self.retries:
+            return False
+        if self.is_throttled(error):
+            return True
+        return self.is_transient(error) and self.is_idempotent(operation)
+
+    @staticmethod
+    def _get_status(error):
+        """Return the HTTP status of the error, if any."""
+        if isinstance(error, TransportError):
+            return error.status_code
+        return getattr(getattr(error, 'response', None), 'status_code', None)
+
+
+class CircuitBreaker(object):
+    """Thread-safe circuit breaker for the calls to a remote.
+
+    After ``threshold`` consecutive transient failures, the circuit opens
+    and calls are rejected with :class:`five9.exceptions.CircuitOpenError`
+    without reaching the remote. After ``reset_timeout`` seconds, a single
+    trial call is let through; the circuit closes if it succeeds, and opens
+    again if it fails.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, threshold=5, reset_timeout=30):
+        """Instantiate a new circuit breaker.
+
+        Args:
+            threshold (int, optional): Consecutive failures that open the
+                circuit.
+            reset_timeout (float, optional): Seconds that the circuit stays
+                open before a trial call is allowed.
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """Return the state: ``closed``, ``open`` or ``half-open``."""
+        if self._opened is None:
+            return self.CLOSED
+        if monotonic() - self._opened < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def before_call(self):
+        """Allow the call, or reject it if the circuit is open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or a trial call is
+                already in progress.
+        """
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._trial:
+                self._trial = True
+                return
+            raise CircuitOpenError(
+                'Calls are rejected after %d consecutive failures of the '
+                'remote. Retrying in %.1f seconds.' % (
+                    self.failures,
+                    max(0, self.reset_timeout -
+                        (monotonic() - self._opened)),
+                ),
+            )
+
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.failures = 0
+            self._opened = None
+            self._trial = False
+
+    def release_trial(self):
+        """Allow a new trial call, if the trial call had no outcome.
+
+        This is called for the calls that neither succeed nor fail, such as
+        throttled or interrupted ones, so that the circuit does not stay
+        half-open with no trial call in progress.
+        """
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit if required."""
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self._opened = monotonic()
+            self._trial = False
+
+
+class ResilientService(object):
+    """Proxy for a zeep service that retries, rate limits and breaks calls.
+
+    Every operation of the service is called through the optional rate
+    limiter and circuit breaker, and failed calls are retried as allowed by
+    the retry policy. It is returned by ``Five9.configuration`` and
+    ``Five9.supervisor`` when any of ``Five9.retry_policy``,
+    ``Five9.rate_limit`` or ``Five9.circuit_breaker`` are set.
+    """
+
+    def __init__(self, service, retry_policy=None, rate_limit=None,
+                 circuit_breaker=None):
+        """Instantiate a new proxy.
+
+        Args:
+            service (zeep.proxy.ServiceProxy): The wrapped service.
+            retry_policy (RetryPolicy, optional): Decides which failed calls
+                are retried. Calls are not retried by default.
+            rate_limit (five9.concurrency.RateLimiter, optional): Limits the
+                rate of calls, including retries.
+            circuit_breaker (CircuitBreaker, optional): Rejects calls after
+                repeated transient failures.
+        """
+        self._service = service
+        self.retry_policy = retry_policy
+        self.rate_limit = rate_limit
+        self.circuit_breaker = circuit_breaker
+        # Errors are classified by the policy, even if nothing is retried.
+        self._policy = retry_policy or RetryPolicy(retries=0)
+
+    def __getattr__(self, name):
+        operation = getattr(self._service, name)
+        if name.startswith('_') or not callable(operation):
+            return operation
+        return self._wrap(name, operation)
+
+    def _wrap(self, name, operation):
+        """Return a function that calls the operation resiliently."""
+        def _call(*args, **kwargs):
+            attempt = 0
+            while True:
+                delay = self._before_call()
+                if delay:
+                    time.sleep(delay)
+                try:
+                    result = operation(*args, **kwargs)
+                except Exception as e:
+                    delay = self._after_error(name, e, attempt)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                    attempt += 1
+                except BaseException:
+                    self._after_interrupt()
+                    raise
+                else:
+                    self._after_success()
+                    return result
+        return _call
+
+    def _before_call(self):
+        """Check the circuit, and return the seconds to wait for a call."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_call()
+        if self.rate_limit is not None:
+            return self.rate_limit.reserve()
+        return 0
+
+    def _after_success(self):
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_success()
+
+    def _after_interrupt(self):
+        """Account for a call that was interrupted, such as by Ctrl-C."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.release_trial()
+
+    def _after_error(self, name, error, attempt):
+        """Account for the failed call.
+
+        Returns:
+            float: Seconds to wait before retrying, or ``None`` if the error
+            should be raised.
+        """
+        # Throttled calls do not indicate a failure of the remote, and other
+        # errors, such as SOAP faults, are valid responses.
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            if self._policy.is_throttled(error):
+                breaker.release_trial()
+            elif self._policy.is_transient(error):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        if not self._policy.should_retry(name, error, attempt):
+            return None
+        return self._policy.get_delay(attempt)
@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import threading
+
+from zeep.exceptions import Fault
+
+from .resilience import RetryPolicy
+from .statistics_models import get_row_class, infer_column_types
+
+
+class StatisticsEvent(object):
+    """A change to an object in a statistics table."""
+
+    ADDED = 'added'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+
+    __slots__ = ('kind', 'key', 'changes')
+
+    def __init__(self, kind, key, changes=None):
+        """Instantiate a new event.
+
+        Args:
+            kind (str): One of ``added``, ``updated`` or ``deleted``.
+            key (str): Name of the object that changed.
+            changes (dict, optional): Tuples of the ``(old, new)`` values,
+                keyed by the name of each column that changed.
+        """
+        self.kind = kind
+        self.key = key
+        self.changes = changes or {}
+
+    def __repr__(self):
+        return '<StatisticsEvent %s %s %s>' % (
+            self.kind, self.key, self.changes,
+        )
+
+
+class StatisticsTable(object):
+    """In-memory table of statistics, indexed by object name.
+
+    Rows are stored as lists of values in the order of ``columns``, so that
+    column names are not repeated in every row.
+    """
+
+    def __init__(self, columns, key_column=None):
+        """Instantiate a new table.
+
+        Args:
+            columns (list[str]): The column names of the statistics.
+            key_column (str, optional): Column identifying each object.
+                Defaults to the first column.
+        """
+        self.columns = list(columns)
+        self.column_index = {c: i for i, c in enumerate(self.columns)}
+        self.key_index = self.column_index[key_column] if key_column else 0
+        self.rows = {}
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get(self, key, default=None):
+        """Return the row of the object as a dictionary.
+
+        Args:
+            key (str): Name of the object.
+            default (mixed, optional): Returned if the object does not exist.
+
+        Returns:
+            dict: Values of the row, keyed by column name.
+        """
+        row = self.rows.get(key)
+        if row is None:
+            return default
+        return dict(zip(self.columns, row))
+
+    def get_value(self, key, column):
+        """Return a single value of the object's row."""
+        return self.rows[key][self.column_index[column]]
+
+    def load(self, rows):
+        """Replace the contents of the table.
+
+        Args:
+            rows (iter[list]): Lists of values, in the order of ``columns``.
+        """
+        self.rows = {row[self.key_index]: list(row) for row in rows}
+
+    def add(self, key):
+        """Add an empty row for the object, if it does not exist yet.
+
+        Returns:
+            bool: Whether the row was added.
+        """
+        if key in self.rows:
+            return False
+        row = [None] * len(self.columns)
+        row[self.key_index] = key
+        self.rows[key] = row
+        return True
+
+    def update(self, key, column, value):
+        """Set a value of the object's row, adding the row if required.
+
+        Returns:
+            mixed: The previous value.
+        """
+        self.add(key)
+        row = self.rows[key]
+        index = self.column_index[column]
+        old, row[index] = row[index], value
+        return old
+
+    def delete(self, key):
+        """Remove the object's row.
+
+        Returns:
+            bool: Whether a row was removed.
+        """
+        return self.rows.pop(key, None) is not None
+
+
+class TypedStatisticsTable(StatisticsTable):
+    """Statistics table storing typed, tuple-backed rows.
+
+    Rows are instances of a :class:`five9.statistics_models.StatisticsRow`
+    class that is created once for the columns, and values are converted to
+    native types (such as ``int`` or ``timedelta``) as they are loaded.
+    """
+
+    def __init__(self, columns, key_column=None, column_types=None):
+        """Instantiate a new table.
+
+        Args:
+            columns (list[str]): The column names of the statistics.
+            key_column (str, optional): Column identifying each object.
+                Defaults to the first column.
+            column_types (dict, optional): Column types, keyed by column
+                name. Integer columns are inferred from the values that are
+                loaded if omitted, and are stored as strings again if a
+                later value is not an integer. See
+                :func:`five9.statistics_models.get_row_class`.
+        """
+        super(TypedStatisticsTable, self).__init__(columns, key_column)
+        self.column_types = column_types
+        self.row_class = None
+        self.inferred_columns = set()
+        if column_types is not None:
+            self._init_row_class(column_types)
+
+    def get(self, key, default=None):
+        row = self.rows.get(key)
+        if row is None:
+            return default
+        return row.as_dict()
+
+    def get_row(self, key, default=None):
+        """Return the typed row of the object."""
+        return self.rows.get(key, default)
+
+    def load(self, rows):
+        rows = list(rows)
+        if self.row_class is None:
+            column_types = infer_column_types(
+                self.columns, rows, self.column_types,
+            )
+            self.inferred_columns = set(column_types) - set(
+                self.column_types or (),
+            )
+            self._init_row_class(column_types)
+        keys = [row[self.key_index] for row in rows]
+        self.rows = dict(zip(keys, self.row_class.convert(rows)))
+
+    def add(self, key):
+        if key in self.rows:
+            return False
+        row = [None] * len(self.columns)
+        row[self.key_index] = key
+        self.rows[key], = self.row_class.convert([row])
+        return True
+
+    def update(self, key, column, value):
+        self.add(key)
+        try:
+            new = self.rows[key].replace(column, value)
+        except ValueError:
+            if column not in self.inferred_columns:
+                raise
+            self._set_string_column(column)
+            new = self.rows[key].replace(column, value)
+        old = self.rows[key][self.column_index[column]]
+        self.rows[key] = new
+        return old
+
+    def _init_row_class(self, column_types):
+        """Create the row class, keeping the key column as a string."""
+        column_types = dict(column_types)
+        column_types[self.columns[self.key_index]] = 'str'
+        self.row_class = get_row_class(self.columns, column_types)
+
+    def _set_string_column(self, column):
+        """Store an inferred column as strings, converting its values."""
+        column_types = dict(zip(self.columns, self.row_class.types))
+        column_types[column] = 'str'
+        self.inferred_columns.discard(column)
+        self._init_row_class(column_types)
+        index = self.column_index[column]
+        for key, row in self.rows.items():
+            values = list(row)
+            if values[index] is not None:
+                values[index] = str(values[index])
+            self.rows[key] = tuple.__new__(self.row_class, values)
+
+
+class StatisticsFeed(object):
+    """Incrementally updated supervisor statistics.
+
+    The feed takes one full snapshot with ``getStatistics``, and then only
+    applies the changes returned by ``getStatisticsUpdate`` to an in-memory
+    table. Subscribers are called with a :class:`StatisticsEvent` for every
+    object that was added, updated or deleted.
+
+    Errors do not stop the background thread of :meth:`start`. The last one
+    is stored in ``error`` and passed to ``on_error``, and polling resumes
+    after the delay of the ``retry_policy``, which grows with consecutive
+    errors.
+
+    Example:
+
+        .. code-block:: python
+
+            feed = StatisticsFeed(five9, 'AgentState')
+            feed.subscribe(lambda event: print(event))
+            feed.start()
+            feed.table.get('agent@example.com')
+    """
+
+    def __init__(self, five9, statistic_type, columns=None, key_column=None,
+                 long_polling_timeout=30000, typed=False, column_types=None,
+                 on_error=None, retry_policy=None):
+        """Instantiate a new feed.
+
+        Args:
+            five9 (five9.Five9): The authenticated Five9 remote.
+            statistic_type (str): The statistic type, such as ``AgentState``.
+            columns (list[str], optional): Columns to retrieve. Defaults to
+                all of them.
+            key_column (str, optional): Column identifying each object.
+                Defaults to the first column.
+            long_polling_timeout (int, optional): Milliseconds that Five9
+                holds an update request open while there are no changes.
+            typed (bool, optional): Store typed rows in a
+                :class:`TypedStatisticsTable`, rather than lists of strings.
+            column_types (dict, optional): Column types of the typed rows,
+                keyed by column name. Implies ``typed``.
+            on_error (callable, optional): Called with the errors raised
+                while polling in the background thread.
+            retry_policy (five9.resilience.RetryPolicy, optional): Delays
+                between the polls that fail.
+        """
+        self.five9 = five9
+        self.statistic_type = statistic_type
+        self.columns = columns
+        self.key_column = key_column
+        self.long_polling_timeout = long_polling_timeout
+        self.typed = typed or column_types is not None
+        self.column_types = column_types
+        self.on_error = on_error
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.table = None
+        self.timestamp = None
+        self.error = None
+        self.lock = threading.RLock()
+        self._subscribers = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback):
+        """Call ``callback`` with each :class:`StatisticsEvent`."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Stop calling ``callback`` with events."""
+        self._subscribers.remove(callback)
+
+    def snapshot(self):
+        """Load the full statistics into a new table.
+
+        Returns:
+            StatisticsTable: The table holding the statistics.
+        """
+        column_names = None
+        if self.columns:
+            column_names = {'values': {'data': self.columns}}
+        statistics = self.five9.supervisor.getStatistics(
+            self.statistic_type, column_names,
+        )
+        table = self._create_table(statistics['columns']['values']['data'])
+        table.load(
+            row['values']['data'] for row in statistics['rows'] or []
+        )
+        with self.lock:
+            self.table = table
+            self.timestamp = statistics['timestamp']
+        return table
+
+    def poll(self):
+        """Apply the next update to the table.
+
+        A snapshot is taken instead on the first poll, or if Five9 rejects
+        the update (such as when the previous timestamp has expired). The
+        changes from the previous table to a new snapshot are reported as
+        events too.
+
+        Returns:
+            list[StatisticsEvent]: The changes that were applied.
+        """
+        if self.timestamp is None:
+            self.snapshot()
+            return []
+        try:
+            update = self.five9.supervisor.getStatisticsUpdate(
+                self.statistic_type, self.timestamp,
+                self.long_polling_timeout,
+            )
+        except Fault:
+            old = self.table
+            events = self._diff(old, self.snapshot())
+        else:
+            if not update:
+                return []
+            with self.lock:
+                events = self._apply(update)
+        for event in events:
+            for callback in list(self._subscribers):
+                callback(event)
+        return events
+
+    def run(self):
+        """Poll for updates until :meth:`stop` is called.
+
+        Errors are stored in ``error`` and passed to ``on_error``, and the
+        next poll waits for the delay of the ``retry_policy``.
+        """
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                self.error = e
+                if self.on_error is not None:
+                    self.on_error(e)
+                self._stop.wait(self.retry_policy.get_delay(failures))
+                failures += 1
+            else:
+                failures = 0
+
+    def start(self):
+        """Poll for updates in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop polling, waiting for the background thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _create_table(self, columns):
+        if self.typed:
+            return TypedStatisticsTable(
+                columns, self.key_column, self.column_types,
+            )
+        return StatisticsTable(columns, self.key_column)
+
+    def _diff(self, old, new):
+        """Return the events that change the old table into the new one.
+
+        Returns:
+            list[StatisticsEvent]: One event per changed object, in the same
+            order as for an update.
+        """
+        key_column = new.columns[new.key_index]
+        added = []
+        updated = []
+        for key in new:
+            if key not in old:
+                added.append(StatisticsEvent(StatisticsEvent.ADDED, key))
+            old_row = old.get(key, {})
+            changes = {
+                column: (old_row.get(column), value)
+                for column, value in new.get(key).items()
+                if column != key_column and old_row.get(column) != value
+            }
+            if changes:
+                updated.append(
+                    StatisticsEvent(StatisticsEvent.UPDATED, key, changes),
+                )
+        deleted = [
+            StatisticsEvent(StatisticsEvent.DELETED, key)
+            for key in old if key not in new
+        ]
+        return added + updated + deleted
+
+    def _apply(self, update):
+        """Apply a ``statisticsUpdate`` to the table.
+
+        Returns:
+            list[StatisticsEvent]: One event per changed object.
+        """
+        events = []
+        updated = {}
+        for key in _get_data(update['addedObjects']):
+            if self.table.add(key):
+                events.append(StatisticsEvent(StatisticsEvent.ADDED, key))
+        for item in update['dataUpdate'] or []:
+            key = item['objectName']
+            old = self.table.update(
+                key, item['columnName'], item['columnValue'],
+            )
+            new = self.table.get_value(key, item['columnName'])
+            if old == new:
+                continue
+            event = updated.get(key)
+            if event is None:
+                event = updated[key] = StatisticsEvent(
+                    StatisticsEvent.UPDATED, key,
+                )
+                events.append(event)
+            event.changes[item['columnName']] = (old, new)
+        for key in _get_data(update['deletedObjects']):
+            if self.table.delete(key):
+                events.append(StatisticsEvent(StatisticsEvent.DELETED, key))
+        if update['lastTimestamp'] is not None:
+            self.timestamp = update['lastTimestamp']
+        return events
+
+
+def _get_data(row):
+    """Return the values of a ``row``, which may be empty."""
+    if not row or not row['values']:
+        return []
+    return row['values']['data'] or []
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import keyword
+import re
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from six import string_types
+
+from .exceptions import ValidationError
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _to_int(value):
+    if value in (None, ''):
+        return None
+    return int(value)
+
+
+def _to_float(value):
+    if value in (None, ''):
+        return None
+    return float(value)
+
+
+def _to_duration(value):
+    """Convert milliseconds, or ``H:MM:SS``, to a ``timedelta``."""
+    if value in (None, ''):
+        return None
+    if ':' in value:
+        hours, minutes, seconds = value.split(':')
+        return timedelta(
+            hours=int(hours), minutes=int(minutes), seconds=float(seconds),
+        )
+    return timedelta(milliseconds=int(value))
+
+
+def _to_timestamp(value):
+    """Convert milliseconds since the epoch to a naive UTC ``datetime``."""
+    if value in (None, ''):
+        return None
+    return EPOCH + timedelta(milliseconds=int(value))
+
+
+# Converters from the Five9 string values, keyed by column type.
+CONVERTERS = {
+    'str': lambda value: value,
+    'int': _to_int,
+    'float': _to_float,
+    'duration': _to_duration,
+    'timestamp': _to_timestamp,
+}
+
+INTEGER = re.compile(r'^-?\d+$')
+
+
+class StatisticsRow(tuple):
+    """Base for the typed row classes created by :func:`get_row_class`.
+
+    Rows are tuples, so no per-row dictionary is allocated. Values can be
+    accessed by attribute (column names converted to identifiers), by
+    index, or by column name.
+    """
+
+    __slots__ = ()
+
+    # The Five9 column names, in order.
+    columns = ()
+    # The type of each column, in order.
+    types = ()
+    # Attribute names, keyed by column name.
+    attributes = {}
+    # Indexes of the values, keyed by column name.
+    column_index = {}
+
+    def __getitem__(self, item):
+        if isinstance(item, string_types):
+            return getattr(self, self.attributes[item])
+        return tuple.__getitem__(self, item)
+
+    def as_dict(self):
+        """Return the row as a dictionary keyed by column name."""
+        return dict(zip(self.columns, self))
+
+    @classmethod
+    def convert(cls, rows):
+        """Convert rows of Five9 string values into typed rows.
+
+        Each column is converted in a single pass, rather than value by
+        value across the rows.
+
+        Args:
+            rows (iter[list[str]]): Values of each row, ordered by column.
+
+        Returns:
+            list[StatisticsRow]: The typed rows.
+        """
+        columns = list(zip(*rows)) or [()] * len(cls.columns)
+        converted = [
+            map(CONVERTERS[column_type], values)
+            for column_type, values in zip(cls.types, columns)
+        ]
+        return [tuple.__new__(cls, row) for row in zip(*converted)]
+
+    def replace(self, column, value):
+        """Return a copy of the row with a new string value for a column.
+
+        Args:
+            column (str): The column name.
+            value (str): The Five9 string value, which is converted.
+
+        Returns:
+            StatisticsRow: The new row.
+        """
+        index = self.column_index[column]
+        values = list(self)
+        values[index] = CONVERTERS[self.types[index]](value)
+        return tuple.__new__(type(self), values)
+
+
+_row_classes = {}
+
+
+def get_row_class(columns, column_types=None):
+    """Return the typed row class for the columns.
+
+    The class is only created once per set of columns and types.
+
+    Args:
+        columns (list[str]): The Five9 column names.
+        column_types (dict, optional): Column types (``str``, ``int``,
+            ``float``, ``duration`` or ``timestamp``) keyed by column name.
+            Other columns are strings.
+
+    Returns:
+        type: A subclass of :class:`StatisticsRow`.
+    """
+    column_types = column_types or {}
+    types = tuple(column_types.get(c, 'str') for c in columns)
+    for column_type in types:
+        if column_type not in CONVERTERS:
+            raise ValidationError(
+                'The column type "%s" is not supported.' % column_type,
+            )
+    key = (tuple(columns), types)
+    try:
+        return _row_classes[key]
+    except KeyError:
+        pass
+    names = _get_attribute_names(columns)
+    base = namedtuple(
+        'StatisticsRowBase', [names[c] for c in columns], rename=True,
+    )
+    row_class = type('StatisticsRow', (StatisticsRow, base), {
+        '__slots__': (),
+        'columns': tuple(columns),
+        'types': types,
+        'attributes': dict(zip(columns, base._fields)),
+        'column_index': {c: i for i, c in enumerate(columns)},
+    })
+    _row_classes[key] = row_class
+    return row_class
+
+
+def infer_column_types(columns, rows, column_types=None):
+    """Return the column types, inferring integers from the values.
+
+    Args:
+        columns (list[str]): The Five9 column names.
+        rows (list[list[str]]): Sample rows of Five9 string values.
+        column_types (dict, optional): Explicit types, which take precedence.
+
+    Returns:
+        dict: Column types, keyed by column name.
+    """
+    result = {}
+    for column, values in zip(columns, zip(*rows)):
+        present = [v for v in values if v not in (None, '')]
+        if present and all(INTEGER.match(v) for v in present):
+            result[column] = 'int'
+    result.update(column_types or {})
+    return result
+
+
+def parse_statistics(statistics, column_types=None, infer=True):
+    """Convert a ``getStatistics`` result into typed rows.
+
+    Args:
+        statistics (dict): The result of ``getStatistics``.
+        column_types (dict, optional): Column types, keyed by column name.
+        infer (bool, optional): Infer integer columns from the values.
+
+    Returns:
+        list[StatisticsRow]: The typed rows.
+    """
+    columns = statistics['columns']['values']['data']
+    rows = [row['values']['data'] for row in statistics['rows'] or []]
+    if infer:
+        column_types = infer_column_types(columns, rows, column_types)
+    return get_row_class(columns, column_types).convert(rows)
+
+
+def _get_attribute_names(columns):
+    """Return unique identifiers for the column names, keyed by column.
+
+    Names that are not identifiers, such as keywords or the attributes of
+    :class:`StatisticsRow`, are replaced by the index of the column.
+    """
+    attributes = {}
+    used = set()
+    for index, column in enumerate(columns):
+        name = re.sub(r'\W+', '_', column).strip('_').lower()
+        if not re.match(r'^[a-z]\w*$', name) or name in used or \
+                keyword.iskeyword(name) or hasattr(StatisticsRow, name):
+            name = 'column_%d' % index
+        used.add(name)
+        attributes[column] = name
+    return attributes
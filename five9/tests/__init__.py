@@ -1,3 +1,15 @@
 # -*- coding: utf-8 -*-
 # Copyright 2017-TODAY LasLabs Inc.
 # License MIT (https://opensource.org/licenses/MIT).
+
+import atexit
+import os
+import shutil
+import tempfile
+
+from ..five9 import Five9
+
+# Keep the WSDL cache of the tests out of the user's cache directory.
+_CACHE_DIR = tempfile.mkdtemp()
+Five9.wsdl_cache_path = os.path.join(_CACHE_DIR, 'cache.db')
+atexit.register(shutil.rmtree, _CACHE_DIR, True)
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import asyncio
+import mock
+import requests
+import unittest
+
+from ..async_five9 import AsyncEnvironment, AsyncFive9, await_then
+from ..async_five9 import AsyncInstrumentedService, AsyncResilientService
+from ..config_sync import Change
+from ..models.disposition import Disposition
+from ..models.web_connector import WebConnector
+from ..instrumentation import Instrumentation
+from ..resilience import RetryPolicy
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestAsyncFive9(unittest.TestCase):
+
+    def setUp(self):
+        super(TestAsyncFive9, self).setUp()
+        self.five9 = AsyncFive9('user@example.com', 'password')
+        self.five9.wsdl_cache_enabled = False
+        self.five9.wsdl_bundled = True
+
+    def test_init_env(self):
+        """It should create an async environment."""
+        self.assertIsInstance(self.five9.env, AsyncEnvironment)
+        self.assertIsInstance(self.five9.env.Disposition, AsyncEnvironment)
+
+    def test_resilient_service_retries(self):
+        """It should await the retries of transient failures."""
+        service = mock.MagicMock()
+        service.getUserLimits = mock.AsyncMock(
+            side_effect=[requests.Timeout(), 'limits'],
+        )
+        self.five9._api_configuration = mock.MagicMock(service=service)
+        self.five9.retry_policy = RetryPolicy(backoff=0)
+        configuration = self.five9.configuration
+        self.assertIsInstance(configuration, AsyncResilientService)
+        self.assertEqual(run(configuration.getUserLimits()), 'limits')
+        self.assertEqual(service.getUserLimits.await_count, 2)
+
+    def test_instrumented_service(self):
+        """It should measure the awaited calls."""
+        service = mock.MagicMock()
+        service.getUserLimits = mock.AsyncMock(return_value='limits')
+        self.five9._api_configuration = mock.MagicMock(service=service)
+        self.five9.instrumentation = Instrumentation()
+        configuration = self.five9.configuration
+        self.assertIsInstance(configuration, AsyncInstrumentedService)
+        self.assertEqual(run(configuration.getUserLimits()), 'limits')
+        self.assertEqual(
+            self.five9.instrumentation.stats()['getUserLimits']['count'], 1,
+        )
+
+    def test_get_authenticated_client(self):
+        """It should create an async client with an authenticated transport.
+        """
+        client = self.five9._get_authenticated_client(
+            self.five9.WSDL_CONFIGURATION,
+        )
+        self.assertEqual(
+            client.transport.client.auth._auth_header,
+            'Basic dXNlckBleGFtcGxlLmNvbTpwYXNzd29yZA==',
+        )
+        run(client.transport.aclose())
+
+    def test_aclose(self):
+        """It should close the operation and WSDL clients."""
+        client = mock.MagicMock()
+        client.transport.aclose = mock.AsyncMock()
+        self.five9._api_configuration = client
+        run(self.five9.aclose())
+        client.transport.aclose.assert_awaited_once_with()
+        client.transport.wsdl_client.close.assert_called_once_with()
+        self.assertIsNone(self.five9._api_configuration)
+
+    def _mock_supervisor(self):
+        service = mock.MagicMock()
+        service.setSessionParameters = mock.AsyncMock()
+        service.getUserLimits = mock.AsyncMock(return_value='limits')
+        self.five9._api_supervisor = mock.MagicMock(service=service)
+        return service
+
+    def test_supervisor_session(self):
+        """It should create the supervisor session before the operation."""
+        service = self._mock_supervisor()
+        result = run(self.five9.supervisor.getUserLimits())
+        self.assertEqual(result, 'limits')
+        service.setSessionParameters.assert_awaited_once_with(
+            self.five9._get_supervisor_session_params(),
+        )
+
+    def test_supervisor_session_cached(self):
+        """It should only create the supervisor session once."""
+        service = self._mock_supervisor()
+
+        async def _calls():
+            await asyncio.gather(
+                self.five9.supervisor.getUserLimits(),
+                self.five9.supervisor.getUserLimits(),
+            )
+
+        run(_calls())
+        service.setSessionParameters.assert_awaited_once()
+        self.assertEqual(service.getUserLimits.await_count, 2)
+
+
+class TestAsyncEnvironment(unittest.TestCase):
+
+    def setUp(self):
+        super(TestAsyncEnvironment, self).setUp()
+        self.five9 = mock.MagicMock()
+        self.service = self.five9.configuration
+        self.data = {'name': 'Test', 'description': 'Test'}
+        self.env = AsyncEnvironment(self.five9, Disposition)
+
+    def test_search(self):
+        """It should await the search and return a recordset."""
+        self.service.getDispositions = mock.AsyncMock(
+            return_value=[self.data, self.data],
+        )
+        results = run(self.env.search({'name': 'Test'}))
+        self.service.getDispositions.assert_awaited_once_with('Test')
+        self.assertIsInstance(results, AsyncEnvironment)
+        self.assertEqual(len(results.__records__), 2)
+        self.assertIsInstance(results.__records__[0], Disposition)
+
+    def test_read(self):
+        """It should await the search and return the first record."""
+        self.service.getDispositions = mock.AsyncMock(
+            return_value=[self.data],
+        )
+        result = run(self.env.read('Test'))
+        self.assertEqual(result.name, 'Test')
+
+    def test_read_cache(self):
+        """It should return awaitable cache hits for async clients."""
+        Disposition.enable_cache()
+        self.addCleanup(Disposition.disable_cache)
+        five9 = mock.MagicMock(spec=AsyncFive9)
+        five9.username = 'user'
+        five9.configuration.getDispositions = mock.AsyncMock(
+            return_value=[self.data],
+        )
+        env = AsyncEnvironment(five9, Disposition)
+        run(env.read('Test'))
+        result = run(env.read('Test'))
+        self.assertEqual(result.name, 'Test')
+        five9.configuration.getDispositions.assert_awaited_once_with('Test')
+
+    def test_read_many(self):
+        """It should await the searches and return the records in order."""
+        five9 = mock.MagicMock(spec=AsyncFive9)
+        five9.configuration.getDispositions = mock.AsyncMock(
+            side_effect=lambda pattern: [
+                {'name': n, 'description': 'Test'}
+                for n in pattern.strip('()').split('|') if n != 'x'
+            ],
+        )
+        env = AsyncEnvironment(five9, Disposition)
+        result = run(env.read_many(['b', 'x', 'a'], chunk_size=2))
+        self.assertEqual([r and r.name for r in result], ['b', None, 'a'])
+        self.assertEqual(five9.configuration.getDispositions.await_count, 2)
+
+    def test_read_none(self):
+        """It should return None if there are no results."""
+        self.service.getDispositions = mock.AsyncMock(return_value=None)
+        self.assertIsNone(run(self.env.read('Test')))
+
+    def test_create(self):
+        """It should await the creation and return a memory record."""
+        self.service.createDisposition = mock.AsyncMock()
+        result = run(self.env.create(self.data))
+        self.service.createDisposition.assert_awaited_once_with(self.data)
+        self.assertEqual(result.__records__[0].name, 'Test')
+
+    def test_create_refresh(self):
+        """It should read the record from the remote when refreshing."""
+        self.service.createDisposition = mock.AsyncMock()
+        self.service.getDispositions = mock.AsyncMock(
+            return_value=[self.data],
+        )
+        result = run(self.env.create(self.data, True))
+        self.service.getDispositions.assert_awaited_once_with('Test')
+        self.assertIsInstance(result, Disposition)
+
+    def test_write(self):
+        """It should write all records of the recordset."""
+        self.service.modifyWebConnector = mock.AsyncMock(return_value=True)
+        records = [
+            WebConnector(name='Test%d' % i, trigger='OnCallAccepted')
+            for i in range(3)
+        ]
+        env = AsyncEnvironment(self.five9, WebConnector, records)
+        self.assertEqual(run(env.write(max_concurrency=2)), [True] * 3)
+        self.assertEqual(self.service.modifyWebConnector.await_count, 3)
+
+    def test_delete(self):
+        """It should delete all records of the recordset."""
+        self.service.removeDisposition = mock.AsyncMock()
+        records = [Disposition(name='Test1'), Disposition(name='Test2')]
+        env = AsyncEnvironment(self.five9, Disposition, records)
+        run(env.delete())
+        self.service.removeDisposition.assert_has_awaits([
+            mock.call('Test1'), mock.call('Test2'),
+        ])
+
+    def test_sync(self):
+        """It should await the remote search and the changes."""
+        five9 = mock.MagicMock(spec=AsyncFive9)
+        api = five9.configuration
+        api.getDispositions = mock.AsyncMock(return_value=[
+            {'name': 'Sale', 'type': 'FinalDisp'},
+            {'name': 'Old', 'type': 'FinalDisp'},
+        ])
+        api.createDisposition = mock.AsyncMock()
+        api.modifyDisposition = mock.AsyncMock(return_value=True)
+        api.removeDisposition = mock.AsyncMock(side_effect=ValueError())
+        env = AsyncEnvironment(five9, Disposition)
+        desired = [
+            {'name': 'Sale', 'type': 'DoNotDial'},
+            {'name': 'New', 'type': 'FinalDisp'},
+        ]
+        changes = run(env.sync(desired, dry_run=True))
+        self.assertEqual([(c.action, c.name) for c in changes], [
+            (Change.MODIFY, 'Sale'), (Change.CREATE, 'New'),
+        ])
+        api.createDisposition.assert_not_awaited()
+        changes = run(env.sync(desired, prune=True, max_concurrency=2))
+        self.assertEqual([c.success for c in changes], [True, True, False])
+        self.assertIsInstance(changes[2].error, ValueError)
+        api.createDisposition.assert_awaited_once_with(
+            {'name': 'New', 'type': 'FinalDisp'},
+        )
+        self.assertEqual(
+            api.modifyDisposition.await_args[0][0]['type'], 'DoNotDial',
+        )
+        api.removeDisposition.assert_awaited_once_with('Old')
+
+    def test_await_then_nested(self):
+        """It should await awaitables returned by the callback."""
+        async def _value(value):
+            return value
+
+        result = run(await_then(_value(1), lambda v: _value(v + 1)))
+        self.assertEqual(result, 2)
@@ -2,11 +2,48 @@
 # Copyright 2017-TODAY LasLabs Inc.
 # License MIT (https://opensource.org/licenses/MIT).
 
+import re
+import threading
 import unittest
 
+from ..client_pool import ClientPool
 from ..five9 import Five9
 
 
+FIELDS = ['number1', 'first_name', 'state']
+
+
+class FakeContacts(object):
+    """In-memory ``getContactRecords``, returning at most ``page_size``."""
+
+    def __init__(self, contacts, page_size, fields=FIELDS):
+        self.contacts = contacts
+        self.page_size = page_size
+        self.fields = fields
+        self.lookups = []
+        self.lock = threading.Lock()
+
+    def __call__(self, lookup):
+        with self.lock:
+            self.lookups.append(lookup)
+        matches = [
+            contact for contact in self.contacts
+            if all(self._match(c['value'],
+                               contact[self.fields.index(c['field'])])
+                   for c in lookup['criteria'])
+        ]
+        return {
+            'fields': self.fields,
+            'records': [{'values': {'data': list(c)}}
+                        for c in matches[:self.page_size]],
+        }
+
+    @staticmethod
+    def _match(value, data):
+        return data is not None and \
+            re.match(r'(?:%s)\Z' % value, data) is not None
+
+
 class Common(unittest.TestCase):
 
     def setUp(self):
@@ -14,3 +51,4 @@ class Common(unittest.TestCase):
         self.user = 'username@something.com'
         self.password = 'password'
         self.five9 = Five9(self.user, self.password)
+        self.five9.client_pool = ClientPool()
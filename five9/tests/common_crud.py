@@ -77,5 +77,78 @@ class CommonCrud(object):
         """It should call the write method on the API."""
         self.Model(**self.data).write(self.five9)
         self._get_method('write').assert_called_once_with(
-            self.Model(**self.data).serialize(),
+            self.Model(**self.data).serialize(include_class=False),
         )
+
+    def test_search_cache(self):
+        """It should serve repeated searches from the enabled cache."""
+        self.Model.enable_cache()
+        self.addCleanup(self.Model.disable_cache)
+        self._get_method('search').return_value = [self.data]
+        first = self.Model.search(self.five9, self.data)
+        second = self.Model.search(self.five9, self.data)
+        self._get_method('search').assert_called_once_with('Test')
+        self.assertDictEqual(first[0].serialize(), second[0].serialize())
+        self.assertIsNot(first[0], second[0])
+        self.assertEqual(self.Model.__cache__.hits, 1)
+
+    def test_search_cache_bypass(self):
+        """It should call the remote when bypassing the cache."""
+        self.Model.enable_cache()
+        self.addCleanup(self.Model.disable_cache)
+        self.Model.search(self.five9, self.data)
+        self.Model.search(self.five9, self.data, cache=False)
+        self.assertEqual(self._get_method('search').call_count, 2)
+
+    def test_create_invalidates_cache(self):
+        """It should invalidate the cache after creating a record."""
+        self.Model.enable_cache()
+        self.addCleanup(self.Model.disable_cache)
+        self.Model.create(self.five9, self.data)
+        self.assertEqual(self.Model.__cache__.invalidations, 1)
+
+    def test_write_invalidates_cache(self):
+        """It should invalidate the cache after writing a record."""
+        self.Model.enable_cache()
+        self.addCleanup(self.Model.disable_cache)
+        self.Model.search(self.five9, self.data)
+        self.Model(**self.data).write(self.five9)
+        self.Model.search(self.five9, self.data)
+        self.assertEqual(self._get_method('search').call_count, 2)
+
+    def test_delete_invalidates_cache(self):
+        """It should invalidate the cache after deleting a record."""
+        self.Model.enable_cache()
+        self.addCleanup(self.Model.disable_cache)
+        self.Model(**self.data).delete(self.five9)
+        self.assertEqual(self.Model.__cache__.invalidations, 1)
+
+    def test_search_prefetch(self):
+        """It should fetch the catalog once and search it locally."""
+        self.Model.enable_prefetch()
+        self.addCleanup(self.Model.disable_prefetch)
+        other = dict(self.data, **{self.Model.__uid_field__: 'Other'})
+        self._get_method('search').return_value = [self.data, other]
+        results = self.Model.search(self.five9, {
+            self.Model.__uid_field__: ['Other', 'Missing'],
+        })
+        self.assertEqual(self.Model.read(self.five9, 'Test').name, 'Test')
+        self._get_method('search').assert_called_once_with('.*')
+        self.assertEqual([r.name for r in results], ['Other'])
+
+    def test_write_invalidates_prefetch(self):
+        """It should fetch the catalog again after writing a record."""
+        self.Model.enable_prefetch()
+        self.addCleanup(self.Model.disable_prefetch)
+        self.Model.search(self.five9, self.data)
+        self.Model(**self.data).write(self.five9)
+        self.Model.search(self.five9, self.data)
+        self.assertEqual(self._get_method('search').call_count, 2)
+
+    def test_read_many(self):
+        """It should search for the IDs with one escaped pattern."""
+        self._get_method('search').return_value = [self.data]
+        results = self.Model.read_many(self.five9, ['Test', 'A.B'])
+        self._get_method('search').assert_called_once_with(r'(Test|A\.B)')
+        self.assertEqual(results[0].name, 'Test')
+        self.assertIsNone(results[1])
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import sys
+
+# The tests of the asynchronous client use ``async`` syntax and
+# ``asyncio.run``, so they are only loaded where both are available.
+if sys.version_info >= (3, 7):
+    from .async_cases import *  # noqa: F401,F403
@@ -7,6 +7,7 @@ import properties
 import unittest
 
 from ..models.base_model import BaseModel
+from ..models.web_connector import WebConnector
 
 
 class TestModel(BaseModel):
@@ -14,6 +15,10 @@ class TestModel(BaseModel):
     not_a_field = True
 
 
+class NamedModel(BaseModel):
+    name = properties.String('Name')
+
+
 class TestBaseModel(unittest.TestCase):
 
     def setUp(self):
@@ -52,6 +57,150 @@ class TestBaseModel(unittest.TestCase):
             BaseModel.read('five9', 'external_id')
             search.assert_called_once_with('five9', {'name': 'external_id'})
 
+    def test_read_no_cache(self):
+        """It should bypass the cache of the search."""
+        with mock.patch.object(BaseModel, 'search') as search:
+            BaseModel.read('five9', 'external_id', cache=False)
+            search.assert_called_once_with(
+                'five9', {'name': 'external_id'}, cache=False,
+            )
+
+    def test_search_uncacheable(self):
+        """It should not cache searches with unhashable filters."""
+        TestModel.enable_cache()
+        self.addCleanup(TestModel.disable_cache)
+        with mock.patch.object(TestModel, '_search') as search:
+            TestModel.search(mock.MagicMock(), {'name': {'a': 1}})
+            TestModel.search(mock.MagicMock(), {'name': {'a': 1}})
+            self.assertEqual(search.call_count, 2)
+        self.assertEqual(len(TestModel.__cache__), 0)
+
+    def test_search_cache_per_user(self):
+        """It should cache the searches of each user separately."""
+        TestModel.enable_cache()
+        self.addCleanup(TestModel.disable_cache)
+        with mock.patch.object(TestModel, '_search') as search:
+            search.return_value = []
+            TestModel.search(mock.MagicMock(username='a'), {'name': 'a'})
+            TestModel.search(mock.MagicMock(username='b'), {'name': 'a'})
+            self.assertEqual(search.call_count, 2)
+
+    def test_get_id_patterns(self):
+        """It should escape and chunk the IDs into patterns."""
+        patterns = list(BaseModel._get_id_patterns(
+            ['a', 'b.c', 'a', 'd', 'e'], 2, 100,
+        ))
+        self.assertEqual(patterns, [r'(a|b\.c)', r'(d|e)'])
+
+    def test_get_id_patterns_max_length(self):
+        """It should keep patterns under the maximum length."""
+        patterns = list(BaseModel._get_id_patterns(
+            ['aaaa', 'bbbb', 'cccccccccccc'], 500, 12,
+        ))
+        self.assertEqual(patterns, ['(aaaa|bbbb)', '(cccccccccccc)'])
+
+    def test_read_many(self):
+        """It should return the records in order, with None for misses."""
+        def _search(five9, filters):
+            names = filters['name'].strip('()').split('|')
+            return [NamedModel(name=n) for n in names if n in 'abc']
+
+        with mock.patch.object(NamedModel, 'search') as search:
+            search.side_effect = _search
+            result = NamedModel.read_many(
+                None, ['c', 'x', 'a', 'c'], chunk_size=2,
+            )
+            self.assertEqual(search.call_count, 2)
+        self.assertEqual(
+            [r and r.name for r in result], ['c', None, 'a', 'c'],
+        )
+
+    def test_read_many_error(self):
+        """It should raise the error of a failed search."""
+        with mock.patch.object(BaseModel, 'search') as search:
+            search.side_effect = ValueError()
+            with self.assertRaises(ValueError):
+                BaseModel.read_many(None, ['a'])
+
+    def _web_connector_data(self):
+        return {
+            'name': 'Test',
+            'description': None,
+            'executeInBrowser': True,
+            'constants': [{'key': 'a', 'value': 'b'}, None],
+            'variables': [],
+            'triggerDispositions': [
+                {'name': 'Disposition', 'type': 'FinalDisp',
+                 'description': None},
+                {'name': None},
+            ],
+        }
+
+    def test_from_zeep(self):
+        """It should build the same record as the validated path."""
+        data = self._web_connector_data()
+        expect = WebConnector.deserialize(WebConnector._zeep_to_dict(data))
+        record = WebConnector.from_zeep(data)
+        self.assertDictEqual(record.serialize(), expect.serialize())
+
+    def test_from_zeep_nested(self):
+        """It should build nested records, without empty ones."""
+        record = WebConnector.from_zeep(self._web_connector_data())
+        self.assertEqual(record.constants[0].key, 'a')
+        self.assertEqual(len(record.triggerDispositions), 1)
+        self.assertEqual(record.triggerDispositions[0].type, 'FinalDisp')
+
+    def test_from_zeep_defaults(self):
+        """It should set the defaults of missing values."""
+        record = WebConnector.from_zeep({'name': 'Test'})
+        self.assertEqual(record.agentApplication, 'EmbeddedBrowser')
+
+    def test_from_zeep_zeep_object(self):
+        """It should read the values of zeep objects."""
+        obj = mock.MagicMock(__values__={'name': 'Test'})
+        self.assertEqual(WebConnector.from_zeep(obj).name, 'Test')
+
+    def test_from_zeep_deferred_validation(self):
+        """It should validate the values once the record is serialized."""
+        record = WebConnector.from_zeep({'name': 'Test', 'trigger': 'Bad'})
+        self.assertEqual(record.trigger, 'Bad')
+        with self.assertRaises(properties.ValidationError):
+            record.serialize()
+
+    def test_to_zeep(self):
+        """It should return the same data as the generic serializer."""
+        record = WebConnector.from_zeep(self._web_connector_data())
+        self.assertDictEqual(
+            record.to_zeep(), record.serialize(include_class=False),
+        )
+        self.assertEqual(record.to_zeep()['constants'], [
+            {'key': 'a', 'value': 'b'},
+        ])
+
+    def test_to_zeep_validates_trusted(self):
+        """It should validate the values of trusted records."""
+        record = WebConnector.from_zeep({'name': 'Test', 'trigger': 'Bad'})
+        with self.assertRaises(properties.ValidationError):
+            record.to_zeep()
+
+    def test_to_zeep_generic_property(self):
+        """It should use the property serializer of custom properties."""
+        class CustomModel(BaseModel):
+            value = properties.Integer('Value', serializer=lambda v, **k: -v)
+        self.assertEqual(CustomModel(value=1).to_zeep(), {'value': -1})
+
+    def test_get_serializer_cached(self):
+        """It should generate the serializer once per model."""
+        serializer = WebConnector._get_serializer()
+        self.assertIs(WebConnector._get_serializer(), serializer)
+        self.assertIsNot(NamedModel._get_serializer(), serializer)
+
+    def test_get_deserializer_cached(self):
+        """It should generate the deserializer once per model."""
+        deserializer = WebConnector._get_deserializer()
+        self.assertIs(WebConnector._get_deserializer(), deserializer)
+        self.assertEqual(deserializer({'name': 'Test'}), {'name': 'Test'})
+
     def test_call_and_serialize_refresh_return(self):
         """It should return the refreshed object."""
         data = {'name': 'test'}
@@ -98,6 +247,65 @@ class TestBaseModel(unittest.TestCase):
             expect['bad_list_with_dict']
         self.assertDictEqual(res, expect)
 
+    def _nested_data(self):
+        return {
+            'name': 'Test',
+            'empty': {'a': {'b': None}, 'c': [None, {'d': None}]},
+            'list': [None, {'a': None, 'b': 1}, [], 0, {}],
+            'nested': {'a': {'b': {'c': [{'d': 'e'}]}}},
+            'false': False,
+            'none': None,
+        }
+
+    def _nested_expect(self):
+        return {
+            'name': 'Test',
+            'list': [{'b': 1}, [], 0],
+            'nested': {'a': {'b': {'c': [{'d': 'e'}]}}},
+            'false': False,
+        }
+
+    def test__get_non_empty_dict_nested(self):
+        """It should prune nested containers without changing the input."""
+        data = self._nested_data()
+        res = BaseModel._get_non_empty_dict(data)
+        self.assertDictEqual(res, self._nested_expect())
+        self.assertDictEqual(data, self._nested_data())
+
+    def test__get_non_empty_dict_in_place(self):
+        """It should prune the mapping and its containers in place."""
+        data = self._nested_data()
+        nested_list = data['list']
+        res = BaseModel._get_non_empty_dict(data, in_place=True)
+        self.assertIs(res, data)
+        self.assertIs(res['list'], nested_list)
+        self.assertDictEqual(data, self._nested_expect())
+
+    def test__get_non_empty_dict_deep(self):
+        """It should prune payloads deeper than the recursion limit."""
+        data = leaf = {}
+        for _ in range(5000):
+            leaf['child'] = {'none': None}
+            leaf = leaf['child']
+        leaf['value'] = 1
+        res = BaseModel._get_non_empty_dict(data)
+        for _ in range(5000):
+            res = res['child']
+        self.assertDictEqual(res, {'value': 1})
+
+    def test__get_non_empty_list(self):
+        """It should drop None values and empty mappings."""
+        self.assertEqual(
+            BaseModel._get_non_empty_list(iter([None, {'a': None}, [], 1])),
+            [[], 1],
+        )
+
+    def test__get_non_empty_list_in_place(self):
+        """It should prune the list in place."""
+        data = [None, {'a': 1, 'b': None}]
+        BaseModel._get_non_empty_list(data, in_place=True)
+        self.assertEqual(data, [{'a': 1}])
+
     def test_dict_lookup_exist(self):
         """It should return the attribute value when it exists."""
         self.assertEqual(
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import requests
+import unittest
+
+from ..client_pool import ClientPool
+
+
+class TestClientPool(unittest.TestCase):
+
+    def setUp(self):
+        super(TestClientPool, self).setUp()
+        self.pool = ClientPool(size=2)
+        self.auth = requests.auth.HTTPBasicAuth('user', 'password')
+        self.factory = mock.MagicMock(side_effect=lambda: object())
+
+    def _get(self, wsdl='wsdl', username='user', auth=None):
+        return self.pool.get(
+            username, wsdl, auth or self.auth, self.factory,
+        )
+
+    def test_get_miss(self):
+        """It should create the client on a miss."""
+        client = self._get()
+        self.factory.assert_called_once_with()
+        self.assertIs(self.pool._clients[('user', 'wsdl')].client, client)
+        self.assertEqual(self.pool.misses, 1)
+
+    def test_get_hit(self):
+        """It should return the pooled client on a hit."""
+        self.assertIs(self._get(), self._get())
+        self.factory.assert_called_once_with()
+        self.assertEqual(self.pool.hits, 1)
+
+    def test_get_keyed_by_wsdl(self):
+        """It should pool clients per WSDL."""
+        self.assertIsNot(self._get('wsdl1'), self._get('wsdl2'))
+
+    def test_get_keyed_by_username(self):
+        """It should pool clients per username."""
+        self.assertIsNot(self._get(username='a'), self._get(username='b'))
+
+    def test_get_keyed_by_options(self):
+        """It should pool clients per options."""
+        client = self.pool.get('user', 'wsdl', self.auth, self.factory, (1,))
+        self.assertIs(
+            self.pool.get('user', 'wsdl', self.auth, self.factory, (1,)),
+            client,
+        )
+        self.assertIsNot(
+            self.pool.get('user', 'wsdl', self.auth, self.factory, (2,)),
+            client,
+        )
+
+    def test_get_other_auth(self):
+        """It should replace the client when the credentials changed."""
+        client = self._get()
+        auth = requests.auth.HTTPBasicAuth('user', 'other')
+        self.assertIsNot(self._get(auth=auth), client)
+        self.assertEqual(self.pool.misses, 2)
+
+    def test_get_evicts_lru(self):
+        """It should evict the least recently used client when full."""
+        self._get('wsdl1')
+        self._get('wsdl2')
+        self._get('wsdl1')
+        self._get('wsdl3')
+        self.assertEqual(
+            list(self.pool._clients), [('user', 'wsdl1'), ('user', 'wsdl3')],
+        )
+        self.assertEqual(self.pool.evictions, 1)
+
+    def test_get_evicts_idle(self):
+        """It should evict clients that have been idle too long."""
+        client = self._get()
+        self.pool.idle_timeout = -1
+        self.assertIsNot(self._get(), client)
+        self.assertEqual(self.pool.evictions, 1)
+
+    def test_stats(self):
+        """It should return the usage counters."""
+        self._get()
+        self._get()
+        self.assertDictEqual(self.pool.stats(), {
+            'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1,
+        })
+
+    def test_clear(self):
+        """It should empty the pool and reset the counters."""
+        self._get()
+        self.pool.clear()
+        self.assertEqual(len(self.pool), 0)
+        self.assertEqual(self.pool.misses, 0)
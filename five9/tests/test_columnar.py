@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import unittest
+
+from datetime import date, datetime
+from six import StringIO
+
+from .. import columnar
+from ..exceptions import ValidationError
+
+
+class TestColumnar(unittest.TestCase):
+
+    def setUp(self):
+        super(TestColumnar, self).setUp()
+        self.fields = ['name', 'count', 'active', 'born', 'modified']
+        self.records = [
+            {'values': {'data': [
+                'Test', '12', 'true', '2017-09-05', '2017-09-05 10:01:02.500',
+            ]}},
+            {'values': {'data': ['Other', None, 'false', None, None]}},
+        ]
+        self.types = {
+            'count': 'NUMBER',
+            'active': 'BOOLEAN',
+            'born': 'DATE',
+            'modified': 'DATE_TIME',
+        }
+
+    def test_get_contact_field_types(self):
+        """It should return the contact field types keyed by name."""
+        five9 = mock.MagicMock()
+        five9.configuration.getContactFields.return_value = [
+            {'name': 'number1', 'type': 'PHONE'},
+        ]
+        self.assertDictEqual(
+            columnar.get_contact_field_types(five9), {'number1': 'PHONE'},
+        )
+
+    def test_to_columns_python(self):
+        """It should convert the columns to native types."""
+        res = columnar.to_columns(
+            self.fields, self.records, self.types, use_numpy=False,
+        )
+        self.assertEqual(list(res), self.fields)
+        self.assertEqual(res['name'], ['Test', 'Other'])
+        self.assertEqual(res['count'], [12.0, None])
+        self.assertEqual(res['active'], [True, False])
+        self.assertEqual(res['born'], [date(2017, 9, 5), None])
+        self.assertEqual(
+            res['modified'], [datetime(2017, 9, 5, 10, 1, 2, 500000), None],
+        )
+
+    def test_to_columns_bad_date(self):
+        """It should raise ValidationError for unparsable dates."""
+        self.records[0]['values']['data'][3] = 'bad'
+        with self.assertRaises(ValidationError):
+            columnar.to_columns(
+                self.fields, self.records, self.types, use_numpy=False,
+            )
+
+    @unittest.skipIf(columnar.numpy is None, 'NumPy is not installed.')
+    def test_to_columns_numpy(self):
+        """It should convert the columns to typed arrays."""
+        numpy = columnar.numpy
+        res = columnar.to_columns(self.fields, self.records, self.types)
+        self.assertEqual(res['count'].dtype, numpy.float64)
+        self.assertTrue(numpy.isnan(res['count'][1]))
+        self.assertEqual(res['active'].tolist(), [True, False])
+        self.assertEqual(res['born'].dtype, numpy.dtype('datetime64[D]'))
+        self.assertEqual(str(res['modified'][0]), '2017-09-05T10:01:02.500')
+        self.assertTrue(numpy.isnat(res['modified'][1]))
+        self.assertEqual(res['name'].tolist(), ['Test', 'Other'])
+
+    def test_to_columns_numpy_missing(self):
+        """It should raise ImportError when NumPy is required but missing."""
+        with mock.patch.object(columnar, 'numpy', None):
+            with self.assertRaises(ImportError):
+                columnar.to_columns(self.fields, [], use_numpy=True)
+
+    def test_write_csv(self):
+        """It should write the header and the records."""
+        fh = StringIO()
+        count = columnar.write_csv(
+            self.fields, (r for r in self.records), fh, lineterminator='\n',
+        )
+        self.assertEqual(count, 2)
+        self.assertEqual(fh.getvalue(), '\n'.join([
+            'name,count,active,born,modified',
+            'Test,12,true,2017-09-05,2017-09-05 10:01:02.500',
+            'Other,,false,,',
+            '',
+        ]))
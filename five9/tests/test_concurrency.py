@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import threading
+import unittest
+
+from ..concurrency import BulkResult, RateLimiter, run_concurrently
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_acquire_burst(self):
+        """It should allow the burst without waiting."""
+        limiter = RateLimiter(10, burst=3)
+        with mock.patch('five9.concurrency.time.sleep') as sleep:
+            for _ in range(3):
+                limiter.acquire()
+        sleep.assert_not_called()
+
+    def test_acquire_waits(self):
+        """It should wait for a token when the bucket is empty."""
+        limiter = RateLimiter(1000, burst=1)
+        limiter.acquire()
+        self.assertGreater(limiter.acquire(), 0)
+
+    def test_reserve(self):
+        """It should take tokens without blocking and return the wait."""
+        limiter = RateLimiter(10, burst=1)
+        with mock.patch('five9.concurrency.time.sleep') as sleep:
+            self.assertEqual(limiter.reserve(), 0)
+            self.assertAlmostEqual(limiter.reserve(), 0.1, places=2)
+            self.assertAlmostEqual(limiter.reserve(), 0.2, places=2)
+        sleep.assert_not_called()
+
+
+class TestRunConcurrently(unittest.TestCase):
+
+    def test_results_ordered(self):
+        """It should return the results in the order of the items."""
+        result = run_concurrently(lambda i: i * 2, range(20), max_workers=4)
+        self.assertIsInstance(result, BulkResult)
+        self.assertEqual(result, [i * 2 for i in range(20)])
+        self.assertTrue(result.ok)
+
+    def test_errors_collected(self):
+        """It should collect errors instead of aborting."""
+        def _func(item):
+            if item == 2:
+                raise ValueError(item)
+            return item
+        result = run_concurrently(_func, [1, 2, 3], max_workers=2)
+        self.assertEqual(result, [1, None, 3])
+        self.assertIsInstance(result.errors[1], ValueError)
+        self.assertFalse(result.ok)
+
+    def test_max_workers(self):
+        """It should not exceed the maximum amount of concurrent calls."""
+        lock = threading.Lock()
+        state = {'running': 0, 'max': 0}
+
+        def _func(item):
+            with lock:
+                state['running'] += 1
+                state['max'] = max(state['max'], state['running'])
+            threading.Event().wait(0.001)
+            with lock:
+                state['running'] -= 1
+
+        run_concurrently(_func, range(30), max_workers=3)
+        self.assertLessEqual(state['max'], 3)
+
+    def test_lazy_items(self):
+        """It should accept lazy iterables."""
+        result = run_concurrently(
+            lambda i: i, (i for i in range(5)), max_workers=2,
+        )
+        self.assertEqual(result, list(range(5)))
+
+    def test_progress(self):
+        """It should report the progress after each item."""
+        progress = mock.MagicMock()
+        run_concurrently(lambda i: i, [1, 2, 3], progress=progress)
+        progress.assert_has_calls([
+            mock.call(1, 3), mock.call(2, 3), mock.call(3, 3),
+        ])
+
+    def test_rate_limit(self):
+        """It should acquire from the rate limiter for each call."""
+        limiter = mock.MagicMock(spec=RateLimiter)
+        run_concurrently(lambda i: i, [1, 2], rate_limit=limiter)
+        self.assertEqual(limiter.acquire.call_count, 2)
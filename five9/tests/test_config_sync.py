@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import unittest
+
+from ..config_sync import Change, ConfigSync
+from ..environment import Environment
+from ..exceptions import ValidationError
+from ..five9 import Five9
+from ..models.disposition import Disposition
+
+
+class TestConfigSync(unittest.TestCase):
+
+    def setUp(self):
+        super(TestConfigSync, self).setUp()
+        self.five9 = mock.MagicMock(spec=Five9)
+        self.five9.env = Environment(self.five9)
+        self.api = self.five9.configuration
+        self.remote = [
+            {'name': 'Sale', 'type': 'FinalDisp', 'agentMustConfirm': True},
+            {'name': 'No Answer', 'type': 'RedialNumber',
+             'description': 'Nobody picked up'},
+            {'name': 'Old', 'type': 'FinalDisp'},
+        ]
+        self.api.getDispositions.return_value = self.remote
+        self.sync = ConfigSync(self.five9, 'Disposition', max_workers=2)
+
+    def test_init_model_name(self):
+        """It should resolve the model from its name."""
+        self.assertIs(self.sync.model, Disposition)
+
+    def test_init_model_unknown(self):
+        """It should raise ValidationError for unknown model names."""
+        with self.assertRaises(ValidationError):
+            ConfigSync(self.five9, 'Unknown')
+
+    def test_diff_unchanged(self):
+        """It should not change records that match the remote."""
+        desired = [{'name': 'Sale', 'type': 'FinalDisp'}]
+        self.assertEqual(self.sync.diff(desired), [])
+        self.api.getDispositions.assert_called_once_with('.*')
+
+    def test_diff_fields(self):
+        """It should compute the differences of each field."""
+        changes = self.sync.diff([
+            {'name': 'No Answer', 'type': 'RedialNumber',
+             'description': 'No answer', 'agentMustConfirm': False},
+            {'name': 'New', 'type': 'DoNotDial'},
+        ])
+        self.assertEqual([(c.action, c.name) for c in changes], [
+            (Change.MODIFY, 'No Answer'), (Change.CREATE, 'New'),
+        ])
+        self.assertEqual(changes[0].diff, {
+            'description': ('Nobody picked up', 'No answer'),
+            'agentMustConfirm': (None, False),
+        })
+
+    def test_diff_modify_keeps_fields(self):
+        """It should keep the remote values of the fields not desired."""
+        changes = self.sync.diff([{'name': 'Sale', 'type': 'AddAllNumbers'}])
+        self.assertEqual(changes[0].data, {
+            'name': 'Sale', 'type': 'AddAllNumbers', 'agentMustConfirm': True,
+        })
+
+    def test_diff_records(self):
+        """It should compare all fields of desired model records."""
+        changes = self.sync.diff([Disposition(name='Old', type='FinalDisp')])
+        self.assertEqual(changes, [])
+
+    def test_diff_prune(self):
+        """It should delete the remote records not desired when pruning."""
+        self.sync.prune = True
+        changes = self.sync.diff([{'name': 'Sale'}, {'name': 'No Answer'}])
+        self.assertEqual([(c.action, c.name) for c in changes], [
+            (Change.DELETE, 'Old'),
+        ])
+
+    def test_diff_invalid(self):
+        """It should raise ValidationError for invalid desired records."""
+        with self.assertRaises(ValidationError):
+            self.sync.diff([{'type': 'FinalDisp'}])
+        with self.assertRaises(ValidationError):
+            self.sync.diff([{'name': 'A'}, {'name': 'A'}])
+
+    def test_sync(self):
+        """It should only call the remote for the changes."""
+        self.sync.prune = True
+        changes = self.sync.sync([
+            {'name': 'Sale', 'type': 'FinalDisp'},
+            {'name': 'No Answer', 'description': 'No answer'},
+            {'name': 'New', 'type': 'DoNotDial'},
+        ])
+        self.assertTrue(all(c.success for c in changes))
+        self.api.createDisposition.assert_called_once_with(
+            {'name': 'New', 'type': 'DoNotDial'},
+        )
+        data = self.api.modifyDisposition.call_args[0][0]
+        self.assertEqual(data['description'], 'No answer')
+        self.assertEqual(data['type'], 'RedialNumber')
+        self.api.removeDisposition.assert_called_once_with('Old')
+
+    def test_sync_dry_run(self):
+        """It should not call the remote in dry-run mode."""
+        changes = self.sync.sync([{'name': 'New'}], dry_run=True)
+        self.assertEqual(len(changes), 1)
+        self.api.createDisposition.assert_not_called()
+
+    def test_apply_errors(self):
+        """It should collect errors per change instead of aborting."""
+        self.api.createDisposition.side_effect = ValueError()
+        changes = self.sync.sync([
+            {'name': 'New'}, {'name': 'Sale', 'type': 'DoNotDial'},
+        ])
+        self.assertIsInstance(changes[0].error, ValueError)
+        self.assertFalse(changes[0].success)
+        self.assertTrue(changes[1].success)
+
+    def test_environment_sync(self):
+        """It should sync the model of the environment."""
+        changes = self.five9.env.Disposition.sync(
+            [{'name': 'New'}], dry_run=True,
+        )
+        self.assertEqual([c.action for c in changes], [Change.CREATE])
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+from datetime import datetime
+
+from ..contact_mirror import ContactMirror
+from ..contacts import ContactSearch
+from ..exceptions import ValidationError
+from ..five9 import Five9
+
+from .common import FakeContacts
+
+
+FIELDS = ['number1', 'first_name', 'state', 'modified_at']
+
+
+class TestContactMirror(unittest.TestCase):
+
+    def setUp(self):
+        super(TestContactMirror, self).setUp()
+        self.contacts = [
+            ['%03d' % i, 'First %d' % i, 'NV' if i % 2 else 'CA',
+             '2017-01-01 00:00:00']
+            for i in range(50)
+        ]
+        self.five9 = mock.MagicMock(spec=Five9)
+        self.five9.create_criteria = Five9.create_criteria
+        self.five9.parse_response = Five9.parse_response
+        self.fake = FakeContacts(self.contacts, 1000, FIELDS)
+        self.five9.configuration.getContactRecords.side_effect = self.fake
+        self.mirror = ContactMirror(
+            self.five9, keys=['number1'], indexes=['state'],
+        )
+
+    def test_sync_full(self):
+        """It should copy all contacts on the first sync."""
+        self.assertEqual(self.mirror.sync(), 50)
+        self.assertEqual(len(self.mirror), 50)
+        self.assertEqual(self.fake.lookups, [{'criteria': []}])
+        self.assertIsInstance(self.mirror.last_sync, datetime)
+
+    def test_sync_incremental(self):
+        """It should only fetch the modified contacts after the first sync.
+        """
+        self.mirror.sync()
+        today = datetime.utcnow().strftime('%Y-%m-%d')
+        self.contacts[1][1] = 'Changed'
+        self.contacts[1][3] = '%s 10:00:00' % today
+        self.contacts.append(['999', 'New', 'NV', '%s 11:00:00' % today])
+        self.assertEqual(self.mirror.sync(), 2)
+        self.assertEqual(len(self.mirror), 51)
+        self.assertEqual(
+            self.mirror.lookup('number1', '001')['first_name'], 'Changed',
+        )
+        criteria = self.fake.lookups[-1]['criteria']
+        self.assertEqual(criteria[0]['field'], 'modified_at')
+
+    def test_sync_full_removes(self):
+        """It should remove the contacts that no longer exist."""
+        self.mirror.sync()
+        del self.contacts[10:]
+        self.mirror.sync(full=True)
+        self.assertEqual(len(self.mirror), 10)
+
+    def test_sync_full_partial(self):
+        """It should not remove contacts when the search is truncated."""
+        self.mirror.sync()
+        self.assertTrue(self.mirror.complete)
+        del self.contacts[10:]
+        self.fake.page_size = 5
+        self.mirror.search_kwargs['max_depth'] = 1
+        with mock.patch.object(ContactSearch, 'PAGE_SIZE', 5):
+            self.mirror.sync(full=True)
+        self.assertFalse(self.mirror.complete)
+        self.assertEqual(self.mirror.truncated, [{'number1': '0.*'}])
+        self.assertEqual(len(self.mirror), 50)
+
+    def test_sync_partial_first(self):
+        """It should sync in full again until a full sync is complete."""
+        self.fake.page_size = 5
+        self.mirror.search_kwargs['max_depth'] = 1
+        with mock.patch.object(ContactSearch, 'PAGE_SIZE', 5):
+            self.mirror.sync()
+        self.assertFalse(self.mirror.complete)
+        self.assertIsNone(self.mirror.last_sync)
+        self.fake.page_size = 1000
+        self.assertEqual(self.mirror.sync(), 50)
+        self.assertEqual(self.fake.lookups[-1], {'criteria': []})
+        self.assertTrue(self.mirror.complete)
+        self.assertIsNotNone(self.mirror.last_sync)
+
+    def test_sync_new_field(self):
+        """It should add columns for new fields."""
+        self.mirror.sync()
+        FIELDS.append('zip')
+        self.addCleanup(FIELDS.remove, 'zip')
+        for contact in self.contacts:
+            contact.append('89123')
+        self.mirror.sync(full=True)
+        self.assertEqual(self.mirror.lookup('number1', '001')['zip'], '89123')
+
+    def test_sync_missing_keys(self):
+        """It should raise ValidationError if the keys are not in the data."""
+        self.mirror.keys = ['email']
+        with self.assertRaises(ValidationError):
+            self.mirror.sync()
+
+    def test_search_values(self):
+        """It should match any of the list values of a field."""
+        self.mirror.sync()
+        res = self.mirror.search({'state': 'NV', 'number1': ['001', '002',
+                                                             '003']})
+        self.assertEqual([r['number1'] for r in res], ['001', '003'])
+
+    def test_search_prefix(self):
+        """It should match prefixes and regular expressions."""
+        self.mirror.sync()
+        self.assertEqual(len(self.mirror.search({'number1': '00.*'})), 10)
+        self.assertEqual(len(self.mirror.search({'number1': '0[0-1]0'})), 2)
+
+    def test_search_limit(self):
+        """It should return at most the limit."""
+        self.mirror.sync()
+        self.assertEqual(len(self.mirror.search({}, limit=3)), 3)
+
+    def test_search_unknown_field(self):
+        """It should raise ValidationError for fields that are not mirrored.
+        """
+        self.mirror.sync()
+        with self.assertRaises(ValidationError):
+            self.mirror.search({'email': 'test'})
+
+    def test_search_empty(self):
+        """It should return nothing before the first sync."""
+        self.assertEqual(self.mirror.search({'number1': '001'}), [])
+        self.assertIsNone(self.mirror.lookup('number1', '001'))
+
+    def test_persistent(self):
+        """It should keep the contacts and sync state in the database."""
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        path = os.path.join(path, 'contacts.db')
+        mirror = ContactMirror(self.five9, path)
+        mirror.sync()
+        mirror.close()
+        mirror = ContactMirror(self.five9, path)
+        self.assertEqual(len(mirror), 50)
+        self.assertEqual(mirror.fields, FIELDS)
+        self.assertIsNotNone(mirror.last_sync)
+        mirror.close()
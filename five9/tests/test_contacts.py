@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import unittest
+
+from ..contacts import ContactSearch
+from ..exceptions import ValidationError
+from ..five9 import Five9
+
+from .common import FIELDS, FakeContacts
+
+
+class TestContactSearch(unittest.TestCase):
+
+    def setUp(self):
+        super(TestContactSearch, self).setUp()
+        self.contacts = [
+            ('%03d' % i, 'First %d' % i, 'NV' if i % 2 else 'CA')
+            for i in range(200)
+        ]
+        self.five9 = mock.MagicMock(spec=Five9)
+        self.five9.create_criteria = Five9.create_criteria
+        self.five9.parse_response = Five9.parse_response
+        self.fake = FakeContacts(self.contacts, 5)
+        self.five9.configuration.getContactRecords.side_effect = self.fake
+        self.search = ContactSearch(self.five9, keys=['number1'])
+        self.search.PAGE_SIZE = 5
+
+    def test_search_partitions(self):
+        """It should return every contact once by splitting the query."""
+        self.search.partition_required = True
+        res = list(self.search.search({'state': 'NV'}))
+        self.assertEqual(
+            sorted(r['number1'] for r in res),
+            [c[0] for c in self.contacts if c[2] == 'NV'],
+        )
+        self.assertEqual(self.search.truncated, [])
+        self.assertEqual(self.search.calls, len(self.fake.lookups))
+
+    def test_search_partitions_other_values(self):
+        """It should return the contacts that the prefixes do not match."""
+        others = [
+            ('', 'Empty', 'NV'), ('0', 'Zero', 'NV'), ('01', 'Short', 'NV'),
+            ('+1 555', 'Plus', 'NV'), ('0 1', 'Space', 'NV'),
+            ('1.5', 'Dot', 'NV'),
+        ]
+        self.fake.contacts = self.contacts + others
+        search = ContactSearch(
+            self.five9, keys=['first_name'], partition_required=True,
+        )
+        search.PAGE_SIZE = 5
+        res = list(search.search({'state': 'NV'}))
+        self.assertEqual(
+            sorted(r['first_name'] for r in res),
+            sorted(c[1] for c in self.fake.contacts if c[2] == 'NV'),
+        )
+        self.assertEqual(search.truncated, [])
+
+    def test_search_partitions_unset(self):
+        """It should keep the unset values of a split query, and report it.
+        """
+        self.fake.contacts = [(None, 'Unset', 'NV')] + self.contacts + [
+            (None, 'Missed', 'NV'),
+        ]
+        search = ContactSearch(self.five9, keys=['first_name'])
+        search.PAGE_SIZE = 5
+        res = [r['first_name'] for r in search.search({'state': 'NV'})]
+        self.assertIn('Unset', res)
+        self.assertNotIn('Missed', res)
+        self.assertEqual(search.truncated, [{'state': 'NV'}])
+
+    def test_partition(self):
+        """It should escape the prefix and cover the other values."""
+        self.search.alphabet = '+1'
+        self.assertEqual(self.search.partition({}, r'\+.*', '+'), [
+            ({}, r'\+\+.*', '++'), ({}, r'\+1.*', '+1'),
+            ({}, r'^\+$', None), ({}, r'\+[^\+1].*', None),
+        ])
+
+    def test_partition_exact(self):
+        """It should not split the sub-queries of exact values."""
+        self.assertEqual(self.search.partition({}, '^0$'), [])
+
+    def test_search_list_values(self):
+        """It should run a sub-query for each of the list values."""
+        self.search.PAGE_SIZE = 1000
+        self.fake.page_size = 1000
+        res = list(self.search.search({'state': ['NV', 'CA', 'NV']}))
+        self.assertEqual(len(res), 200)
+        self.assertEqual(self.search.calls, 2)
+
+    def test_search_small(self):
+        """It should not split queries below the page size."""
+        res = list(self.search.search({'first_name': 'First 1'}))
+        self.assertEqual(res, [
+            {'number1': '001', 'first_name': 'First 1', 'state': 'NV'},
+        ])
+        self.assertEqual(self.search.calls, 1)
+
+    def test_search_duplicates(self):
+        """It should skip contacts that were already returned."""
+        self.five9.configuration.getContactRecords.side_effect = None
+        self.five9.configuration.getContactRecords.return_value = {
+            'fields': FIELDS,
+            'records': [{'values': {'data': ['1', 'A', 'NV']}}],
+        }
+        res = list(self.search.search({'state': ['NV', 'CA']}))
+        self.assertEqual(len(res), 1)
+
+    def test_search_truncated(self):
+        """It should report sub-queries that cannot be split further."""
+        self.search.max_depth = 1
+        list(self.search.search({'state': 'NV'}))
+        self.assertIn(
+            {'state': 'NV', 'number1': '0.*'}, self.search.truncated,
+        )
+
+    def test_search_partition_field_in_query(self):
+        """It should not split queries of the partition field."""
+        list(self.search.search({'number1': '0.*'}))
+        self.assertEqual(self.search.truncated, [{'number1': '0.*'}])
+
+    def test_search_tuple(self):
+        """It should parse the contacts in the format."""
+        self.search.format = 'tuple'
+        res = list(self.search.search({'first_name': 'First 1'}))
+        self.assertEqual(res[0].first_name, 'First 1')
+
+    def test_search_empty(self):
+        """It should handle lookups without results."""
+        self.five9.configuration.getContactRecords.side_effect = None
+        self.five9.configuration.getContactRecords.return_value = None
+        self.assertEqual(list(self.search.search({'state': 'NV'})), [])
+
+    def test_get_lookup_criteria(self):
+        """It should build the criteria of the lookup."""
+        self.assertEqual(
+            self.search.get_lookup_criteria({'state': 'NV'}),
+            {'criteria': [{'field': 'state', 'value': 'NV'}]},
+        )
+
+    def test_init_bad_format(self):
+        """It should raise ValidationError for formats that cannot stream."""
+        with self.assertRaises(ValidationError):
+            ContactSearch(self.five9, format='columnar')
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import unittest
+
+from ..cursor import RecordCursor
+
+
+class Record(object):
+
+    def __init__(self, value):
+        self.value = value
+        self.even = not value % 2
+
+
+class TestRecordCursor(unittest.TestCase):
+
+    def setUp(self):
+        super(TestRecordCursor, self).setUp()
+        self.factory = mock.MagicMock(side_effect=Record)
+        self.cursor = RecordCursor(list(range(10)), self.factory)
+
+    def _values(self, records):
+        return [r.value for r in records]
+
+    def test_iter_lazy(self):
+        """It should only build records as they are iterated."""
+        iterator = iter(self.cursor)
+        self.factory.assert_not_called()
+        next(iterator)
+        self.factory.assert_called_once_with(0)
+
+    def test_iter_again(self):
+        """It should be iterable more than once."""
+        self.assertEqual(self._values(self.cursor), list(range(10)))
+        self.assertEqual(self._values(self.cursor), list(range(10)))
+
+    def test_iter_keeps_records(self):
+        """It should return the same records when iterated again."""
+        first = list(self.cursor)
+        self.assertEqual(list(self.cursor), first)
+        self.assertIs(self.cursor[0], first[0])
+        self.assertIs(self.cursor[-1], first[-1])
+        self.assertIs(self.cursor[2:4][0], first[2])
+        self.assertIs(self.cursor.filtered('even')[1], first[2])
+        self.assertEqual(self.factory.call_count, 10)
+
+    def test_stream(self):
+        """It should not keep the records that it builds."""
+        kept = self.cursor[3]
+        records = list(self.cursor.stream())
+        self.assertEqual(self._values(records), list(range(10)))
+        self.assertIs(records[3], kept)
+        self.assertEqual(self.cursor._records, {3: kept})
+        self.assertIsNot(next(self.cursor.stream()), records[0])
+
+    def test_stream_slice_filtered(self):
+        """It should stream sliced and filtered cursors."""
+        cursor = self.cursor[2:8].filtered('even').limit(2)
+        self.assertEqual(self._values(cursor.stream()), [2, 4])
+        self.assertEqual(self.cursor._records, {})
+        self.assertEqual(self.cursor[2:8]._records, {})
+
+    def test_getitem_out_of_range(self):
+        """It should raise IndexError for indexes out of range."""
+        with self.assertRaises(IndexError):
+            self.cursor[10]
+
+    def test_len(self):
+        """It should return the amount of rows without building records."""
+        self.assertEqual(len(self.cursor), 10)
+        self.factory.assert_not_called()
+
+    def test_len_filtered(self):
+        """It should raise for cursors with an unknown length."""
+        with self.assertRaises(TypeError):
+            len(self.cursor.filtered('even'))
+
+    def test_bool(self):
+        """It should be falsy without rows."""
+        self.assertTrue(self.cursor)
+        self.assertFalse(RecordCursor([]))
+        self.assertFalse(self.cursor.filtered(lambda r: False))
+
+    def test_getitem(self):
+        """It should only build the record at the index."""
+        self.assertEqual(self.cursor[-1].value, 9)
+        self.factory.assert_called_once_with(9)
+
+    def test_getitem_slice(self):
+        """It should return a cursor of the slice without building records.
+        """
+        cursor = self.cursor[2:8:2]
+        self.factory.assert_not_called()
+        self.assertEqual(self._values(cursor), [2, 4, 6])
+
+    def test_getitem_filtered(self):
+        """It should index and slice filtered cursors."""
+        cursor = self.cursor.filtered('even')
+        self.assertEqual(cursor[1].value, 2)
+        self.assertEqual(self._values(cursor[1:3]), [2, 4])
+        with self.assertRaises(IndexError):
+            cursor[5]
+        with self.assertRaises(ValueError):
+            cursor[-2:]
+
+    def test_limit(self):
+        """It should stop building records at the limit."""
+        cursor = self.cursor.filtered('even').limit(2)
+        self.assertEqual(self._values(cursor), [0, 2])
+        self.assertEqual(self.factory.call_count, 3)
+
+    def test_filtered_callable(self):
+        """It should filter with a predicate."""
+        cursor = self.cursor.filtered(lambda r: r.value > 7)
+        self.assertEqual(self._values(cursor), [8, 9])
+
+    def test_count(self):
+        """It should count the records of filtered cursors."""
+        self.assertEqual(self.cursor.count(), 10)
+        self.assertEqual(self.cursor.filtered('even').count(), 5)
+
+    def test_mapped(self):
+        """It should return the values of the records."""
+        self.assertEqual(self.cursor[:3].mapped('value'), [0, 1, 2])
+        self.assertEqual(
+            self.cursor[:2].mapped(lambda r: r.value + 1), [1, 2],
+        )
+
+    def test_no_factory(self):
+        """It should yield the rows as they are without a factory."""
+        self.assertEqual(list(RecordCursor([1, 2])), [1, 2])
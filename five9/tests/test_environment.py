@@ -5,6 +5,7 @@
 import mock
 import unittest
 
+from ..cursor import RecordCursor
 from ..environment import Environment
 from ..five9 import Five9
 from ..models.web_connector import WebConnector
@@ -49,6 +50,18 @@ class TestEnvironment(unittest.TestCase):
         """It should return the correct model environment."""
         self.assertEqual(self.env.WebConnector.__model__, WebConnector)
 
+    def test_getattr_caches_model_environment(self):
+        """It should return the same model environment on later lookups."""
+        env = self.env.WebConnector
+        self.assertIs(self.env.WebConnector, env)
+        self.assertIs(env.__five9__, self.five9)
+
+    def test_getattr_unknown(self):
+        """It should raise AttributeError for names that are not models."""
+        with self.assertRaises(AttributeError):
+            self.env.NotAModel
+        self.assertFalse(hasattr(self.env, '__deepcopy__'))
+
     def test_iter(self):
         """It should iterate the records in the set."""
         for idx, record in enumerate(self.env):
@@ -95,9 +108,111 @@ class TestEnvironment(unittest.TestCase):
         """It should iterate and delete the recordset."""
         self._test_iter_method('delete')
 
+    def test_write_bulk(self):
+        """It should write concurrently and collect errors in bulk mode."""
+        self.records[0].write.side_effect = ValueError()
+        progress = mock.MagicMock()
+        res = self.env.write(max_workers=2, progress=progress)
+        self.assertEqual(res, [None, self.records[1].write()])
+        self.assertIsInstance(res.errors[0], ValueError)
+        self.assertEqual(progress.call_count, 2)
+
+    def test_delete_bulk(self):
+        """It should delete every record in bulk mode."""
+        self.env.delete(max_workers=2)
+        for record in self.records:
+            record.delete.assert_called_once_with(self.five9)
+
+    def test_read_no_cache(self):
+        """It should bypass the model cache."""
+        self.env.read('Test', cache=False)
+        self.model.read.assert_called_once_with(
+            self.five9, 'Test', cache=False,
+        )
+
+    def test_read_many(self):
+        """It should read the IDs through the model."""
+        res = self.env.read_many(['a', 'b'], chunk_size=1)
+        self.model.read_many.assert_called_once_with(
+            self.five9, ['a', 'b'], chunk_size=1,
+        )
+        self.assertEqual(res, self.model.read_many())
+
+    def test_search_no_cache(self):
+        """It should bypass the model cache."""
+        self.env.search({'name': 'Test'}, cache=False)
+        self.model.search.assert_called_once_with(
+            self.five9, {'name': 'Test'}, cache=False, lazy=True,
+        )
+
     def test_search(self):
         """It should call search on the model and return a recordset."""
         expect = {'test': 1234}
         results = self.env.search(expect)
-        self.model.search.assert_called_once_with(self.five9, expect)
+        self.model.search.assert_called_once_with(
+            self.five9, expect, lazy=True,
+        )
         self.assertEqual(results.__records__, self.model.search())
+
+    def test_iter_lazy(self):
+        """It should build the records of a cursor as they are iterated."""
+        factory = mock.MagicMock(side_effect=lambda row: row * 2)
+        env = Environment(self.five9, self.model, RecordCursor(
+            [1, 2, 3], factory,
+        ))
+        iterator = iter(env)
+        self.assertEqual(next(iterator), 2)
+        factory.assert_called_once_with(1)
+        self.assertEqual(list(iterator), [4, 6])
+
+    def test_search_edit_write(self):
+        """It should write the changes made to records while iterating."""
+        self.five9.configuration.getWebConnectors.return_value = [
+            {'name': 'a', 'description': 'old'},
+            {'name': 'b', 'description': 'old'},
+        ]
+        env = Environment(self.five9).WebConnector.search({'name': '.*'})
+        for record in env:
+            record.description = 'new'
+        self.assertIs(env[0], env[0])
+        env.write()
+        modify = self.five9.configuration.modifyWebConnector
+        self.assertEqual(
+            [c[0][0]['description'] for c in modify.call_args_list],
+            ['new', 'new'],
+        )
+
+    def test_stream(self):
+        """It should iterate the records without keeping them."""
+        self.five9.configuration.getWebConnectors.return_value = [
+            {'name': 'a'}, {'name': 'b'},
+        ]
+        env = Environment(self.five9).WebConnector.search({'name': '.*'})
+        self.assertEqual([r.name for r in env.stream()], ['a', 'b'])
+        self.assertEqual(env.__records__._records, {})
+
+    def test_getitem(self):
+        """It should return the record at the index."""
+        self.assertEqual(self.env[1], self.records[1])
+
+    def test_getitem_slice(self):
+        """It should return a recordset for slices."""
+        res = self.env[1:]
+        self.assertIsInstance(res, Environment)
+        self.assertEqual(list(res), self.records[1:])
+
+    def test_limit(self):
+        """It should return a recordset of the first records."""
+        self.assertEqual(list(self.env.limit(1)), self.records[:1])
+
+    def test_filtered(self):
+        """It should return a recordset of the matching records."""
+        res = self.env.filtered(lambda r: r is self.records[1])
+        self.assertEqual(list(res), self.records[1:])
+        self.assertEqual(res.count(), 1)
+
+    def test_mapped(self):
+        """It should return the values of the records."""
+        self.assertEqual(
+            self.env.mapped('name'), [r.name for r in self.records],
+        )
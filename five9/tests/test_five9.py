@@ -4,9 +4,16 @@
 
 import mock
 import requests
+import types
 
 from collections import OrderedDict
 
+from ..exceptions import ValidationError
+from ..five9 import Five9
+from ..instrumentation import Instrumentation, InstrumentedService
+from ..instrumentation import record_response
+from ..resilience import ResilientService, RetryPolicy
+
 from .common import Common
 
 
@@ -67,6 +74,54 @@ class TestFive9(Common):
         for idx, row in enumerate(response):
             self.assertDictEqual(row, expect[idx])
 
+    def _get_response(self):
+        fields = ['first_name', 'last name']
+        records = [
+            {'values': {'data': ['Test', 'User']}},
+            {'values': {'data': ['First', 'Last']}},
+        ]
+        return fields, records
+
+    def test_parse_response_lazy(self):
+        """It should return a generator of the parsed records."""
+        response = self.five9.parse_response(*self._get_response(), lazy=True)
+        self.assertIsInstance(response, types.GeneratorType)
+        self.assertEqual(next(response), {
+            'first_name': 'Test', 'last name': 'User',
+        })
+
+    def test_parse_response_tuple(self):
+        """It should return records as named tuples of a shared type."""
+        response = self.five9.parse_response(
+            *self._get_response(), format='tuple'
+        )
+        self.assertEqual(response[0].first_name, 'Test')
+        self.assertEqual(response[1], ('First', 'Last'))
+        self.assertIs(type(response[0]), type(response[1]))
+        self.assertIs(
+            type(response[0]),
+            self.five9.get_record_type(['first_name', 'last name']),
+        )
+
+    def test_parse_response_columnar(self):
+        """It should return the values of each field as lists."""
+        response = self.five9.parse_response(
+            *self._get_response(), format='columnar'
+        )
+        self.assertEqual(list(response), ['first_name', 'last name'])
+        self.assertEqual(response['first_name'], ['Test', 'First'])
+        self.assertEqual(response['last name'], ['User', 'Last'])
+
+    def test_parse_response_columnar_empty(self):
+        """It should return empty columns when there are no records."""
+        response = self.five9.parse_response(['a'], [], format='columnar')
+        self.assertDictEqual(response, {'a': []})
+
+    def test_parse_response_bad_format(self):
+        """It should raise ValidationError for unknown formats."""
+        with self.assertRaises(ValidationError):
+            self.five9.parse_response(*self._get_response(), format='bad')
+
     def _test_cached_client(self, client_type):
         with mock.patch.object(self.five9, '_get_authenticated_client') as mk:
             response = getattr(self.five9, client_type)
@@ -99,6 +154,59 @@ class TestFive9(Common):
         self.assertIsInstance(response, requests.Session)
         self.assertEqual(response.auth, self.five9.auth)
 
+    def test_get_authenticated_session_hook(self):
+        """It should record the responses for the instrumentation."""
+        response = self.five9._get_authenticated_session()
+        self.assertIn(record_response, response.hooks['response'])
+
+    def test_get_authenticated_session_pool_adapter(self):
+        """It should size the connection pools from the client pool."""
+        self.five9.client_pool.pool_maxsize = 42
+        response = self.five9._get_authenticated_session()
+        self.assertEqual(
+            response.get_adapter('https://api.five9.com')._pool_maxsize, 42,
+        )
+
+    def test_cached_client_shared(self):
+        """It should share pooled clients between Five9 instances."""
+        other = Five9(self.user, self.password)
+        other.client_pool = self.five9.client_pool
+        with mock.patch.object(Five9, '_get_authenticated_client') as mk:
+            self.assertEqual(
+                self.five9.configuration, other.configuration,
+            )
+        mk.assert_called_once_with(self.five9.WSDL_CONFIGURATION)
+
+    def test_cached_client_supervisor_params(self):
+        """It should only share supervisor clients with the same session
+        parameters."""
+        same = Five9(self.user, self.password)
+        other = Five9(self.user, self.password)
+        other.time_zone_offset = 2
+        for five9 in (same, other):
+            five9.client_pool = self.five9.client_pool
+        with mock.patch.object(Five9, '_get_authenticated_client') as mk:
+            mk.side_effect = lambda wsdl: mock.MagicMock()
+            self.assertIs(
+                self.five9._get_client('supervisor'),
+                same._get_client('supervisor'),
+            )
+            self.assertIsNot(
+                self.five9._get_client('supervisor'),
+                other._get_client('supervisor'),
+            )
+        self.assertEqual(mk.call_count, 2)
+
+    def test_cached_client_no_pool(self):
+        """It should create a client per instance without a pool."""
+        self.five9.client_pool = None
+        other = Five9(self.user, self.password)
+        other.client_pool = None
+        with mock.patch.object(Five9, '_get_authenticated_client') as mk:
+            self.five9.configuration
+            other.configuration
+        self.assertEqual(mk.call_count, 2)
+
     def test_configuration(self):
         """It should return an authenticated configuration service."""
         response, mk = self._test_cached_client('configuration')
@@ -111,6 +219,37 @@ class TestFive9(Common):
         mk.assert_called_once_with(self.five9.WSDL_SUPERVISOR)
         self.assertEqual(response, mk().service)
 
+    def test_configuration_resilient(self):
+        """It should wrap the service when resilience is configured."""
+        self.five9.retry_policy = RetryPolicy()
+        self.five9.rate_limit = 5
+        self.five9.circuit_breaker = 3
+        response, mk = self._test_cached_client('configuration')
+        self.assertIsInstance(response, ResilientService)
+        self.assertEqual(response._service, mk().service)
+        self.assertIs(response.retry_policy, self.five9.retry_policy)
+        self.assertEqual(response.rate_limit.rate, 5)
+        self.assertEqual(response.circuit_breaker.threshold, 3)
+
+    def test_configuration_instrumented(self):
+        """It should measure the service when instrumentation is set."""
+        self.five9.instrumentation = Instrumentation()
+        self.five9.retry_policy = RetryPolicy()
+        response, mk = self._test_cached_client('configuration')
+        self.assertIsInstance(response._service, InstrumentedService)
+        self.assertEqual(response._service._service, mk().service)
+
+    def test_configuration_resilient_shared(self):
+        """It should share the limiter and breaker between services."""
+        self.five9.rate_limit = 5
+        self.five9.circuit_breaker = 3
+        configuration, _ = self._test_cached_client('configuration')
+        supervisor, _ = self._test_cached_client('supervisor')
+        self.assertIs(configuration.rate_limit, supervisor.rate_limit)
+        self.assertIs(
+            configuration.circuit_breaker, supervisor.circuit_breaker,
+        )
+
     def test_supervisor_session(self):
         """It should automatically create a supervisor session."""
         response, _ = self._test_cached_client('supervisor')
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import io
+import mock
+import unittest
+
+from collections import OrderedDict
+
+from ..exceptions import ValidationError
+from ..five9 import Five9
+from ..imports import CrmImporter, ImportBatch, ListImporter
+
+
+class TestCrmImporter(unittest.TestCase):
+
+    def setUp(self):
+        super(TestCrmImporter, self).setUp()
+        self.five9 = mock.MagicMock()
+        self.five9.create_mapping = Five9.create_mapping
+        self.api = self.five9.configuration
+        self.api.isImportRunning.return_value = False
+        self.api.getCrmImportResult.return_value = {'success': True}
+        self.contacts = [
+            OrderedDict([('number1', '%010d' % i), ('first_name', None)])
+            for i in range(5)
+        ]
+
+    def _run(self, contacts=None, **kwargs):
+        kwargs.setdefault('batch_size', 2)
+        importer = CrmImporter(self.five9, ['number1'], **kwargs)
+        return importer.run(iter(contacts or self.contacts))
+
+    def test_run_batches(self):
+        """It should submit the contacts in batches."""
+        batches = self._run()
+        self.assertEqual([b.size for b in batches], [2, 2, 1])
+        self.assertEqual(self.api.updateContacts.call_count, 3)
+        self.assertTrue(all(b.success for b in batches))
+
+    def test_run_settings(self):
+        """It should send the field mapping and the import data."""
+        self._run(crmAddMode='ADD_NEW')
+        settings, data = self.api.updateContacts.call_args_list[0][0]
+        self.assertEqual(settings['fieldsMapping'], [
+            {'columnNumber': 1, 'fieldName': 'number1', 'key': True},
+            {'columnNumber': 2, 'fieldName': 'first_name', 'key': False},
+        ])
+        self.assertEqual(settings['crmAddMode'], 'ADD_NEW')
+        self.assertDictEqual(data, {'values': [
+            {'item': ['0000000000', '']}, {'item': ['0000000001', '']},
+        ]})
+
+    def test_run_fields(self):
+        """It should order the values by the given fields."""
+        self._run(fields=['first_name', 'number1'])
+        settings, data = self.api.updateContacts.call_args_list[0][0]
+        self.assertEqual(settings['fieldsMapping'][1]['fieldName'], 'number1')
+        self.assertEqual(data['values'][0]['item'], ['', '0000000000'])
+
+    def test_run_missing_keys(self):
+        """It should raise ValidationError when key fields are missing."""
+        with self.assertRaises(ValidationError):
+            self._run(fields=['first_name'])
+
+    def test_run_polls(self):
+        """It should poll the import until it is no longer running."""
+        self.api.isImportRunning.side_effect = [True, True, False]
+        self._run(self.contacts[:1], wait_time=5)
+        self.api.isImportRunning.assert_called_with(
+            self.api.updateContacts(), 5,
+        )
+        self.assertEqual(self.api.isImportRunning.call_count, 3)
+        self.api.getCrmImportResult.assert_called_once_with(
+            self.api.updateContacts(),
+        )
+
+    def test_run_errors(self):
+        """It should collect errors per batch instead of aborting."""
+        self.api.updateContacts.side_effect = [ValueError(), mock.DEFAULT]
+        batches = self._run(self.contacts[:4])
+        self.assertIsInstance(batches[0].error, ValueError)
+        self.assertFalse(batches[0].success)
+        self.assertTrue(batches[1].success)
+
+    def test_run_empty(self):
+        """It should not import anything without contacts."""
+        self.assertEqual(CrmImporter(self.five9, ['number1']).run([]), [])
+        self.api.updateContacts.assert_not_called()
+
+    def test_operation(self):
+        """It should use the chosen bulk operation."""
+        self._run(operation='asyncUpdateCrmRecords')
+        self.api.asyncUpdateCrmRecords.assert_called()
+        self.api.updateContacts.assert_not_called()
+
+    def test_operation_bad(self):
+        """It should raise ValidationError for unsupported operations."""
+        with self.assertRaises(ValidationError):
+            CrmImporter(self.five9, ['number1'], operation='bad')
+
+    def test_batch_success_failed_result(self):
+        """It should not be successful when Five9 reports a failure."""
+        batch = ImportBatch(0, 1)
+        batch.result = {'success': False}
+        self.assertFalse(batch.success)
+
+    def test_run_batch_bytes(self):
+        """It should close batches when the byte budget is reached."""
+        size = CrmImporter.RECORD_OVERHEAD + 2 * CrmImporter.VALUE_OVERHEAD
+        batches = self._run(batch_size=10, batch_bytes=(size + 10) * 2)
+        self.assertEqual([b.size for b in batches], [2, 2, 1])
+
+    def test_run_batch_bytes_large_record(self):
+        """It should import records above the byte budget on their own."""
+        batches = self._run(batch_size=10, batch_bytes=1)
+        self.assertEqual([b.size for b in batches], [1] * 5)
+
+    def test_run_stats(self):
+        """It should report the rows, rejected rows and throughput."""
+        self.api.getCrmImportResult.side_effect = [
+            {'success': True, 'uploadErrorsCount': 1},
+            {'success': False},
+            {'success': True, 'uploadErrorsCount': 0},
+        ]
+        importer = CrmImporter(self.five9, ['number1'], batch_size=2)
+        self.assertIsNone(importer.rows_per_second)
+        importer.run(self.contacts)
+        self.assertEqual(importer.rows, 5)
+        self.assertEqual(importer.rejected, 3)
+        self.assertGreater(importer.rows_per_second, 0)
+
+    def test_batch_rejected_error(self):
+        """It should reject all records of a batch that failed."""
+        batch = ImportBatch(0, 3)
+        batch.error = ValueError()
+        self.assertEqual(batch.rejected, 3)
+
+    def test_five9_upsert_contacts(self):
+        """It should run a CRM importer."""
+        with mock.patch('five9.five9.CrmImporter') as importer:
+            res = Five9('user', 'pass').upsert_contacts(
+                self.contacts, ['number1'], batch_size=3,
+            )
+        importer().run.assert_called_once_with(self.contacts)
+        self.assertEqual(res, importer().run())
+
+
+class TestListImporter(unittest.TestCase):
+
+    def setUp(self):
+        super(TestListImporter, self).setUp()
+        self.five9 = mock.MagicMock()
+        self.five9.create_mapping = Five9.create_mapping
+        self.api = self.five9.configuration
+        self.api.isImportRunning.return_value = False
+        self.api.getListImportResult.return_value = {'success': True}
+        self.csv = io.StringIO(
+            u'number1,first_name\n7025551234,Test\n7025551235,Other\n',
+        )
+
+    def test_run_csv(self):
+        """It should stream the CSV records into the list."""
+        importer = ListImporter(self.five9, 'Leads', ['number1'])
+        batches = importer.run_csv(self.csv)
+        self.assertEqual([b.size for b in batches], [2])
+        name, settings, data = self.api.asyncAddRecordsToList.call_args[0]
+        self.assertEqual(name, 'Leads')
+        self.assertEqual(settings['fieldsMapping'][1]['fieldName'],
+                         'first_name')
+        self.assertFalse(settings['cleanListBeforeUpdate'])
+        self.assertEqual(data['values'][1]['item'], ['7025551235', 'Other'])
+        self.api.getListImportResult.assert_called_once_with(
+            self.api.asyncAddRecordsToList(),
+        )
+
+    def test_run_pending(self):
+        """It should keep several imports running at the same time."""
+        importer = ListImporter(
+            self.five9, 'Leads', ['number1'], batch_size=1, max_pending=2,
+        )
+        calls = []
+        self.api.asyncAddRecordsToList.side_effect = \
+            lambda *args: calls.append('submit') or len(calls)
+        self.api.getListImportResult.side_effect = \
+            lambda identifier: calls.append('result') or {'success': True}
+        importer.run_csv(self.csv)
+        self.assertEqual(calls, ['submit', 'submit', 'result', 'result'])
+
+    def test_operation(self):
+        """It should use the chosen bulk operation."""
+        ListImporter(
+            self.five9, 'Leads', ['number1'], operation='addToList',
+        ).run_csv(self.csv)
+        self.api.addToList.assert_called()
+        self.api.asyncAddRecordsToList.assert_not_called()
+
+    def test_operation_bad(self):
+        """It should raise ValidationError for unsupported operations."""
+        with self.assertRaises(ValidationError):
+            ListImporter(self.five9, 'Leads', ['number1'], operation='bad')
+
+    def test_five9_load_list(self):
+        """It should run a list importer."""
+        records = [{'number1': '7025551234'}]
+        with mock.patch('five9.five9.ListImporter') as importer:
+            res = Five9('user', 'pass').load_list(
+                'Leads', records, ['number1'], max_pending=2,
+            )
+        importer.assert_called_once_with(
+            mock.ANY, 'Leads', ['number1'], max_pending=2,
+        )
+        importer().run.assert_called_once_with(records)
+        self.assertEqual(res, importer().run())
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import requests
+import threading
+import unittest
+
+from ..five9 import Five9
+from ..instrumentation import Instrumentation, InstrumentedService
+from ..instrumentation import OperationCall, StatsdExporter
+from ..instrumentation import _ThreadLocalVar
+
+
+RESPONSE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/">
+  <env:Body>
+    <ns2:getWebConnectorsResponse
+        xmlns:ns2="http://service.admin.ws.five9.com/">
+      <return><name>Test</name><url>https://example.com</url></return>
+    </ns2:getWebConnectorsResponse>
+  </env:Body>
+</env:Envelope>"""
+
+
+class StubAdapter(requests.adapters.BaseAdapter):
+    """Returns the same SOAP response for every request."""
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers['Content-Type'] = 'text/xml'
+        response.request = request
+        response.url = request.url
+        response._content = RESPONSE
+        return response
+
+    def close(self):
+        pass
+
+
+def get_call(operation='getWebConnectors', latency=0.02, error=None):
+    call = OperationCall(operation)
+    call.started = 0.0
+    call.sent = 0.001
+    call.received = 0.011
+    call.parsed = 0.015
+    call.finished = latency
+    call.request_bytes = 100
+    call.response_bytes = 1000
+    call.error = error
+    return call
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        super(TestInstrumentation, self).setUp()
+        self.instrumentation = Instrumentation(buckets=[0.1, 0.01])
+
+    def test_record_stats(self):
+        """It should aggregate the calls of each operation."""
+        self.instrumentation.record(get_call())
+        self.instrumentation.record(get_call(latency=0.5, error=ValueError()))
+        self.instrumentation.record(get_call('getSkills'))
+        stats = self.instrumentation.stats()
+        self.assertEqual(stats['getSkills']['count'], 1)
+        stats = stats['getWebConnectors']
+        self.assertEqual(stats['count'], 2)
+        self.assertEqual(stats['errors'], 1)
+        self.assertAlmostEqual(stats['latency'], 0.52)
+        self.assertEqual(stats['latency_max'], 0.5)
+        self.assertAlmostEqual(stats['http_time'], 0.02)
+        self.assertAlmostEqual(stats['parse_time'], 0.008)
+        self.assertEqual(stats['response_bytes'], 2000)
+
+    def test_record_histogram(self):
+        """It should count the calls in cumulative latency buckets."""
+        for latency in (0.005, 0.02, 0.5):
+            self.instrumentation.record(get_call(latency=latency))
+        self.assertEqual(
+            self.instrumentation.stats()['getWebConnectors']['histogram'],
+            [(0.01, 1), (0.1, 2), (float('inf'), 3)],
+        )
+
+    def test_record_exporters(self):
+        """It should export the calls, ignoring errors of the exporters."""
+        failing = mock.MagicMock(side_effect=ValueError())
+        exporter = mock.MagicMock()
+        self.instrumentation.add_exporter(failing)
+        self.instrumentation.add_exporter(exporter)
+        call = get_call()
+        self.instrumentation.record(call)
+        exporter.assert_called_once_with(call)
+
+    def test_summary(self):
+        """It should report the slowest operations first."""
+        self.instrumentation.record(get_call('getSkills', latency=0.1))
+        self.instrumentation.record(get_call(latency=0.5))
+        lines = self.instrumentation.summary().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith('getWebConnectors'))
+        self.assertTrue(lines[2].startswith('getSkills'))
+
+    def test_reset(self):
+        """It should remove the measurements."""
+        self.instrumentation.record(get_call())
+        self.instrumentation.reset()
+        self.assertEqual(self.instrumentation.stats(), {})
+
+
+class TestThreadLocalVar(unittest.TestCase):
+
+    def test_set_reset(self):
+        """It should restore the previous value with the token."""
+        var = _ThreadLocalVar('test')
+        token = var.set(1)
+        self.assertEqual(var.get(), 1)
+        var.reset(token)
+        self.assertIsNone(var.get())
+
+    def test_threads(self):
+        """It should hold a separate value in each thread."""
+        var = _ThreadLocalVar('test')
+        var.set(1)
+        values = []
+        thread = threading.Thread(target=lambda: values.append(var.get()))
+        thread.start()
+        thread.join()
+        self.assertEqual(values, [None])
+        self.assertEqual(var.get(), 1)
+
+
+class TestStatsdExporter(unittest.TestCase):
+
+    def test_call(self):
+        """It should send the timings and counters to the client."""
+        client = mock.MagicMock()
+        StatsdExporter(client, 'test')(get_call(error=ValueError()))
+        client.timing.assert_any_call('test.getWebConnectors.latency', 20)
+        client.incr.assert_any_call(
+            'test.getWebConnectors.response_bytes', 1000,
+        )
+        client.incr.assert_any_call('test.getWebConnectors.errors', 1)
+
+
+class TestInstrumentedService(unittest.TestCase):
+
+    def setUp(self):
+        super(TestInstrumentedService, self).setUp()
+        self.instrumentation = Instrumentation()
+        self.service = mock.MagicMock()
+        self.proxy = InstrumentedService(self.service, self.instrumentation)
+
+    def test_call(self):
+        """It should return the result, and record the call."""
+        res = self.proxy.getSkills('Test')
+        self.service.getSkills.assert_called_once_with('Test')
+        self.assertEqual(res, self.service.getSkills())
+        self.assertEqual(self.instrumentation.stats()['getSkills']['count'], 1)
+
+    def test_call_error(self):
+        """It should record and raise errors."""
+        self.service.getSkills.side_effect = ValueError()
+        with self.assertRaises(ValueError):
+            self.proxy.getSkills()
+        self.assertEqual(
+            self.instrumentation.stats()['getSkills']['errors'], 1,
+        )
+
+    def test_call_soap(self):
+        """It should measure the phases and bytes of a SOAP call."""
+        five9 = Five9('user@example.com', 'password')
+        five9.wsdl_bundled = True
+        five9.wsdl_cache_enabled = False
+        five9.client_pool = None
+        five9.instrumentation = self.instrumentation
+        client = five9._get_client('configuration')
+        client.transport.session.mount('https://', StubAdapter())
+        res = five9.configuration.getWebConnectors('Test')
+        self.assertEqual(res[0].name, 'Test')
+        stats = self.instrumentation.stats()['getWebConnectors']
+        self.assertEqual(stats['response_bytes'], len(RESPONSE))
+        self.assertGreater(stats['request_bytes'], 0)
+        for phase in ('serialize', 'http', 'parse', 'deserialize'):
+            self.assertGreater(stats['%s_time' % phase], 0)
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import unittest
+
+from ..model_cache import ModelCache, ModelCatalog
+
+
+class TestModelCache(unittest.TestCase):
+
+    def setUp(self):
+        super(TestModelCache, self).setUp()
+        self.cache = ModelCache(ttl=10, size=2)
+
+    def test_get_miss(self):
+        """It should return the default on a miss."""
+        self.assertEqual(self.cache.get('a', 'default'), 'default')
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_get_hit(self):
+        """It should return the cached value on a hit."""
+        self.cache.set('a', [1])
+        self.assertEqual(self.cache.get('a'), [1])
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_get_expired(self):
+        """It should not return values older than the TTL."""
+        with mock.patch('five9.model_cache.time') as time:
+            time.time.return_value = 100
+            self.cache.set('a', [1])
+            time.time.return_value = 111
+            self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.evictions, 1)
+        self.assertNotIn('a', self.cache)
+
+    def test_set_evicts_lru(self):
+        """It should evict the least recently used value when full."""
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+        self.assertEqual(list(self.cache._entries), ['a', 'c'])
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_set_stale_generation(self):
+        """It should not cache values fetched before an invalidation."""
+        generation = self.cache.generation
+        self.cache.invalidate()
+        self.cache.set('a', 1, generation)
+        self.assertNotIn('a', self.cache)
+
+    def test_invalidate(self):
+        """It should remove the values and keep the counters."""
+        self.cache.set('a', 1)
+        self.cache.get('a')
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.invalidations, 1)
+
+    def test_stats(self):
+        """It should return the usage counters."""
+        self.cache.set('a', 1)
+        self.cache.get('a')
+        self.cache.get('b')
+        self.assertDictEqual(self.cache.stats(), {
+            'hits': 1,
+            'misses': 1,
+            'evictions': 0,
+            'invalidations': 0,
+            'size': 1,
+        })
+
+    def test_clear(self):
+        """It should remove the values and reset the counters."""
+        self.cache.set('a', 1)
+        self.cache.get('a')
+        self.cache.clear()
+        self.assertEqual(self.cache.stats()['hits'], 0)
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestModelCatalog(unittest.TestCase):
+
+    def setUp(self):
+        super(TestModelCatalog, self).setUp()
+        self.catalog = ModelCatalog(refresh_interval=10)
+        self.records = [{'name': n} for n in ['A', 'B', 'Ab', 'C.d']]
+        self.index = self.catalog.load('user', self.records, 'name')
+
+    def _search(self, names):
+        return [
+            r['name'] for r in ModelCatalog.search(self.index, names)
+        ]
+
+    def test_get(self):
+        """It should return the index of the loaded records."""
+        self.assertIs(self.catalog.get('user'), self.index)
+        self.assertIsNone(self.catalog.get('other'))
+
+    def test_get_stale(self):
+        """It should not return indexes older than the refresh interval."""
+        with mock.patch('five9.model_cache.time') as time:
+            time.time.return_value = 100
+            self.catalog.load('user', self.records, 'name')
+            time.time.return_value = 111
+            self.assertIsNone(self.catalog.get('user'))
+
+    def test_load_stale_generation(self):
+        """It should not store records fetched before an invalidation."""
+        generation = self.catalog.generation
+        self.catalog.invalidate()
+        self.catalog.load('user', self.records, 'name', generation)
+        self.assertIsNone(self.catalog.get('user'))
+
+    def test_search_all(self):
+        """It should return all records for empty filters."""
+        self.assertEqual(self._search(None), ['A', 'B', 'Ab', 'C.d'])
+
+    def test_search_name(self):
+        """It should look up a plain name."""
+        self.assertEqual(self._search('Ab'), ['Ab'])
+        self.assertEqual(self._search('Z'), [])
+
+    def test_search_names(self):
+        """It should look up each of the names once, in order."""
+        self.assertEqual(self._search(['B', 'Z', 'A', 'B']), ['B', 'A'])
+
+    def test_search_regex(self):
+        """It should match regular expressions against the whole name."""
+        self.assertEqual(self._search('A.*'), ['A', 'Ab'])
+        self.assertEqual(self._search('(A|B)'), ['A', 'B'])
+
+    def test_search_regex_names(self):
+        """It should match a list with patterns as alternatives."""
+        self.assertEqual(self._search(['A.*', 'C']), ['A', 'Ab'])
+        self.assertEqual(self._search(['B', r'C\.d']), ['B', 'C.d'])
+
+    def test_stats(self):
+        """It should return the usage counters."""
+        self.catalog.get('user')
+        self.assertDictEqual(self.catalog.stats(), {
+            'hits': 1, 'fetches': 1, 'size': 4,
+        })
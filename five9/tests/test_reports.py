@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import requests
+import unittest
+
+from six import BytesIO, StringIO
+
+from ..client_pool import ClientPool
+from ..exceptions import Five9Exception
+from ..five9 import Five9
+from ..instrumentation import Instrumentation
+from ..models.base_model import BaseModel
+from ..reports import Report, ReportRunner
+from ..resilience import RetryPolicy
+
+
+CSV_RESPONSE = (
+    b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+    b'<soap:Body><ns2:getReportResultCsvResponse '
+    b'xmlns:ns2="http://service.admin.ws.five9.com/"><return>'
+    b'NAME,CALLS\n"Doe, Jane",12\nSmith &amp; Co,3\n'
+    b'</return></ns2:getReportResultCsvResponse></soap:Body></soap:Envelope>'
+)
+
+
+class _StreamAdapter(requests.adapters.BaseAdapter):
+    """Transport adapter answering with a streamed CSV response."""
+
+    def __init__(self):
+        super(_StreamAdapter, self).__init__()
+        self.raw = BytesIO(CSV_RESPONSE)
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers['Content-Length'] = str(len(CSV_RESPONSE))
+        response.raw = self.raw
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+class TestReportRunner(unittest.TestCase):
+
+    def setUp(self):
+        super(TestReportRunner, self).setUp()
+        self.five9 = mock.MagicMock()
+        self.api = self.five9.configuration
+        self.api.runReport.side_effect = lambda f, n, c: 'id-%s' % n
+        self.runner = ReportRunner(
+            self.five9, initial_delay=0, max_delay=0,
+        )
+
+    def test_start(self):
+        """It should run the report and mark it as running."""
+        report = self.runner.start('Folder', 'Name', {'time': {}})
+        self.api.runReport.assert_called_once_with(
+            'Folder', 'Name', {'time': {}},
+        )
+        self.assertEqual(report.identifier, 'id-Name')
+        self.assertTrue(report.running)
+
+    def test_start_many(self):
+        """It should start all reports, collecting errors."""
+        self.api.runReport.side_effect = lambda f, n, c: 1 / int(n)
+        reports = self.runner.start_many([('F', '1', {}), ('F', '0', {})])
+        self.assertEqual(reports[0].identifier, 1)
+        self.assertIsInstance(reports[1].error, ZeroDivisionError)
+        self.assertFalse(reports[1].running)
+
+    def test_as_completed(self):
+        """It should yield the reports in the order that they finish."""
+        running = {'id-A': [True, True, False], 'id-B': [False]}
+        self.api.isReportRunning.side_effect = lambda i, t: running[i].pop(0)
+        reports = self.runner.start_many([('F', 'A', {}), ('F', 'B', {})])
+        done = list(self.runner.as_completed(reports))
+        self.assertEqual([r.report_name for r in done], ['B', 'A'])
+        self.assertEqual(done[1].polls, 3)
+        self.api.isReportRunning.assert_called_with('id-A', 0)
+
+    def test_as_completed_backoff(self):
+        """It should increase the delay between polls up to the maximum."""
+        self.runner.initial_delay = 1
+        self.runner.max_delay = 2
+        self.api.isReportRunning.side_effect = [True, True, True, False]
+        report = self.runner.start('F', 'A', {})
+        with mock.patch('five9.reports.time.sleep') as sleep:
+            list(self.runner.as_completed([report]))
+        delays = [round(c[0][0], 1) for c in sleep.call_args_list]
+        self.assertEqual(delays, [1, 1.5, 2, 2])
+
+    def test_as_completed_poll_error(self):
+        """It should yield the report with the error if polling fails."""
+        self.api.isReportRunning.side_effect = ValueError()
+        report, = self.runner.as_completed([self.runner.start('F', 'A', {})])
+        self.assertIsInstance(report.error, ValueError)
+
+    def test_as_completed_timeout(self):
+        """It should give up on reports running for too long."""
+        self.runner.timeout = -1
+        self.api.isReportRunning.return_value = True
+        report, = self.runner.as_completed([self.runner.start('F', 'A', {})])
+        self.assertIsInstance(report.error, Five9Exception)
+
+    def test_run_error(self):
+        """It should raise the error of the report instead of its result."""
+        self.api.isReportRunning.side_effect = ValueError()
+        with self.assertRaises(ValueError):
+            self.runner.run('F', 'A', {})
+        self.api.getReportResult.assert_not_called()
+
+    def test_run(self):
+        """It should wait for the report and return the parsed result."""
+        self.api.isReportRunning.return_value = False
+        self.api.getReportResult.return_value = {
+            'header': {'values': {'data': ['NAME']}},
+            'records': [{'values': {'data': ['Test']}}],
+        }
+        self.five9.parse_response = Five9.parse_response
+        self.assertEqual(self.runner.run('F', 'A', {}), [{'NAME': 'Test'}])
+        self.api.getReportResult.assert_called_once_with('id-A')
+
+
+class TestReportRunnerCsv(unittest.TestCase):
+
+    def setUp(self):
+        super(TestReportRunnerCsv, self).setUp()
+        self.five9 = Five9('user', 'password')
+        self.five9.client_pool = ClientPool()
+        self.five9.wsdl_cache_enabled = False
+        self.five9.wsdl_bundled = True
+        self.client = self.five9._get_client('configuration')
+        self.report = Report('F', 'A', {})
+        self.report.identifier = 'id-A'
+        self.response = mock.MagicMock(status_code=200)
+        self.response.iter_content.return_value = [
+            CSV_RESPONSE[i:i + 7] for i in range(0, len(CSV_RESPONSE), 7)
+        ]
+
+    def _patch_post(self):
+        return mock.patch.object(
+            self.client.transport.session, 'post',
+            return_value=self.response,
+        )
+
+    def test_iter_csv_request(self):
+        """It should stream the SOAP request for the CSV result."""
+        with self._patch_post() as post:
+            list(self.five9.reports.iter_csv(self.report))
+        args, kwargs = post.call_args
+        self.assertEqual(
+            args[0], 'https://api.five9.com/wsadmin/v9_5/AdminWebService',
+        )
+        self.assertIn(b'<identifier>id-A</identifier>', kwargs['data'])
+        self.assertTrue(kwargs['stream'])
+        self.response.close.assert_called_once_with()
+
+    def test_iter_csv_resilient(self):
+        """It should retry and measure the request like other operations."""
+        self.five9.retry_policy = RetryPolicy(backoff=0)
+        self.five9.instrumentation = Instrumentation()
+        with mock.patch.object(
+            self.client.transport.session, 'post',
+            side_effect=[requests.ConnectionError(), self.response],
+        ) as post:
+            text = ''.join(self.five9.reports.iter_csv(self.report))
+        self.assertEqual(post.call_count, 2)
+        self.assertTrue(text.startswith('NAME,CALLS'))
+        stats = self.five9.instrumentation.stats()['getReportResultCsv']
+        self.assertEqual((stats['count'], stats['errors']), (2, 1))
+
+    def test_iter_csv_async(self):
+        """It should raise Five9Exception for async clients."""
+        with mock.patch.object(BaseModel, '_is_async', return_value=True):
+            with self.assertRaises(Five9Exception):
+                self.five9.reports.iter_csv(self.report)
+
+    def test_iter_csv_instrumented_stream(self):
+        """It should not read the whole response to measure it."""
+        self.five9.instrumentation = Instrumentation()
+        adapter = _StreamAdapter()
+        self.client.transport.session.mount('https://', adapter)
+        chunks = self.five9.reports.iter_csv(self.report, chunk_size=16)
+        self.assertTrue(next(chunks).startswith('NAME,CALLS'))
+        self.assertLess(adapter.raw.tell(), len(CSV_RESPONSE))
+        list(chunks)
+        stats = self.five9.instrumentation.stats()['getReportResultCsv']
+        self.assertEqual(stats['response_bytes'], len(CSV_RESPONSE))
+
+    def test_iter_csv_rows(self):
+        """It should parse the streamed CSV into rows."""
+        with self._patch_post():
+            rows = list(self.five9.reports.iter_csv_rows(self.report))
+        self.assertEqual(rows, [
+            ['NAME', 'CALLS'], ['Doe, Jane', '12'], ['Smith & Co', '3'],
+        ])
+
+    def test_write_csv(self):
+        """It should write the streamed CSV into the file."""
+        fh = StringIO()
+        with self._patch_post():
+            self.five9.reports.write_csv(self.report, fh)
+        self.assertEqual(
+            fh.getvalue(), 'NAME,CALLS\n"Doe, Jane",12\nSmith & Co,3\n',
+        )
+
+    def test_iter_csv_fault(self):
+        """It should let zeep process unsuccessful responses."""
+        self.response.status_code = 500
+        with self._patch_post():
+            with mock.patch.object(
+                type(self.client.service._binding), 'process_reply',
+                side_effect=Five9Exception(),
+            ):
+                with self.assertRaises(Five9Exception):
+                    list(self.five9.reports.iter_csv(self.report))
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import requests
+import unittest
+
+from zeep.exceptions import Fault, TransportError
+
+from ..concurrency import RateLimiter
+from ..exceptions import CircuitOpenError
+from ..resilience import CircuitBreaker, ResilientService, RetryPolicy
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        super(TestRetryPolicy, self).setUp()
+        self.policy = RetryPolicy(retries=2, backoff=1, max_backoff=3)
+
+    def test_get_delay_backoff(self):
+        """It should double the delay up to the maximum without jitter."""
+        self.policy.jitter = False
+        self.assertEqual(
+            [self.policy.get_delay(i) for i in range(4)], [1, 2, 3, 3],
+        )
+
+    def test_get_delay_jitter(self):
+        """It should wait a random time of up to the backoff."""
+        for _ in range(20):
+            self.assertTrue(0 <= self.policy.get_delay(1) <= 2)
+
+    def test_should_retry_transient_idempotent(self):
+        """It should retry transient failures of idempotent operations."""
+        for error in (TransportError(status_code=503), requests.Timeout()):
+            self.assertTrue(
+                self.policy.should_retry('getWebConnectors', error, 0),
+            )
+
+    def test_should_retry_transient_not_idempotent(self):
+        """It should not retry transient failures of other operations."""
+        self.assertFalse(self.policy.should_retry(
+            'createWebConnector', TransportError(status_code=503), 0,
+        ))
+
+    def test_should_retry_throttled(self):
+        """It should retry throttled calls of any operation."""
+        self.assertTrue(self.policy.should_retry(
+            'createWebConnector', TransportError(status_code=429), 0,
+        ))
+
+    def test_should_retry_fault(self):
+        """It should not retry SOAP faults."""
+        self.assertFalse(
+            self.policy.should_retry('getWebConnectors', Fault('Bad'), 0),
+        )
+
+    def test_should_retry_exhausted(self):
+        """It should not retry more than the amount of retries."""
+        self.assertFalse(self.policy.should_retry(
+            'getWebConnectors', requests.Timeout(), 2,
+        ))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        super(TestCircuitBreaker, self).setUp()
+        self.breaker = CircuitBreaker(threshold=2, reset_timeout=10)
+
+    def _open(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+    def test_opens_after_threshold(self):
+        """It should reject calls after the threshold of failures."""
+        self.breaker.record_failure()
+        self.breaker.before_call()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_success_resets(self):
+        """It should reset the failures after a success."""
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_single_trial(self):
+        """It should allow a single trial call after the timeout."""
+        self._open()
+        self.breaker.reset_timeout = 0
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_half_open_failure_reopens(self):
+        """It should open again if the trial call fails."""
+        self._open()
+        self.breaker.reset_timeout = 0
+        self.breaker.before_call()
+        self.breaker.reset_timeout = 10
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_half_open_success_closes(self):
+        """It should close if the trial call succeeds."""
+        self._open()
+        self.breaker.reset_timeout = 0
+        self.breaker.before_call()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+
+class TestResilientService(unittest.TestCase):
+
+    def setUp(self):
+        super(TestResilientService, self).setUp()
+        self.service = mock.MagicMock()
+        self.policy = RetryPolicy(retries=2, jitter=False)
+        self.proxy = ResilientService(self.service, self.policy)
+        patcher = mock.patch('five9.resilience.time.sleep')
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_call_passes_through(self):
+        """It should call the operation and return its result."""
+        res = self.proxy.getWebConnectors('Test', a=1)
+        self.service.getWebConnectors.assert_called_once_with('Test', a=1)
+        self.assertEqual(res, self.service.getWebConnectors())
+
+    def test_call_retries(self):
+        """It should retry transient failures with backoff."""
+        self.service.getWebConnectors.side_effect = [
+            requests.Timeout(), TransportError(status_code=502), 'result',
+        ]
+        self.assertEqual(self.proxy.getWebConnectors(), 'result')
+        self.assertEqual(
+            self.sleep.call_args_list, [mock.call(0.5), mock.call(1.0)],
+        )
+
+    def test_call_retries_exhausted(self):
+        """It should raise the error when the retries are exhausted."""
+        self.service.getWebConnectors.side_effect = requests.Timeout()
+        with self.assertRaises(requests.Timeout):
+            self.proxy.getWebConnectors()
+        self.assertEqual(self.service.getWebConnectors.call_count, 3)
+
+    def test_call_not_idempotent(self):
+        """It should not retry transient failures of other operations."""
+        self.service.deleteWebConnector.side_effect = requests.Timeout()
+        with self.assertRaises(requests.Timeout):
+            self.proxy.deleteWebConnector('Test')
+        self.service.deleteWebConnector.assert_called_once_with('Test')
+
+    def test_call_rate_limit(self):
+        """It should wait for the rate limit before each call."""
+        self.proxy.rate_limit = RateLimiter(10, burst=1)
+        self.proxy.getWebConnectors()
+        self.sleep.assert_not_called()
+        self.proxy.getWebConnectors()
+        self.assertGreater(self.sleep.call_args[0][0], 0)
+
+    def test_call_circuit_breaker(self):
+        """It should stop calling the remote when the circuit opens."""
+        self.proxy.circuit_breaker = CircuitBreaker(threshold=2)
+        self.service.getWebConnectors.side_effect = requests.Timeout()
+        with self.assertRaises(CircuitOpenError):
+            self.proxy.getWebConnectors()
+        self.assertEqual(self.service.getWebConnectors.call_count, 2)
+
+    def test_call_fault_closes_circuit(self):
+        """It should not count SOAP faults as failures of the remote."""
+        breaker = self.proxy.circuit_breaker = CircuitBreaker(threshold=1)
+        self.service.createWebConnector.side_effect = Fault('Bad')
+        with self.assertRaises(Fault):
+            self.proxy.createWebConnector()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_call_throttled_trial(self):
+        """It should allow a new trial call after a throttled trial."""
+        breaker = self.proxy.circuit_breaker = CircuitBreaker(threshold=1)
+        self.proxy._policy = RetryPolicy(retries=0)
+        self.service.getWebConnectors.side_effect = [
+            TransportError(status_code=503), TransportError(status_code=429),
+            'result',
+        ]
+        with self.assertRaises(TransportError):
+            self.proxy.getWebConnectors()
+        breaker.reset_timeout = 0
+        with self.assertRaises(TransportError):
+            self.proxy.getWebConnectors()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertEqual(self.proxy.getWebConnectors(), 'result')
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_call_interrupted_trial(self):
+        """It should allow a new trial call after an interrupted trial."""
+        breaker = self.proxy.circuit_breaker = CircuitBreaker(threshold=1)
+        breaker.record_failure()
+        breaker.reset_timeout = 0
+        self.service.getWebConnectors.side_effect = [
+            KeyboardInterrupt(), 'result',
+        ]
+        with self.assertRaises(KeyboardInterrupt):
+            self.proxy.getWebConnectors()
+        self.assertEqual(self.proxy.getWebConnectors(), 'result')
+
+    def test_getattr_not_callable(self):
+        """It should return attributes that are not operations."""
+        self.service._binding = 'binding'
+        self.assertEqual(self.proxy._binding, 'binding')
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import threading
+import unittest
+
+from zeep.exceptions import Fault
+
+from ..five9 import Five9
+from ..statistics import (StatisticsEvent,
+                          StatisticsFeed,
+                          StatisticsTable,
+                          TypedStatisticsTable,
+                          )
+
+
+def _row(*values):
+    return {'values': {'data': list(values)}}
+
+
+class TestStatisticsTable(unittest.TestCase):
+
+    def setUp(self):
+        super(TestStatisticsTable, self).setUp()
+        self.table = StatisticsTable(['Username', 'State'])
+        self.table.load([['a', 'Ready'], ['b', 'Not Ready']])
+
+    def test_get(self):
+        """It should return the row as a dict."""
+        self.assertDictEqual(
+            self.table.get('a'), {'Username': 'a', 'State': 'Ready'},
+        )
+
+    def test_get_missing(self):
+        """It should return the default for missing objects."""
+        self.assertIsNone(self.table.get('c'))
+
+    def test_key_column(self):
+        """It should index the rows by the key column."""
+        table = StatisticsTable(['State', 'Username'], 'Username')
+        table.load([['Ready', 'a']])
+        self.assertIn('a', table)
+
+    def test_update(self):
+        """It should set the value and return the previous one."""
+        self.assertEqual(self.table.update('a', 'State', 'Busy'), 'Ready')
+        self.assertEqual(self.table.get_value('a', 'State'), 'Busy')
+
+    def test_update_adds(self):
+        """It should add rows for new objects."""
+        self.assertIsNone(self.table.update('c', 'State', 'Ready'))
+        self.assertDictEqual(
+            self.table.get('c'), {'Username': 'c', 'State': 'Ready'},
+        )
+
+    def test_delete(self):
+        """It should remove the row."""
+        self.assertTrue(self.table.delete('a'))
+        self.assertFalse(self.table.delete('a'))
+        self.assertEqual(list(self.table), ['b'])
+
+
+class TestTypedStatisticsTable(unittest.TestCase):
+
+    def setUp(self):
+        super(TestTypedStatisticsTable, self).setUp()
+        self.table = TypedStatisticsTable(['Username', 'Calls'])
+        self.table.load([['1', '2'], ['3', '']])
+
+    def test_load_infers(self):
+        """It should infer the column types, keeping the key a string."""
+        self.assertEqual(self.table.row_class.types, ('str', 'int'))
+        self.assertEqual(tuple(self.table.get_row('1')), ('1', 2))
+
+    def test_get(self):
+        """It should return the typed row as a dict."""
+        self.assertDictEqual(self.table.get('3'), {
+            'Username': '3', 'Calls': None,
+        })
+
+    def test_update(self):
+        """It should convert the value and return the previous one."""
+        self.assertEqual(self.table.update('1', 'Calls', '5'), 2)
+        self.assertEqual(self.table.get_value('1', 'Calls'), 5)
+
+    def test_update_adds(self):
+        """It should add typed rows for new objects."""
+        self.assertIsNone(self.table.update('4', 'Calls', '1'))
+        self.assertEqual(tuple(self.table.get_row('4')), ('4', 1))
+
+    def test_update_not_inferred_type(self):
+        """It should store inferred columns as strings if a value is not
+        of their type."""
+        self.assertEqual(self.table.update('1', 'Calls', 'N/A'), '2')
+        self.assertEqual(self.table.get_value('1', 'Calls'), 'N/A')
+        self.assertIsNone(self.table.get_value('3', 'Calls'))
+        self.assertEqual(self.table.row_class.types, ('str', 'str'))
+        self.table.update('3', 'Calls', '4')
+        self.assertEqual(self.table.get_value('3', 'Calls'), '4')
+
+    def test_update_explicit_type(self):
+        """It should raise for values that are not of an explicit type."""
+        table = TypedStatisticsTable(['Username', 'Calls'], None, {
+            'Calls': 'int',
+        })
+        table.load([['1', '2']])
+        with self.assertRaises(ValueError):
+            table.update('1', 'Calls', 'N/A')
+
+    def test_column_types(self):
+        """It should use the explicit column types."""
+        table = TypedStatisticsTable(['Username', 'Calls'], None, {
+            'Calls': 'float',
+        })
+        table.load([['1', '2']])
+        self.assertEqual(table.get_value('1', 'Calls'), 2.0)
+
+
+class TestStatisticsFeed(unittest.TestCase):
+
+    def setUp(self):
+        super(TestStatisticsFeed, self).setUp()
+        self.five9 = mock.MagicMock()
+        self.api = self.five9.supervisor
+        self.api.getStatistics.return_value = {
+            'columns': _row('Username', 'State'),
+            'rows': [_row('a', 'Ready'), _row('b', 'Ready')],
+            'timestamp': 100,
+        }
+        self.feed = StatisticsFeed(
+            self.five9, 'AgentState', long_polling_timeout=5,
+        )
+        self.events = []
+        self.feed.subscribe(self.events.append)
+
+    def _update(self, added=None, data=None, deleted=None, timestamp=200):
+        return {
+            'addedObjects': _row(*added) if added else None,
+            'dataUpdate': [
+                {'objectName': o, 'columnName': c, 'columnValue': v}
+                for o, c, v in data or []
+            ],
+            'deletedObjects': _row(*deleted) if deleted else None,
+            'lastTimestamp': timestamp,
+        }
+
+    def test_poll_snapshot(self):
+        """It should take a snapshot on the first poll."""
+        self.assertEqual(self.feed.poll(), [])
+        self.api.getStatistics.assert_called_once_with('AgentState', None)
+        self.assertEqual(len(self.feed.table), 2)
+        self.assertEqual(self.feed.timestamp, 100)
+
+    def test_snapshot_columns(self):
+        """It should only request the given columns."""
+        self.feed.columns = ['Username']
+        self.feed.snapshot()
+        self.api.getStatistics.assert_called_once_with(
+            'AgentState', _row('Username'),
+        )
+
+    def test_poll_update(self):
+        """It should apply the changes and notify the subscribers."""
+        self.feed.poll()
+        self.api.getStatisticsUpdate.return_value = self._update(
+            added=['c'],
+            data=[('a', 'State', 'Busy'), ('b', 'State', 'Ready'),
+                  ('c', 'State', 'Ready')],
+            deleted=['b'],
+        )
+        events = self.feed.poll()
+        self.api.getStatisticsUpdate.assert_called_once_with(
+            'AgentState', 100, 5,
+        )
+        self.assertEqual(
+            [(e.kind, e.key, e.changes) for e in events], [
+                (StatisticsEvent.ADDED, 'c', {}),
+                (StatisticsEvent.UPDATED, 'a', {'State': ('Ready', 'Busy')}),
+                (StatisticsEvent.UPDATED, 'c', {'State': (None, 'Ready')}),
+                (StatisticsEvent.DELETED, 'b', {}),
+            ],
+        )
+        self.assertEqual(self.events, events)
+        self.assertEqual(sorted(self.feed.table), ['a', 'c'])
+        self.assertEqual(self.feed.timestamp, 200)
+
+    def test_poll_update_typed(self):
+        """It should report typed changes for typed feeds."""
+        self.feed.column_types = {'Calls': 'int'}
+        self.feed.typed = True
+        self.api.getStatistics.return_value = {
+            'columns': _row('Username', 'Calls'),
+            'rows': [_row('a', '1')],
+            'timestamp': 100,
+        }
+        self.feed.poll()
+        self.api.getStatisticsUpdate.return_value = self._update(
+            data=[('a', 'Calls', '2')],
+        )
+        event, = self.feed.poll()
+        self.assertEqual(event.changes, {'Calls': (1, 2)})
+        self.assertIsInstance(self.feed.table, TypedStatisticsTable)
+
+    def test_poll_no_update(self):
+        """It should not change anything when there is no update."""
+        self.feed.poll()
+        self.api.getStatisticsUpdate.return_value = None
+        self.assertEqual(self.feed.poll(), [])
+        self.assertEqual(self.feed.timestamp, 100)
+
+    def test_poll_fault_snapshot(self):
+        """It should take a new snapshot when the update is rejected."""
+        self.feed.poll()
+        self.api.getStatisticsUpdate.side_effect = Fault('expired')
+        self.feed.poll()
+        self.assertEqual(self.api.getStatistics.call_count, 2)
+
+    def test_poll_fault_events(self):
+        """It should report the changes of the new snapshot."""
+        self.feed.poll()
+        self.api.getStatisticsUpdate.side_effect = Fault('expired')
+        self.api.getStatistics.return_value = {
+            'columns': _row('Username', 'State'),
+            'rows': [_row('a', 'Busy'), _row('c', 'Ready')],
+            'timestamp': 300,
+        }
+        events = self.feed.poll()
+        self.assertEqual(
+            [(e.kind, e.key, e.changes) for e in events], [
+                (StatisticsEvent.ADDED, 'c', {}),
+                (StatisticsEvent.UPDATED, 'a', {'State': ('Ready', 'Busy')}),
+                (StatisticsEvent.UPDATED, 'c', {'State': (None, 'Ready')}),
+                (StatisticsEvent.DELETED, 'b', {}),
+            ],
+        )
+        self.assertEqual(self.events, events)
+        self.assertEqual(self.feed.timestamp, 300)
+
+    def test_unsubscribe(self):
+        """It should stop notifying the callback."""
+        self.feed.unsubscribe(self.events.append)
+        self.feed.poll()
+        self.api.getStatisticsUpdate.return_value = self._update(added=['c'])
+        self.feed.poll()
+        self.assertEqual(self.events, [])
+
+    def test_start_stop(self):
+        """It should poll in a background thread until stopped."""
+        polled = threading.Event()
+
+        def _update(*args):
+            polled.set()
+            return None
+
+        self.api.getStatisticsUpdate.side_effect = _update
+        self.feed.start()
+        self.assertTrue(polled.wait(5))
+        self.feed.stop(5)
+        self.assertIsNone(self.feed._thread)
+
+    def test_run_errors(self):
+        """It should report errors and keep polling after a delay."""
+        errors = []
+        error = ValueError('bad value')
+        self.feed.on_error = errors.append
+        self.feed.retry_policy = mock.MagicMock()
+        self.feed.retry_policy.get_delay.return_value = 0
+        self.feed.poll()
+
+        def _update(*args):
+            if self.api.getStatisticsUpdate.call_count < 3:
+                raise error
+            self.feed._stop.set()
+
+        self.api.getStatisticsUpdate.side_effect = _update
+        self.feed.run()
+        self.assertEqual(errors, [error, error])
+        self.assertIs(self.feed.error, error)
+        self.assertEqual(
+            self.feed.retry_policy.get_delay.call_args_list,
+            [mock.call(0), mock.call(1)],
+        )
+
+    def test_five9_statistics_feed(self):
+        """It should return a feed for the statistic type."""
+        feed = Five9('user', 'password').statistics_feed(
+            'ACDStatus', key_column='Skill Name',
+        )
+        self.assertIsInstance(feed, StatisticsFeed)
+        self.assertEqual(feed.key_column, 'Skill Name')
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import unittest
+
+from datetime import datetime, timedelta
+
+from ..exceptions import ValidationError
+from ..statistics_models import (get_row_class,
+                                 infer_column_types,
+                                 parse_statistics,
+                                 )
+
+
+def _row(*values):
+    return {'values': {'data': list(values)}}
+
+
+class TestStatisticsModels(unittest.TestCase):
+
+    def setUp(self):
+        super(TestStatisticsModels, self).setUp()
+        self.columns = ['Username', 'State Duration', 'Calls', 'Since']
+        self.types = {
+            'State Duration': 'duration',
+            'Calls': 'int',
+            'Since': 'timestamp',
+        }
+        self.row_class = get_row_class(self.columns, self.types)
+
+    def test_get_row_class_cached(self):
+        """It should only create the class once per columns and types."""
+        self.assertIs(get_row_class(self.columns, self.types), self.row_class)
+        self.assertIsNot(get_row_class(self.columns), self.row_class)
+
+    def test_get_row_class_invalid_type(self):
+        """It should raise for unknown column types."""
+        with self.assertRaises(ValidationError):
+            get_row_class(['Username'], {'Username': 'money'})
+
+    def test_row_no_dict(self):
+        """It should not allocate a dictionary per row."""
+        row, = self.row_class.convert([['a', '1000', '2', '0']])
+        self.assertFalse(hasattr(row, '__dict__'))
+
+    def test_convert(self):
+        """It should convert the values to native types."""
+        row, = self.row_class.convert([['a', '61000', '2', '86400000']])
+        self.assertEqual(row, (
+            'a', timedelta(seconds=61), 2, datetime(1970, 1, 2),
+        ))
+
+    def test_convert_missing(self):
+        """It should convert empty values to None."""
+        row, = self.row_class.convert([['a', '', None, '']])
+        self.assertEqual(row, ('a', None, None, None))
+
+    def test_convert_duration_clock(self):
+        """It should convert durations formatted as a clock."""
+        row, = self.row_class.convert([['a', '1:02:03', '0', '0']])
+        self.assertEqual(row.state_duration, timedelta(seconds=3723))
+
+    def test_convert_empty(self):
+        """It should return no rows for no values."""
+        self.assertEqual(self.row_class.convert([]), [])
+
+    def test_access(self):
+        """It should access values by attribute, index or column."""
+        row, = self.row_class.convert([['a', '0', '2', '0']])
+        self.assertEqual(row.calls, 2)
+        self.assertEqual(row[2], 2)
+        self.assertEqual(row['Calls'], 2)
+
+    def test_as_dict(self):
+        """It should return the values keyed by column name."""
+        row, = self.row_class.convert([['a', '0', '2', '0']])
+        self.assertEqual(row.as_dict()['Calls'], 2)
+
+    def test_replace(self):
+        """It should return a new row with the converted value."""
+        row, = self.row_class.convert([['a', '0', '2', '0']])
+        new = row.replace('Calls', '3')
+        self.assertEqual((row.calls, new.calls), (2, 3))
+        self.assertIsInstance(new, self.row_class)
+
+    def test_attribute_names(self):
+        """It should create unique identifiers for the columns."""
+        row_class = get_row_class(['A b', 'a-b', '1st', '_'])
+        self.assertEqual(
+            row_class._fields, ('a_b', 'column_1', 'column_2', 'column_3'),
+        )
+
+    def test_attribute_names_reserved(self):
+        """It should not use keywords or row attributes as identifiers."""
+        row_class = get_row_class(['class', 'Count', 'Columns', 'From'])
+        self.assertEqual(row_class._fields, (
+            'column_0', 'column_1', 'column_2', 'column_3',
+        ))
+        row, = row_class.convert([['a', 'b', 'c', 'd']])
+        self.assertEqual(row['From'], 'd')
+        self.assertEqual(row.count('a'), 1)
+
+    def test_infer_column_types(self):
+        """It should infer integer columns, and keep explicit types."""
+        types = infer_column_types(
+            ['Username', 'Calls', 'Since', 'Empty'],
+            [['a', '1', '5', ''], ['b', '', '6', '']],
+            {'Since': 'timestamp'},
+        )
+        self.assertDictEqual(types, {'Calls': 'int', 'Since': 'timestamp'})
+
+    def test_parse_statistics(self):
+        """It should convert the getStatistics result to typed rows."""
+        rows = parse_statistics({
+            'columns': _row('Username', 'Calls'),
+            'rows': [_row('a', '1'), _row('b', '2')],
+        })
+        self.assertEqual([tuple(r) for r in rows], [('a', 1), ('b', 2)])
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..five9 import Five9
+from ..wsdl_cache import WsdlCache
+
+
+class TestWsdlCache(unittest.TestCase):
+
+    def setUp(self):
+        super(TestWsdlCache, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'cache.db')
+        self.url = Five9.WSDL_CONFIGURATION % 'user'
+
+    def tearDown(self):
+        super(TestWsdlCache, self).tearDown()
+        shutil.rmtree(self.temp_dir)
+
+    def _read_bundled(self, file_name):
+        path = os.path.join(WsdlCache.BUNDLED_PATH, file_name)
+        with open(path, 'rb') as fh:
+            return fh.read()
+
+    def test_get_version(self):
+        """It should return the API version from the URL."""
+        self.assertEqual(WsdlCache.get_version(self.url), 'v9_5')
+
+    def test_get_version_none(self):
+        """It should return None when the URL is not versioned."""
+        self.assertIsNone(WsdlCache.get_version('https://example.com/x'))
+
+    def test_get_bundled(self):
+        """It should return the bundled WSDL for the matching version."""
+        cache = WsdlCache(version='v9_5', bundled=True, persistent=False)
+        self.assertEqual(
+            cache.get(self.url), self._read_bundled('AdminWebService.wsdl'),
+        )
+
+    def test_get_bundled_xsd(self):
+        """It should return bundled XSD imports of the WSDL."""
+        cache = WsdlCache(version='v9_5', bundled=True, persistent=False)
+        self.assertEqual(
+            cache.get('http://ws-i.org/profiles/basic/1.1/swaref.xsd'),
+            self._read_bundled('swaref.xsd'),
+        )
+
+    def test_get_bundled_version_mismatch(self):
+        """It should not return the bundled WSDL for other versions."""
+        cache = WsdlCache(version='v10_2', bundled=True, persistent=False)
+        self.assertIsNone(cache.get(self.url))
+
+    def test_get_bundled_disabled(self):
+        """It should not return the bundled WSDL unless enabled."""
+        cache = WsdlCache(version='v9_5', persistent=False)
+        self.assertIsNone(cache.get(self.url))
+
+    def test_add_get_persistent(self):
+        """It should share persisted documents between cache instances."""
+        WsdlCache(self.path, version='v9_5').add(self.url, b'content')
+        cache = WsdlCache(self.path, version='v9_5')
+        self.assertEqual(cache.get(self.url), b'content')
+
+    def test_get_persistent_version_mismatch(self):
+        """It should not return documents cached for another version."""
+        WsdlCache(self.path, version='v9_5').add(self.url, b'content')
+        cache = WsdlCache(self.path, version='v10_2')
+        self.assertIsNone(cache.get(self.url))
+
+    def test_get_persistent_expired(self):
+        """It should not return documents older than the timeout."""
+        WsdlCache(self.path, version='v9_5').add(self.url, b'content')
+        cache = WsdlCache(self.path, timeout=-1, version='v9_5')
+        self.assertIsNone(cache.get(self.url))
+
+    def test_five9_get_wsdl_cache(self):
+        """It should configure the cache from the Five9 attributes."""
+        five9 = Five9('user', 'password')
+        five9.wsdl_cache_path = self.path
+        five9.wsdl_bundled = True
+        cache = five9._get_wsdl_cache(Five9.WSDL_SUPERVISOR)
+        self.assertEqual(cache.version, 'v9_5')
+        self.assertTrue(cache.bundled)
+
+    def test_five9_get_wsdl_cache_disabled(self):
+        """It should return None when caching is disabled."""
+        five9 = Five9('user', 'password')
+        five9.wsdl_cache_enabled = False
+        self.assertIsNone(five9._get_wsdl_cache(Five9.WSDL_SUPERVISOR))
+
+    def test_five9_bundled_offline(self):
+        """It should build the clients from the bundled snapshot."""
+        five9 = Five9('user', 'password')
+        five9.wsdl_cache_enabled = False
+        five9.wsdl_bundled = True
+        self.assertTrue(hasattr(five9.configuration, 'getWebConnectors'))
+        client = five9._api_configuration
+        self.assertEqual(
+            client.service._binding_options['address'],
+            'https://api.five9.com/wsadmin/v9_5/AdminWebService',
+        )
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import os
+import re
+
+from zeep.cache import Base, SqliteCache
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+
+class VersionedSqliteCache(SqliteCache):
+    """SQLite document cache whose entries are bound to an API version.
+
+    Entries written under one version key are never returned when reading
+    with another, so bumping the Five9 API version in the WSDL URLs
+    implicitly invalidates everything that was cached for the old one.
+    """
+
+    def __init__(self, path=None, timeout=3600, version=None):
+        super(VersionedSqliteCache, self).__init__(path, timeout)
+        self._version = '%s:%s' % (SqliteCache._version, version)
+
+
+class WsdlCache(Base):
+    """WSDL & XSD document cache for the Five9 SOAP clients.
+
+    Documents are looked up in the bundled WSDL snapshot first (if enabled
+    and the API version matches), then in a persistent SQLite cache on
+    disk. The SQLite database is shared by every process using the same
+    ``path``.
+    """
+
+    # Directory containing the bundled WSDL & XSD snapshot.
+    BUNDLED_PATH = os.path.join(os.path.dirname(__file__), 'wsdl')
+    # The API version that the bundled snapshot was taken from.
+    BUNDLED_VERSION = 'v9_5'
+    # Bundled file names, keyed by the last path segment of their URL.
+    BUNDLED_DOCUMENTS = {
+        'AdminWebService': 'AdminWebService.wsdl',
+        'SupervisorWebService': 'SupervisorWebService.wsdl',
+        'swaref.xsd': 'swaref.xsd',
+    }
+
+    def __init__(self, path=None, timeout=3600, version=None, bundled=False,
+                 persistent=True):
+        """Instantiate a new cache.
+
+        Args:
+            path (str, optional): Path of the SQLite database. Defaults to
+                the zeep cache location for the current user.
+            timeout (int, optional): Seconds that a cached document stays
+                valid. ``None`` will never expire them.
+            version (str, optional): API version key, such as ``v9_5``.
+            bundled (bool, optional): Serve documents from the bundled WSDL
+                snapshot when the version matches.
+            persistent (bool, optional): Set to ``False`` to disable the
+                on-disk cache.
+        """
+        self.version = version
+        self.bundled = bundled
+        self._backend = None
+        if persistent:
+            self._backend = VersionedSqliteCache(path, timeout, version)
+
+    @staticmethod
+    def get_version(url):
+        """Return the API version key from a Five9 WSDL URL.
+
+        Args:
+            url (str): URL such as ``https://api.five9.com/wsadmin/v9_5/...``.
+
+        Returns:
+            str: The version segment of the URL (``v9_5``), or ``None``.
+        """
+        match = re.search(r'/(v\d+(?:_\d+)*)/', url)
+        if match:
+            return match.group(1)
+
+    def add(self, url, content):
+        if self._backend is not None:
+            self._backend.add(url, content)
+
+    def get(self, url):
+        content = self._get_bundled(url)
+        if content is None and self._backend is not None:
+            content = self._backend.get(url)
+        return content
+
+    def _get_bundled(self, url):
+        """Return the bundled document for the URL, if there is one."""
+        if not self.bundled or self.version != self.BUNDLED_VERSION:
+            return None
+        name = urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+        file_name = self.BUNDLED_DOCUMENTS.get(name)
+        if file_name is None:
+            return None
+        with open(os.path.join(self.BUNDLED_PATH, file_name), 'rb') as fh:
+            return fh.read()
@@ -86,11 +86,18 @@ class Tests(Command):
 
 if __name__ == "__main__":
     setup(
-        packages=find_packages(exclude=('tests')),
+        packages=find_packages(
+            exclude=('tests', 'tests.*', 'benchmarks', 'benchmarks.*'),
+        ),
+        package_data={PROJECT: ['wsdl/*.wsdl', 'wsdl/*.xsd']},
         cmdclass={'test': Tests},
         tests_require=[
             'mock',
         ],
         install_requires=install_requires,
+        extras_require={
+            'async': ['httpx'],
+            'numpy': ['numpy'],
+        },
         **setup_vals
     )